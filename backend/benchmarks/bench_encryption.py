@@ -0,0 +1,71 @@
+"""
+Benchmark: at-rest encryption — legacy Fernet (Text) vs AES-256-GCM (LargeBinary).
+
+Reports stored bytes and per-value encrypt/decrypt latency for payloads
+typical of this API.
+
+Usage (from backend/):
+    python -m benchmarks.bench_encryption --iterations 20000
+"""
+import argparse
+import base64
+import json
+import time
+
+from cryptography.fernet import Fernet
+
+from core.config import settings
+from core.encryption import _derive_key, keyring
+from models.user import vital_codec
+
+PAYLOADS = {
+    "aadhaar (12 B)": b"123412341234",
+    "packed vital": vital_codec.pack({
+        "heart_rate": 72.0, "systolic_bp": 118.0, "diastolic_bp": 76.0, "glucose_level": 104.0,
+        "spo2": 98.0, "weight_kg": 68.5, "steps": 4231, "sleep_hours": 7.5, "temperature_c": 36.7,
+    }),
+    "health snapshot": json.dumps({
+        "patient_name": "Ramesh Kumar", "phone": "+919876543210", "date_of_birth": "1952-03-15",
+        "medical_conditions": ["diabetes", "hypertension"], "allergies": ["penicillin"],
+        "current_medications": [{"name": "Metformin", "dosage": "500mg", "frequency": "twice daily"}] * 4,
+        "latest_vitals": {"heart_rate": "72.0", "blood_pressure": "118.0/76.0", "spo2": "98.0"},
+        "summary": "Elderly patient Ramesh Kumar. Conditions: diabetes, hypertension." * 3,
+    }).encode(),
+}
+
+
+def _time_per_call(fn, arg, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(arg)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(iterations: int):
+    fernet = Fernet(base64.urlsafe_b64encode(_derive_key(settings.ENCRYPTION_KEY)))
+
+    def fernet_encrypt(value: bytes) -> str:
+        return fernet.encrypt(value).decode()     # stored as Text
+
+    def fernet_decrypt(token: str) -> bytes:
+        return fernet.decrypt(token.encode())
+
+    print(f"{'payload':<18}{'scheme':<10}{'stored B':>10}{'enc µs':>10}{'dec µs':>10}")
+    for name, payload in PAYLOADS.items():
+        rows = []
+        for scheme, enc, dec in (("fernet", fernet_encrypt, fernet_decrypt),
+                                 ("aes-gcm", keyring.encrypt, keyring.decrypt)):
+            token = enc(payload)
+            assert dec(token) == payload
+            rows.append((scheme, len(token), _time_per_call(enc, payload, iterations),
+                         _time_per_call(dec, token, iterations)))
+        for scheme, size, enc_us, dec_us in rows:
+            print(f"{name:<18}{scheme:<10}{size:>10}{enc_us:>10.2f}{dec_us:>10.2f}")
+        saved = 1 - rows[1][1] / rows[0][1]
+        print(f"{'':<18}{'saving':<10}{saved:>10.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args().iterations)
@@ -0,0 +1,194 @@
+"""
+Benchmark: risk feature extraction — per-reading Python loops vs NumPy columns.
+
+Times extract_fall_risk_features + extract_cardiac_features on histories of
+30, 1k and 100k readings, and checks that the vectorized features match the
+original implementation (kept below as the reference) on randomized
+histories with missing metrics. Also folds randomized histories into
+services.feature_store.FeatureState in shuffled order and checks that its
+stats() and features equal VitalColumns and the reference over the newest
+RISK_HISTORY_READINGS readings. Any mismatch fails the run before timing.
+
+Usage (from backend/):
+    python -m benchmarks.bench_features [--sizes 30 1000 100000] [--parity-cases 500]
+"""
+import argparse
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from core.config import settings
+from models.user import VitalReading
+from services.feature_store import FeatureState
+from services.ml_service import VITAL_COLUMNS, VitalColumns, extract_cardiac_features, extract_fall_risk_features
+
+PROFILE = {"age": 74, "bmi": 27.1, "medication_count": 5, "prior_falls": 1,
+           "mobility_level": "assisted", "conditions": ["diabetes", "hypertension"]}
+REFERENCE_MAX_READINGS = 5000     # the reference variance is O(n²)
+
+
+# -- Reference: the pre-NumPy implementation, verbatim ------------------------
+
+def reference_fall_features(vitals_history: list, user_profile: dict) -> dict:
+    age = user_profile.get("age", 70)
+    bmi = user_profile.get("bmi", 26.0)
+    medication_count = user_profile.get("medication_count", 3)
+    prior_falls = user_profile.get("prior_falls", 0)
+    mobility_score = {"self_reliant": 0, "assisted": 1, "wheelchair": 2}.get(
+        user_profile.get("mobility_level", "self_reliant"), 0
+    )
+    systolic_values = [v.get("systolic_bp") for v in vitals_history if v.get("systolic_bp")]
+    bp_variance = (
+        sum((x - sum(systolic_values) / len(systolic_values)) ** 2 for x in systolic_values) / len(systolic_values)
+        if len(systolic_values) > 1 else 0.0
+    )
+    glucose_values = [v.get("glucose_level") for v in vitals_history if v.get("glucose_level")]
+    glucose_variance = (
+        sum((x - sum(glucose_values) / len(glucose_values)) ** 2 for x in glucose_values) / len(glucose_values)
+        if len(glucose_values) > 1 else 0.0
+    )
+    return {
+        "age": age,
+        "bmi": bmi,
+        "medication_count": medication_count,
+        "prior_falls_12m": prior_falls,
+        "mobility_score": mobility_score,
+        "bp_variance": round(bp_variance, 4),
+        "glucose_variance": round(glucose_variance, 4),
+        "sleep_mean_hours": sum(v.get("sleep_hours", 7.0) for v in vitals_history[-7:]) / max(len(vitals_history[-7:]), 1),
+        "steps_7d_avg": sum(v.get("steps", 3000) for v in vitals_history[-7:]) / max(len(vitals_history[-7:]), 1),
+    }
+
+
+def reference_cardiac_features(vitals_history: list, user_profile: dict) -> dict:
+    age = user_profile.get("age", 70)
+    conditions = user_profile.get("conditions", [])
+    hr_values = [v.get("heart_rate") for v in vitals_history if v.get("heart_rate")]
+    hr_mean = sum(hr_values) / len(hr_values) if hr_values else 75.0
+    return {
+        "age": age,
+        "has_diabetes": int("diabetes" in conditions),
+        "has_hypertension": int("hypertension" in conditions),
+        "has_prev_cardiac_event": int("cardiac" in conditions),
+        "bmi": user_profile.get("bmi", 26.0),
+        "heart_rate_mean": round(hr_mean, 2),
+        "spo2_min": min((v.get("spo2", 98) for v in vitals_history if v.get("spo2")), default=98),
+        "systolic_bp_mean": sum(
+            v.get("systolic_bp", 120) for v in vitals_history
+        ) / max(len(vitals_history), 1),
+        "medication_count": user_profile.get("medication_count", 3),
+        "sleep_mean_hours": sum(v.get("sleep_hours", 7.0) for v in vitals_history[-7:]) / max(len(vitals_history[-7:]), 1),
+    }
+
+
+# -----------------------------------------------------------------------------
+
+def _history(n: int, missing: float, rng: random.Random) -> list:
+    """Reading dicts; a missing metric is an absent key, as the reference expects."""
+    gens = {
+        "heart_rate": lambda: rng.uniform(50, 120), "systolic_bp": lambda: rng.uniform(95, 180),
+        "diastolic_bp": lambda: rng.uniform(55, 110), "glucose_level": lambda: rng.uniform(70, 260),
+        "spo2": lambda: rng.uniform(86, 100), "steps": lambda: rng.randint(0, 9000),
+        "sleep_hours": lambda: rng.uniform(3, 10),
+    }
+    return [{k: g() for k, g in gens.items() if rng.random() >= missing} for _ in range(n)]
+
+
+def _close(a: dict, b: dict) -> bool:
+    return a.keys() == b.keys() and all(
+        math.isclose(a[k], b[k], rel_tol=1e-9, abs_tol=1e-4)               # 1e-4: 4-decimal rounding ties
+        or (math.isnan(a[k]) and math.isnan(b[k]))                           # metrics without a default
+        for k in a
+    )
+
+
+def parity(cases: int) -> int:
+    rng = random.Random(7)
+    failures = 0
+    for i in range(cases):
+        hist = _history(rng.choice([0, 1, 2, 7, 8, 30, 200]), rng.choice([0.0, 0.3, 0.9, 1.0]), rng)
+        ok = (_close(extract_fall_risk_features(hist, PROFILE), reference_fall_features(hist, PROFILE))
+              and _close(extract_cardiac_features(hist, PROFILE), reference_cardiac_features(hist, PROFILE)))
+        failures += not ok
+    return failures
+
+
+def feature_state_parity(cases: int) -> int:
+    """FeatureState folded in random order vs the newest readings of the same history."""
+    rng = random.Random(11)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    failures = 0
+    for i in range(cases):
+        hist = _history(rng.choice([0, 1, 7, 29, 30, 31, 80, 300]), rng.choice([0.0, 0.3, 0.9]), rng)
+        readings = [
+            VitalReading(str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                         start + timedelta(minutes=rng.randint(0, len(hist))),      # with ties
+                         "wearable", {name: v.get(name) for name in VITAL_COLUMNS})
+            for v in hist
+        ]
+        shuffled = readings[:]
+        rng.shuffle(shuffled)
+        state = FeatureState()
+        for reading in shuffled:
+            state.fold(reading)
+        state = FeatureState.unpack(state.pack())
+
+        newest = sorted(readings, key=lambda r: (r.recorded_at, r.id), reverse=True)[:settings.RISK_HISTORY_READINGS]
+        window = [{k: v for k, v in r.metrics.items() if v is not None} for r in newest]
+        expected = VitalColumns.from_dicts(window).stats()
+        ok = (state.readings == len(readings)
+              and all(_close(state.stats()[name], expected[name]) for name in VITAL_COLUMNS)
+              and _close(extract_fall_risk_features(state, PROFILE), reference_fall_features(window, PROFILE))
+              and _close(extract_cardiac_features(state, PROFILE), reference_cardiac_features(window, PROFILE)))
+        failures += not ok
+    return failures
+
+
+def _time(fn, *args, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(sizes, parity_cases: int):
+    failures = parity(parity_cases)
+    print(f"parity: {parity_cases - failures}/{parity_cases} randomized histories match the reference")
+    assert failures == 0, f"{failures} randomized histories differ from the reference features"
+    state_failures = feature_state_parity(parity_cases)
+    print(f"feature state: {parity_cases - state_failures}/{parity_cases} randomized histories match "
+          f"the newest {settings.RISK_HISTORY_READINGS} readings")
+    assert state_failures == 0, f"{state_failures} feature states differ from the windowed history"
+
+    rng = random.Random(1)
+    print(f"{'readings':>10}{'reference ms':>15}{'numpy ms':>11}{'  (of which columns)':>22}{'speed-up':>10}")
+    for n in sizes:
+        hist = _history(n, 0.2, rng)
+        repeat = max(1, 3000 // max(n, 1))
+
+        def vectorized():
+            cols = VitalColumns.from_dicts(hist)
+            extract_fall_risk_features(cols, PROFILE)
+            extract_cardiac_features(cols, PROFILE)
+
+        def reference():
+            reference_fall_features(hist, PROFILE)
+            reference_cardiac_features(hist, PROFILE)
+
+        new_ms = _time(vectorized, repeat=repeat)
+        cols_ms = _time(VitalColumns.from_dicts, hist, repeat=repeat)
+        if n <= REFERENCE_MAX_READINGS:
+            ref_ms = _time(reference, repeat=repeat)
+            print(f"{n:>10}{ref_ms:>15.3f}{new_ms:>11.3f}{cols_ms:>22.3f}{ref_ms / new_ms:>9.1f}x")
+        else:
+            print(f"{n:>10}{'(O(n²), skipped)':>15}{new_ms:>11.3f}{cols_ms:>22.3f}{'':>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 1000, 100000])
+    parser.add_argument("--parity-cases", type=int, default=500)
+    args = parser.parse_args()
+    main(args.sizes, args.parity_cases)
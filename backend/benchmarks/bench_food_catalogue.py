@@ -0,0 +1,111 @@
+"""
+Benchmark: food catalogue — CSV load time, index size and lookup latency at IFCT scale.
+
+Writes a synthetic nutrient CSV (IFCT-style headers, names composed from
+Indian food words), loads it with services.food_catalogue and times
+prefix search, fuzzy (trigram) search, tag/meal/region filters and a
+day plan against the loaded catalogue. Before timing, checks that a CSV
+without a vegetarian column only tags foods vegetarian when their tags say
+so.
+
+Usage (from backend/):
+    python -m benchmarks.bench_food_catalogue [--rows 50000]
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from services.food_catalogue import load_catalogue, read_csv
+from services.meal_planner import TAGS, NutrientMatrix
+from services.ml_service import meal_profile
+
+WORDS = ("moong dal chilla poha upma idli dosa sambar rasam roti paratha rice khichdi paneer palak "
+         "aloo gobi bhindi rajma chana chole curd raita lassi chaas kheer halwa ragi jowar bajra "
+         "methi lauki tinda karela baingan fish chicken egg mutton prawn masala tadka fry curry "
+         "steamed roasted baked sprouts salad soup thepla dhokla khandvi uttapam appam puttu").split()
+REGIONS = ("north", "south", "east", "west", "central", "northeast")
+MEAL_SETS = ("breakfast", "lunch|dinner", "snack", "breakfast|snack", "lunch", "dinner")
+
+
+def write_csv(path: str, rows: int, rng: np.random.Generator):
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["food_name", "serving", "enerc_kcal", "protcnt", "choavldf", "fatce", "na", "k", "gi",
+                    "meal_types", "region", "veg"])
+        for i in range(rows):
+            words = rng.choice(WORDS, size=int(rng.integers(2, 5)), replace=False)
+            kcal = float(rng.gamma(2.5, 60))
+            protein, carbs, fat = rng.dirichlet([2, 5, 3]) * kcal / np.array([4, 4, 9])
+            w.writerow([f"{' '.join(words).title()} #{i}", "1 serving", round(kcal), round(protein, 1),
+                        round(carbs, 1), round(fat, 1), round(float(rng.lognormal(4.5, 1.0))),
+                        round(float(rng.lognormal(5.3, 0.7))), int(rng.integers(10, 90)),
+                        MEAL_SETS[i % len(MEAL_SETS)], REGIONS[i % len(REGIONS)], int(rng.random() < 0.7)])
+
+
+def check_vegetarian_default(directory: str):
+    """Meat rows from a CSV with no vegetarian column must not come out vegetarian."""
+    path = os.path.join(directory, "no_veg_column.csv")
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["food_name", "enerc_kcal", "protcnt", "choavldf", "fatce", "na", "tags"])
+        w.writerow(["Chicken curry", 240, 22, 8, 13, 480, ""])
+        w.writerow(["Mutton biryani", 420, 18, 52, 15, 720, ""])
+        w.writerow(["Palak paneer", 210, 11, 9, 15, 380, "vegetarian"])
+    foods = NutrientMatrix.from_records(read_csv(path))
+    veg = {name: bool(bits & (1 << TAGS.index("vegetarian"))) for name, bits in zip(foods.names, foods.tags)}
+    assert veg == {"Chicken curry": False, "Mutton biryani": False, "Palak paneer": True}, veg
+
+
+def timed(fn, repeat: int = 200):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return samples[len(samples) // 2] * 1e3, samples[int(len(samples) * 0.99)] * 1e3
+
+
+def main(rows: int):
+    rng = np.random.default_rng(5)
+    directory = tempfile.mkdtemp(prefix="bench_foods_")
+    check_vegetarian_default(directory)
+    path = os.path.join(directory, "foods.csv")
+    write_csv(path, rows, rng)
+
+    started = time.perf_counter()
+    catalogue = load_catalogue(path)
+    load_ms = (time.perf_counter() - started) * 1e3
+    started = time.perf_counter()
+    catalogue.trigram_ids("warm up")
+    trigram_ms = (time.perf_counter() - started) * 1e3
+    foods = catalogue.foods
+    arrays = foods.nutrients.nbytes + foods.gi.nbytes + foods.meals.nbytes + foods.tags.nbytes
+    print(f"{len(catalogue)} foods: load + index {load_ms:.0f} ms, trigram index {trigram_ms:.0f} ms "
+          f"(first fuzzy query), column arrays {arrays / 1e6:.1f} MB\n")
+
+    cases = [
+        ("prefix 'moo'", lambda: catalogue.search("moo")),
+        ("prefix 'paneer tik'", lambda: catalogue.search("paneer tik")),
+        ("fuzzy 'mung dall'", lambda: catalogue.search("mung dall")),
+        ("filter veg+low_sodium+lunch", lambda: catalogue.filter(["vegetarian", "low_sodium"], "lunch")),
+        ("prefix + filters", lambda: catalogue.search("dal", tags=["diabetic_safe"], region="south")),
+        ("day plan (diabetic, veg)", lambda: catalogue.planner.plan_day(
+            meal_profile(["diabetes"], 1600, ["vegetarian"]))),
+    ]
+    print(f"{'lookup':<30}{'p50 ms':>10}{'p99 ms':>10}")
+    for label, fn in cases:
+        p50, p99 = timed(fn)
+        print(f"{label:<30}{p50:>10.3f}{p99:>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+    main(args.rows)
@@ -0,0 +1,101 @@
+"""
+Benchmark: latency of unrelated endpoints while a login storm is in progress.
+
+Fires --logins concurrent password logins at the in-process app and probes
+GET /health every 5 ms meanwhile. Compares bcrypt run inline on
+the event loop (the old behaviour) with the bounded hashing executor.
+
+Usage (from backend/):
+    python -m benchmarks.bench_login_storm --logins 40
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+_db_dir = tempfile.mkdtemp(prefix="bench_login_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/bench.db"
+os.environ["DEBUG"] = "false"
+os.environ["PASSWORD_HASH_MAX_QUEUE"] = "100000"   # measure latency, not rejections
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import httpx
+
+from core import security
+from core.database import init_db
+from main import app
+
+PHONE, PASSWORD = "+919800000001", "Storm-Test-123"
+
+
+class InlinePool:
+    """Runs the hash directly on the event loop, as before the executor existed."""
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+def _pct(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] * 1000
+
+
+async def _storm(client, logins: int) -> dict:
+    probes, done = [], asyncio.Event()
+
+    async def probe():
+        # Latency is measured from each probe's *scheduled* send time, so a
+        # blocked event loop shows up as delay instead of as missing samples.
+        interval, scheduled = 0.005, time.perf_counter()
+        while not done.is_set():
+            await client.get("/health")
+            probes.append(time.perf_counter() - scheduled)
+            scheduled += interval
+            await asyncio.sleep(max(scheduled - time.perf_counter(), 0))
+
+    async def login():
+        r = await client.post("/api/v1/auth/login-json", json={"phone": PHONE, "password": PASSWORD})
+        assert r.status_code == 200, r.text
+
+    prober = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await prober
+    return {
+        "logins_s": logins / elapsed,
+        "probes": len(probes),
+        "p50": statistics.median(probes) * 1000,
+        "p99": _pct(probes, 0.99),
+        "max": max(probes) * 1000,
+    }
+
+
+async def main(logins: int):
+    await init_db()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        r = await client.post("/api/v1/auth/register", json={
+            "phone": PHONE, "full_name": "Storm Test", "password": PASSWORD,
+        })
+        assert r.status_code in (200, 201), r.text
+
+        pool = security.password_pool
+        print(f"{'mode':<22}{'logins/s':>10}{'probes':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for mode, runner in (("inline (event loop)", InlinePool()),
+                             (f"executor ({pool.workers} workers)", pool)):
+            security.password_pool = runner
+            res = await _storm(client, logins)
+            print(f"{mode:<22}{res['logins_s']:>10.1f}{res['probes']:>8}"
+                  f"{res['p50']:>10.2f}{res['p99']:>10.2f}{res['max']:>10.2f}")
+        security.password_pool = pool
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--logins", type=int, default=40)
+    asyncio.run(main(parser.parse_args().logins))
@@ -0,0 +1,118 @@
+"""
+Benchmark: meal-plan storage — inline item JSON per plan vs content-addressed item sets.
+
+Generates `--days` days of plans for `--users` users (a mix of condition
+profiles) and bulk-inserts them into two throwaway SQLite databases: once
+referencing content-addressed item sets (services.meal_plans), once in the
+pre-dedup layout with the full item JSON on every meal_plans row. Reports
+write time, database size, bytes per plan and item payload bytes per plan
+for both, plus the generation cache hit rate.
+
+Usage (from backend/):
+    python -m benchmarks.bench_meal_item_dedup [--users 300] [--days 30]
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from datetime import date
+
+_db_dir = tempfile.mkdtemp(prefix="bench_dedup_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/dedup.db"
+os.environ["DEBUG"] = "false"
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.database import AsyncSessionLocal, Base, engine, init_db
+from models.user import MealPlan, User
+from services.meal_plans import plan_days, store_item_sets
+from services.ml_service import meal_plan_cache_info, meal_profile
+
+START = date(2026, 3, 1)
+PROFILES = [([], None), (["diabetes"], 1500), (["hypertension"], 1800), (["diabetes", "hypertension"], 1600)]
+
+
+async def _users(session_factory, n: int) -> list:
+    ids = [str(uuid.uuid4()) for _ in range(n)]
+    async with session_factory() as db:
+        await db.execute(insert(User), [
+            {"id": uid, "phone": f"+9197{i:08d}", "full_name": "Dedup Bench", "hashed_password": "x"}
+            for i, uid in enumerate(ids)
+        ])
+        await db.commit()
+    return ids
+
+
+async def deduped(users: int, days: int) -> float:
+    await init_db()
+    ids = await _users(AsyncSessionLocal, users)
+    started = time.perf_counter()
+    for i, uid in enumerate(ids):
+        conditions, target = PROFILES[i % len(PROFILES)]
+        rows = plan_days(START, days, meal_profile(conditions, target))
+        async with AsyncSessionLocal() as db:
+            await store_item_sets(db, rows)
+            await db.execute(insert(MealPlan), [{**row, "id": str(uuid.uuid4()), "user_id": uid} for row in rows])
+            await db.commit()
+    return time.perf_counter() - started
+
+
+async def inline(users: int, days: int) -> float:
+    inline_engine = create_async_engine(f"sqlite+aiosqlite:///{_db_dir}/inline.db")
+    session_factory = async_sessionmaker(bind=inline_engine, expire_on_commit=False)
+    async with inline_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    ids = await _users(session_factory, users)
+    started = time.perf_counter()
+    for i, uid in enumerate(ids):
+        conditions, target = PROFILES[i % len(PROFILES)]
+        rows = plan_days(START, days, meal_profile(conditions, target))
+        async with session_factory() as db:
+            await db.execute(insert(MealPlan), [
+                {**{k: v for k, v in row.items() if k not in ("items", "items_hash")},
+                 "id": str(uuid.uuid4()), "user_id": uid, "items_payload": row["items"]}
+                for row in rows
+            ])
+            await db.commit()
+    elapsed = time.perf_counter() - started
+    await inline_engine.dispose()
+    return elapsed
+
+
+def _item_bytes(name: str) -> int:
+    """Bytes of item payloads: inline JSON + hash references + the shared item sets."""
+    with sqlite3.connect(os.path.join(_db_dir, name)) as conn:
+        inline_bytes = conn.execute(
+            "SELECT COALESCE(SUM(COALESCE(LENGTH(items), 0) + COALESCE(LENGTH(items_hash), 0)), 0) FROM meal_plans"
+        ).fetchone()[0]
+        shared = conn.execute("SELECT COALESCE(SUM(LENGTH(items)), 0) FROM meal_item_sets").fetchone()[0]
+    return inline_bytes + shared
+
+
+def _size(name: str) -> int:
+    return os.path.getsize(os.path.join(_db_dir, name))
+
+
+async def main(users: int, days: int):
+    t_dedup = await deduped(users, days)
+    await engine.dispose()
+    t_inline = await inline(users, days)
+    plans = users * days * 4
+    print(f"{plans} plans ({users} users × {days} days × 4 meals)\n")
+    print(f"{'layout':<16}{'write s':>9}{'DB MB':>9}{'bytes/plan':>12}{'item bytes/plan':>17}")
+    for label, seconds, name in (("inline JSON", t_inline, "inline.db"), ("content hash", t_dedup, "dedup.db")):
+        print(f"{label:<16}{seconds:>9.2f}{_size(name) / 1e6:>9.2f}{_size(name) / plans:>12.0f}"
+              f"{_item_bytes(name) / plans:>17.1f}")
+    print(f"\nsize ratio {_size('inline.db') / _size('dedup.db'):.1f}x, generation cache {meal_plan_cache_info()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.days))
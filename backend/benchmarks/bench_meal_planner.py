@@ -0,0 +1,108 @@
+"""
+Benchmark: meal planner — day-plan latency and target accuracy on a large synthetic catalogue.
+
+Generates a catalogue of random but plausible foods (per-serving kcal and
+macros, sodium, potassium, glycemic index, meal suitability, vegetarian flag), then plans days for a
+spread of profiles (standard / diabetic / hypertensive, vegetarian or not,
+1200–2200 kcal) and reports p50/p99 latency per day plus how far the plans
+land from the calorie target and sodium ceiling; fails when latency or
+calorie error exceed their budgets. Also plans the curated catalogue for
+every condition profile and fails when a condition's diabetic-safe /
+low-sodium preferences cost more than CONDITION_SLACK of calorie accuracy
+over the same diet without them (the preferences are soft: a meal must not
+shrink to the few foods that satisfy them).
+
+Usage (from backend/):
+    python -m benchmarks.bench_meal_planner [--foods 5000] [--days 500]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from services.food_catalogue import load_catalogue
+from services.meal_planner import MEALS, MealPlanner, NutrientMatrix, daily_targets
+from services.ml_service import meal_profile
+
+BUDGET_MS = 10.0
+MEAN_KCAL_ERROR, P90_KCAL_ERROR = 0.05, 0.10
+CONDITION_SLACK = 0.05
+
+
+def synthetic_foods(n: int, rng: np.random.Generator) -> NutrientMatrix:
+    records = []
+    for i in range(n):
+        kcal = float(rng.gamma(2.5, 60))
+        protein, carbs, fat = rng.dirichlet([2, 5, 3]) * kcal / np.array([4, 4, 9])
+        meals = [m for m in MEALS if rng.random() < 0.4] or [MEALS[int(rng.integers(len(MEALS)))]]
+        records.append({
+            "name": f"food-{i}", "quantity": "1 serving", "calories": round(kcal),
+            "protein_g": round(protein, 1), "carbs_g": round(carbs, 1), "fat_g": round(fat, 1),
+            "sodium_mg": round(float(rng.lognormal(4.5, 1.0))),
+            "potassium_mg": round(float(rng.lognormal(5.3, 0.7))), "gi": int(rng.integers(10, 90)), "meals": meals,
+            "vegetarian": bool(rng.random() < 0.7),
+        })
+    return NutrientMatrix.from_records(records)
+
+
+def profiles(rng: np.random.Generator, n: int) -> list:
+    options = [[], ["diabetes"], ["hypertension"], ["diabetes", "hypertension"]]
+    return [
+        meal_profile(options[i % 4], int(rng.integers(12, 23)) * 100, ["vegetarian"] if rng.random() < 0.5 else [])
+        for i in range(n)
+    ]
+
+
+def kcal_error(plan: dict, profile: dict) -> float:
+    target = daily_targets(profile)[0]
+    return abs(sum(item["calories"] for items in plan.values() for item in items) - target) / target
+
+
+def check_curated_conditions():
+    planner = load_catalogue().planner
+    for preferences in ([], ["vegetarian"]):
+        plain = meal_profile([], 1600, preferences)
+        baseline = kcal_error(planner.plan_day(plain), plain)
+        for conditions in (["diabetes"], ["hypertension"], ["diabetes", "hypertension"]):
+            profile = meal_profile(conditions, 1600, preferences)
+            error = kcal_error(planner.plan_day(profile), profile)
+            label = "+".join(conditions + preferences)
+            print(f"curated {label}: calorie error {error:.1%} (no conditions {baseline:.1%})")
+            assert error <= baseline + CONDITION_SLACK, \
+                f"{conditions} {preferences}: calorie error {error:.1%} vs {baseline:.1%} without conditions"
+
+
+def main(foods: int, days: int):
+    rng = np.random.default_rng(11)
+    started = time.perf_counter()
+    planner = MealPlanner(synthetic_foods(foods, rng))
+    print(f"catalogue: {foods} foods built in {(time.perf_counter() - started) * 1e3:.0f} ms")
+
+    planner.plan_day(meal_profile([]))          # build the subset indicator matrix once
+    samples, errors, sodium_over = [], [], 0
+    for profile in profiles(rng, days):
+        t0 = time.perf_counter()
+        plan = planner.plan_day(profile)
+        samples.append(time.perf_counter() - t0)
+        sodium = sum(item["sodium_mg"] for items in plan.values() for item in items)
+        errors.append(kcal_error(plan, profile))
+        sodium_over += sodium > daily_targets(profile)[4]
+
+    samples.sort()
+    p50, p99 = samples[len(samples) // 2] * 1e3, samples[int(len(samples) * 0.99)] * 1e3
+    print(f"day plan: p50 {p50:.2f} ms, p99 {p99:.2f} ms (budget {BUDGET_MS:g} ms)")
+    mean_error, p90_error = float(np.mean(errors)), float(np.quantile(errors, 0.9))
+    print(f"calories: mean |error| {mean_error:.1%}, p90 {p90_error:.1%}")
+    print(f"sodium:   {sodium_over}/{days} days over the ceiling")
+    assert p50 < BUDGET_MS, f"day plan p50 {p50:.2f} ms exceeds {BUDGET_MS} ms"
+    assert mean_error < MEAN_KCAL_ERROR, f"mean calorie error {mean_error:.1%} exceeds {MEAN_KCAL_ERROR:.0%}"
+    assert p90_error < P90_KCAL_ERROR, f"p90 calorie error {p90_error:.1%} exceeds {P90_KCAL_ERROR:.0%}"
+    check_curated_conditions()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--foods", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=500)
+    args = parser.parse_args()
+    main(args.foods, args.days)
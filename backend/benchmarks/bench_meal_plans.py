@@ -0,0 +1,76 @@
+"""
+Benchmark: meal-plan generation for 30 and 90 days — one POST /diet/generate per day vs one /diet/generate-range.
+
+Runs against the in-process app on a throwaway SQLite database. For each
+span a fresh user plans the days one request at a time, another plans them
+with a single range request, and the range is then regenerated to time the
+upsert path (no new rows).
+
+Usage (from backend/):
+    python -m benchmarks.bench_meal_plans [--days 30 90]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+_db_dir = tempfile.mkdtemp(prefix="bench_meals_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/bench.db"
+os.environ["DEBUG"] = "false"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import httpx
+
+from core.database import init_db
+from main import app
+
+START = date(2026, 3, 1)
+BODY = {"conditions": ["diabetes"], "calorie_target": 1500}
+
+
+async def _user(client: httpx.AsyncClient, n: int) -> dict:
+    r = await client.post("/api/v1/auth/register", json={
+        "phone": f"+9198000{n:05d}", "full_name": "Meal Bench", "password": "Meal-Bench-123",
+    })
+    assert r.status_code == 201, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def main(spans):
+    await init_db()
+    transport = httpx.ASGITransport(app=app)
+    print(f"{'days':>5} {'per-day ms':>12} {'range ms':>10} {'re-range ms':>12} {'speed-up':>9}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=None) as client:
+        for i, days in enumerate(spans):
+            headers = await _user(client, 2 * i)
+            started = time.perf_counter()
+            for offset in range(days):
+                day = (START + timedelta(days=offset)).isoformat()
+                r = await client.post("/api/v1/diet/generate", json={"date": day, **BODY}, headers=headers)
+                assert r.status_code == 201, r.text
+            per_day = time.perf_counter() - started
+
+            headers = await _user(client, 2 * i + 1)
+            payload = {"start_date": START.isoformat(), "days": days, **BODY}
+            started = time.perf_counter()
+            r = await client.post("/api/v1/diet/generate-range", json=payload, headers=headers)
+            ranged = time.perf_counter() - started
+            assert r.status_code == 201 and len(r.json()) == 4 * days, r.text
+            ids = {p["id"] for p in r.json()}
+
+            started = time.perf_counter()
+            r = await client.post("/api/v1/diet/generate-range", json=payload, headers=headers)
+            reranged = time.perf_counter() - started
+            assert {p["id"] for p in r.json()} == ids, "regenerating a range must update, not duplicate"
+
+            print(f"{days:>5} {per_day * 1e3:>12.1f} {ranged * 1e3:>10.1f} {reranged * 1e3:>12.1f} "
+                  f"{per_day / ranged:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 90])
+    args = parser.parse_args()
+    asyncio.run(main(args.days))
@@ -0,0 +1,87 @@
+"""
+Benchmark: day-plan ranking — vectorized scoring of every meal-option combination vs a Python loop.
+
+Builds a synthetic catalogue (kcal, macros, sodium, potassium, glycemic
+index) with benchmarks.bench_meal_planner.synthetic_foods, then for a
+spread of diabetic / hypertensive profiles times MealPlanner.score_days —
+all options**4 day plans scored as one (days × foods) @ (foods × nutrients)
+product — at increasing options per meal. The same day plans are also
+scored one at a time in Python for the smallest sizes, as the baseline the
+matrix pass replaces.
+
+Usage (from backend/):
+    python -m benchmarks.bench_plan_ranking [--foods 5000] [--options 3 5 8 10]
+"""
+import argparse
+import time
+from itertools import product
+
+import numpy as np
+
+from benchmarks.bench_meal_planner import profiles, synthetic_foods
+from services.meal_planner import MEALS, NUTRIENTS, MealPlanner, daily_targets
+
+LOOP_MAX_DAYS = 5000
+
+
+def loop_rank(planner: MealPlanner, profile: dict, options: int) -> int:
+    """Score every combination with per-item Python sums; returns the best day's index."""
+    targets = daily_targets(profile).tolist()
+    per_meal = []
+    for meal in MEALS:
+        idx, sets, cost = planner.meal_options(meal, profile, daily_targets(profile), options)
+        per_meal.append([([planner.foods.item(int(i)) for i in idx[row > 0]], float(c))
+                         for row, c in zip(sets, cost)])
+    best, best_cost = -1, float("inf")
+    for day, choice in enumerate(product(*per_meal)):
+        totals = [sum(item[n] for items, _ in choice for item in items) for n in NUTRIENTS]
+        cost = sum(c for _, c in choice)
+        cost += 4 * ((totals[0] - targets[0]) / targets[0]) ** 2
+        cost += sum(((totals[k] - targets[k]) / targets[k]) ** 2 for k in (1, 2, 3))
+        cost += 25 * (max(totals[4] - targets[4], 0) / targets[4]) ** 2
+        cost += (max(targets[5] - totals[5], 0) / targets[5]) ** 2
+        cost += 25 * (max(totals[6] - targets[6], 0) / targets[6]) ** 2
+        if cost < best_cost:
+            best, best_cost = day, cost
+    return best
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return samples[len(samples) // 2] * 1e3
+
+
+def main(foods: int, options: list, repeat: int):
+    rng = np.random.default_rng(7)
+    planner = MealPlanner(synthetic_foods(foods, rng))
+    cases = profiles(rng, 8)
+    for profile in cases:
+        planner.score_days(profile)             # rankings and indicator matrices built once
+
+    print(f"{foods} foods, {len(cases)} profiles\n")
+    print(f"{'options':>8}{'day plans':>11}{'matrix ms':>11}{'µs/plan':>9}{'loop ms':>10}{'speed-up':>10}")
+    for k in options:
+        days = k ** len(MEALS)
+        matrix = np.median([timed(lambda: planner.score_days(p, k), repeat) for p in cases])
+        row = f"{k:>8}{days:>11}{matrix:>11.2f}{matrix * 1e3 / days:>9.2f}"
+        if days <= LOOP_MAX_DAYS:
+            for p in cases:
+                _, _, _, cost, _ = planner.score_days(p, k)
+                assert abs(float(cost[loop_rank(planner, p, k)]) - float(cost.min())) < 1e-3
+            loop = np.median([timed(lambda: loop_rank(planner, p, k), 3) for p in cases])
+            row += f"{loop:>10.1f}{loop / matrix:>9.0f}x"
+        print(row)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--foods", type=int, default=5000)
+    parser.add_argument("--options", type=int, nargs="+", default=[3, 5, 8, 10])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.foods, args.options, args.repeat)
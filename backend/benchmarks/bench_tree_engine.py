@@ -0,0 +1,128 @@
+"""
+Benchmark: NumPy tree-ensemble engine — latency and throughput by batch size.
+
+Builds a random gradient-boosted ensemble in XGBoost JSON-dump format (or
+trains a real one when xgboost is installed), compiles it with
+services.tree_engine (objective and base_score from the booster config) and checks predictions against the reference within
+1e-6: xgboost's own Booster.predict when available, otherwise a node-by-node
+walk of the dump with XGBoost's split rules (float32 `x < threshold`, NaN →
+missing branch). Then times batches of 1 … 100k rows.
+
+Usage (from backend/):
+    python -m benchmarks.bench_tree_engine [--trees 200] [--depth 6] [--sizes 1 10 100 1000 10000 100000]
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from services.tree_engine import TreeEnsemble, booster_params, compile_dump
+
+FEATURES = ["age", "bmi", "medication_count", "prior_falls_12m", "mobility_score",
+            "bp_variance", "glucose_variance", "sleep_mean_hours", "steps_7d_avg"]
+TOLERANCE = 1e-6
+BASE_SCORE = 0.3   # deliberately not XGBoost's old 0.5 default, so a dropped intercept fails parity
+
+
+# -- Reference ----------------------------------------------------------------
+
+def _random_tree(rng: np.random.Generator, depth: int) -> dict:
+    counter = iter(range(1 << (depth + 2)))
+
+    def node(d):
+        nid = next(counter)
+        if d == depth or (d > 1 and rng.random() < 0.15):
+            return {"nodeid": nid, "leaf": float(np.float32(rng.normal(0, 0.1)))}
+        f = int(rng.integers(len(FEATURES)))
+        yes, no = node(d + 1), node(d + 1)
+        return {"nodeid": nid, "depth": d, "split": FEATURES[f],
+                "split_condition": float(np.float32(rng.normal(0, 1))),
+                "yes": yes["nodeid"], "no": no["nodeid"],
+                "missing": (yes if rng.random() < 0.5 else no)["nodeid"], "children": [yes, no]}
+    return node(0)
+
+
+def reference_margin(trees: list, row: np.ndarray, base_margin: float) -> float:
+    row = row.astype(np.float32)
+    total = np.float32(base_margin)
+    for tree in trees:
+        node = tree
+        while "leaf" not in node:
+            children = {c["nodeid"]: c for c in node["children"]}
+            x = row[FEATURES.index(node["split"])]
+            if math.isnan(x):
+                node = children[node["missing"]]
+            else:
+                node = children[node["yes"] if x < np.float32(node["split_condition"]) else node["no"]]
+        total = np.float32(total + np.float32(node["leaf"]))
+    return float(total)
+
+
+def _rows(rng: np.random.Generator, n: int) -> np.ndarray:
+    x = rng.normal(0, 1, size=(n, len(FEATURES)))
+    x[rng.random(x.shape) < 0.05] = np.nan
+    return x
+
+
+def build(trees_n: int, depth: int, rng: np.random.Generator):
+    """(engine, reference predict fn, source label)"""
+    try:
+        import json
+        import xgboost as xgb
+    except ImportError:
+        trees = [_random_tree(rng, depth) for _ in range(trees_n)]
+        engine = TreeEnsemble(compile_dump(trees, FEATURES), depth, "binary:logistic", BASE_SCORE)
+        base_margin = math.log(BASE_SCORE / (1 - BASE_SCORE))
+
+        def reference(x):
+            return np.array([1 / (1 + math.exp(-reference_margin(trees, r, base_margin))) for r in x])
+        return engine, reference, "dump walk (xgboost not installed)"
+
+    x = _rows(rng, 5000)
+    y = (np.nan_to_num(x[:, 0]) + rng.normal(0, 1, len(x)) > 0).astype(int)
+    # No base_score: XGBoost ≥ 2.0 estimates it, and it must come back from the config
+    booster = xgb.train({"objective": "binary:logistic", "max_depth": depth},
+                        xgb.DMatrix(x, label=y, feature_names=FEATURES), num_boost_round=trees_n)
+    trees = [json.loads(t) for t in booster.get_dump(dump_format="json")]
+    compiled = compile_dump(trees, FEATURES)
+    engine = TreeEnsemble(compiled, compiled["max_depth"], *booster_params(json.loads(booster.save_config())))
+    return engine, lambda rows: booster.predict(xgb.DMatrix(rows, feature_names=FEATURES)), "xgboost"
+
+
+def parity(engine, reference, rng, cases: int = 2000) -> float:
+    x = _rows(rng, cases)
+    diff = float(np.max(np.abs(engine.predict(x).astype(np.float64) - reference(x))))
+    assert diff <= TOLERANCE, f"engine differs from reference by {diff:.2e}"
+    return diff
+
+
+def main(trees_n: int, depth: int, sizes):
+    rng = np.random.default_rng(7)
+    engine, reference, source = build(trees_n, depth, rng)
+    diff = parity(engine, reference, rng)
+    print(f"{len(engine.roots)} trees, depth {engine.max_depth}, {len(engine.feature)} nodes")
+    print(f"parity vs {source}: max |Δ| = {diff:.2e} (≤ {TOLERANCE:g})\n")
+
+    print(f"{'batch':>8} {'p50 ms':>10} {'p99 ms':>10} {'rows/s':>12}")
+    for n in sizes:
+        x = _rows(rng, n)
+        repeat = max(3, min(200, 200_000 // n))
+        engine.predict(x)
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            engine.predict(x)
+            samples.append(time.perf_counter() - t0)
+        samples.sort()
+        p50, p99 = samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        print(f"{n:>8} {p50 * 1e3:>10.3f} {p99 * 1e3:>10.3f} {n / p50:>12,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--trees", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000, 100000])
+    args = parser.parse_args()
+    main(args.trees, args.depth, args.sizes)
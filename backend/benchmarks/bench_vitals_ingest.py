@@ -0,0 +1,77 @@
+"""
+Benchmark: vitals ingestion throughput — one POST per reading vs POST /vitals/batch.
+
+Runs against the in-process app on a throwaway SQLite database and reports
+readings/sec for each path.
+
+Usage (from backend/):
+    python -m benchmarks.bench_vitals_ingest --readings 2000 --batch-size 1000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+_db_dir = tempfile.mkdtemp(prefix="bench_ingest_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/bench.db"
+os.environ["DEBUG"] = "false"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import httpx
+
+from core.database import init_db
+from main import app
+
+
+def _readings(n: int) -> list:
+    start = datetime.now(timezone.utc) - timedelta(minutes=n)
+    return [
+        {
+            "heart_rate": random.uniform(55, 110),
+            "spo2": random.uniform(92, 100),
+            "steps": random.randint(0, 120),
+            "source": "wearable",
+            "recorded_at": (start + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(n)
+    ]
+
+
+async def main(readings: int, batch_size: int):
+    await init_db()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=None) as client:
+        r = await client.post("/api/v1/auth/register", json={
+            "phone": "+919800000002", "full_name": "Ingest Bench", "password": "Ingest-Bench-123",
+        })
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        data = _readings(readings)
+
+        start = time.perf_counter()
+        for item in data:
+            r = await client.post("/api/v1/vitals/", json=item, headers=headers)
+            assert r.status_code == 201, r.text
+        single = readings / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i in range(0, readings, batch_size):
+            r = await client.post("/api/v1/vitals/batch", json={"readings": data[i:i + batch_size]},
+                                  headers=headers)
+            assert r.status_code == 201 and r.json()["rejected"] == 0, r.text
+        batch = readings / (time.perf_counter() - start)
+
+    print(f"{'path':<28}{'readings/s':>12}")
+    print(f"{'POST /vitals/ (single)':<28}{single:>12.0f}")
+    print(f"{f'POST /vitals/batch ({batch_size})':<28}{batch:>12.0f}")
+    print(f"{'speed-up':<28}{batch / single:>11.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--readings", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.readings, args.batch_size))
@@ -0,0 +1,104 @@
+"""
+Benchmark: vitals at-rest storage — nine per-column ciphertexts vs one packed record.
+
+Inserts and reads back the same synthetic readings under both
+VITALS_STORAGE modes against a throwaway SQLite file and reports
+rows/sec plus the average encrypted bytes stored per row.
+
+Usage (from backend/):
+    python -m benchmarks.bench_vitals_storage --rows 5000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from core.config import settings
+from core.database import Base
+from models.user import User, Vital, VITAL_METRICS
+
+BATCH = 500
+
+
+def _reading(rng: random.Random) -> dict:
+    return {
+        "heart_rate": round(rng.uniform(55, 110), 1),
+        "systolic_bp": round(rng.uniform(100, 160), 1),
+        "diastolic_bp": round(rng.uniform(60, 100), 1),
+        "glucose_level": round(rng.uniform(80, 220), 1),
+        "spo2": round(rng.uniform(90, 100), 1),
+        "weight_kg": round(rng.uniform(50, 90), 1),
+        "steps": rng.randint(0, 9000),
+        "sleep_hours": round(rng.uniform(4, 9), 1),
+        "temperature_c": round(rng.uniform(36, 38), 1),
+    }
+
+
+async def _run_mode(mode: str, rows: int) -> dict:
+    settings.VITALS_STORAGE = mode
+    path = os.path.join(tempfile.mkdtemp(), f"bench_{mode}.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    Session = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(42)
+    readings = [_reading(rng) for _ in range(rows)]
+
+    async with Session() as db:
+        db.add(User(id="bench-user", full_name="Bench", phone="0000000000", hashed_password="x"))
+        await db.commit()
+
+    start = time.perf_counter()
+    for i in range(0, rows, BATCH):
+        async with Session() as db:
+            db.add_all([
+                Vital.from_metrics(r, user_id="bench-user", source="bench")
+                for r in readings[i:i + BATCH]
+            ])
+            await db.commit()
+    insert_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    async with Session() as db:
+        result = await db.execute(select(Vital).where(Vital.user_id == "bench-user"))
+        loaded = result.scalars().all()
+        checksum = sum(float(getattr(v, m)) for v in loaded for m in VITAL_METRICS)
+    read_s = time.perf_counter() - start
+
+    async with engine.connect() as conn:
+        cols = " + ".join(f"coalesce(length({c}), 0)" for c in ("packed",) + VITAL_METRICS)
+        stored = (await conn.execute(text(f"SELECT avg({cols}) FROM vitals"))).scalar()
+    await engine.dispose()
+
+    return {
+        "mode": mode,
+        "insert_rows_per_s": rows / insert_s,
+        "read_rows_per_s": rows / read_s,
+        "bytes_per_row": stored,
+        "checksum": round(checksum, 1),
+    }
+
+
+async def main(rows: int):
+    original = settings.VITALS_STORAGE
+    try:
+        results = [await _run_mode(mode, rows) for mode in ("columns", "packed")]
+    finally:
+        settings.VITALS_STORAGE = original
+
+    print(f"{'mode':<10}{'insert rows/s':>16}{'read rows/s':>16}{'bytes/row':>12}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['insert_rows_per_s']:>16.0f}{r['read_rows_per_s']:>16.0f}{r['bytes_per_row']:>12.0f}")
+    assert results[0]["checksum"] == results[1]["checksum"], "packed and column modes disagree"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    asyncio.run(main(parser.parse_args().rows))
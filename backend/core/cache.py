@@ -0,0 +1,136 @@
+"""
+Pluggable key/value cache with TTL, used for hot per-user lookups.
+
+Backends:
+- "local": in-process TTL + LRU dict (default; one copy per uvicorn worker)
+- "redis": shared across workers via REDIS_URL (requires the `redis` package)
+
+Values are strings; callers own serialization. Every named cache keeps
+hit/miss counters exposed through `cache_stats()`.
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+import time
+
+from core.config import settings
+
+
+class LocalCache:
+    """TTL + LRU cache living in this process."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: float):
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisCache:
+    """Cache shared by all workers through Redis."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package (pip install redis)") from exc
+        self._client = redis.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: str, ttl: float):
+        await self._client.set(key, value, px=max(int(ttl * 1000), 1))
+
+    async def delete(self, key: str):
+        await self._client.delete(key)
+
+
+_backend = None
+
+
+def get_backend():
+    """The process-wide cache backend selected by CACHE_BACKEND."""
+    global _backend
+    if _backend is None:
+        if settings.CACHE_BACKEND == "redis":
+            _backend = RedisCache(settings.REDIS_URL)
+        else:
+            _backend = LocalCache(settings.CACHE_MAX_ENTRIES)
+    return _backend
+
+
+class NamedCache:
+    """A key namespace on the shared backend with its own TTL and hit/miss stats."""
+
+    def __init__(self, name: str, ttl: float):
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.invalidations = 0
+        _registry[name] = self
+
+    def _key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    async def get(self, key: str, valid: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """Cached value; with `valid`, a value it rejects is counted as a stale miss."""
+        value = await get_backend().get(self._key(key))
+        if value is not None and valid is not None and not valid(value):
+            self.stale += 1
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None):
+        await get_backend().set(self._key(key), value, self.ttl if ttl is None else ttl)
+
+    async def delete(self, key: str):
+        self.invalidations += 1
+        await get_backend().delete(self._key(key))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "ttl_seconds": self.ttl,
+        }
+
+
+_registry: Dict[str, NamedCache] = {}
+
+
+def cache_stats() -> dict:
+    return {
+        "backend": settings.CACHE_BACKEND,
+        "caches": {name: cache.stats() for name, cache in _registry.items()},
+    }
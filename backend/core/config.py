@@ -3,7 +3,7 @@ Core configuration using Pydantic BaseSettings.
 Load from environment variables or .env file.
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 from functools import lru_cache
 
 
@@ -18,6 +18,9 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    PASSWORD_HASH_EXECUTOR: str = "thread"   # "thread" | "process" pool for bcrypt
+    PASSWORD_HASH_WORKERS: int = 2           # concurrent bcrypt operations per worker
+    PASSWORD_HASH_MAX_QUEUE: int = 32        # waiting hashes before 503 back-pressure
 
     # Biometric / UPI
     UPI_MAX_AMOUNT: float = 5000.0          # NPCI limit for biometric UPI auth
@@ -30,12 +33,44 @@ class Settings(BaseSettings):
     # Redis (for session caching & rate limiting)
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Caching
+    CACHE_BACKEND: str = "local"             # "local" (per worker) | "redis" (shared via REDIS_URL)
+    CACHE_MAX_ENTRIES: int = 10000           # LRU bound for the local backend
+    PRINCIPAL_CACHE_TTL: int = 60            # seconds an authenticated user stays cached
+    RISK_SCORE_CACHE_TTL: int = 21600        # seconds a risk score is reused while its inputs are unchanged
+
+    # Ops / admin endpoints (X-Admin-Key header); empty = DEBUG-only access
+    ADMIN_API_KEY: str = ""
+
     # Wearables APIs
     THRYVE_API_KEY: str = ""
     THRYVE_BASE_URL: str = "https://api.und-gesund.de/v5"
 
-    # Encryption (AES-256 for health data at rest)
+    # Encryption (AES-256-GCM for health data at rest)
     ENCRYPTION_KEY: str = "CHANGE_ME_32_BYTE_KEY_FOR_AES256"
+    ENCRYPTION_KEY_VERSION: int = 1          # written into every ciphertext header
+    ENCRYPTION_RETIRED_KEYS: Dict[int, str] = {}   # older versions, decrypt-only
+    REENCRYPT_ON_STARTUP: bool = False       # rotate stale ciphertext in the background
+    REENCRYPTION_CHUNK_SIZE: int = 500
+    LAZY_DECRYPTION: bool = True             # decrypt encrypted fields on first access, not at load
+    VITALS_STORAGE: str = "packed"           # "packed" (one ciphertext per reading) | "columns" (legacy)
+    VITALS_INGEST_CHUNK_SIZE: int = 1000     # rows per executemany INSERT on bulk ingestion
+
+    # ML / risk scoring
+    MODEL_DIR: str = "ml_artifacts"          # versioned model artifacts: {name}/{version}/manifest.json
+    MODEL_LOADING: str = "lazy"              # "lazy" (first prediction) | "startup" (load + warm up in lifespan)
+    MODEL_REFRESH_SECONDS: int = 30          # how often a worker re-checks {name}/CURRENT for a new version
+    SHADOW_MODELS: Dict[str, List[str]] = {}   # candidate versions scored off the request path, e.g. {"fall_risk": ["2.0.0"]}
+    SHADOW_QUEUE_SIZE: int = 1000            # pending shadow predictions per worker; more are dropped
+    DRIFT_FLUSH_SECONDS: int = 60            # how often each worker persists its drift histograms
+    BATCH_SCORING_CHUNK_SIZE: int = 500      # users loaded and scored per step of the nightly job
+    BATCH_SCORING_WORKERS: int = 0           # scoring processes; 0 = one per CPU
+    RISK_HISTORY_READINGS: int = 30          # most recent vitals used as model input
+
+    # Diet
+    FOOD_CATALOGUE_CSV: str = ""             # nutrient table (IFCT-style CSV) added to the built-in dishes
+    FOOD_CATALOGUE_LOADING: str = "lazy"     # "lazy" (first plan/search) | "startup" (load + index in lifespan)
+    MEAL_PLAN_CACHE_SIZE: int = 4096         # memoized meals per (meal type, diet constraints, calorie target)
 
     # Emergency / SOS
     HAWKEYE_API_URL: str = "https://hawkeye.hyd.gov.in/api/dispatch"
@@ -54,8 +89,11 @@ class Settings(BaseSettings):
     ALLOWED_HOSTS: List[str] = ["localhost", "127.0.0.1", "*"]
 
     # Rate Limiting
-    RATE_LIMIT_REQUESTS: int = 100
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "local"       # "local" (per worker) | "redis" (shared via REDIS_URL)
+    RATE_LIMIT_REQUESTS: int = 100          # default budget per key per window
     RATE_LIMIT_WINDOW: int = 60             # seconds
+    RATE_LIMIT_ROUTER_BUDGETS: Dict[str, int] = {"auth": 20, "chat": 30, "vitals": 600}
 
     class Config:
         env_file = ".env"
@@ -1,42 +1,100 @@
 """
 Async SQLAlchemy database engine and session factory.
-AES-256 encryption applied to sensitive health columns via TypeDecorator.
+AES-256 encryption applied to sensitive health columns via TypeDecorator,
+or lazily on first attribute access via EncryptedField.
 """
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import Column, String, TypeDecorator, Text
-from cryptography.fernet import Fernet
-import base64
-import hashlib
+from sqlalchemy import JSON, TypeDecorator, LargeBinary, inspect, event
+import logging
 
 from core.config import settings
+from core.encryption import encrypt_bytes, decrypt_bytes
 
 
-# --- Encryption helper (AES-256 via Fernet which uses AES-128-CBC internally;
-#     for true AES-256-GCM swap in cryptography.hazmat primitives) ---
-def _derive_key(raw_key: str) -> bytes:
-    """Derive a 32-byte Fernet-compatible key from the config key."""
-    digest = hashlib.sha256(raw_key.encode()).digest()
-    return base64.urlsafe_b64encode(digest)
+# --- Column types (AES-256-GCM, see core/encryption.py) ---
+class EncryptedBytes(TypeDecorator):
+    """SQLAlchemy column type that transparently encrypts/decrypts binary values."""
+    impl = LargeBinary
+    cache_ok = True
 
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        return encrypt_bytes(value)
 
-_fernet = Fernet(_derive_key(settings.ENCRYPTION_KEY))
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        return decrypt_bytes(value)
 
 
-class EncryptedString(TypeDecorator):
+class EncryptedString(EncryptedBytes):
     """SQLAlchemy column type that transparently encrypts/decrypts values."""
-    impl = Text
     cache_ok = True
 
     def process_bind_param(self, value, dialect):
         if value is None:
             return value
-        return _fernet.encrypt(value.encode()).decode()
+        return encrypt_bytes(value.encode())
 
     def process_result_value(self, value, dialect):
         if value is None:
             return value
-        return _fernet.decrypt(value.encode()).decode()
+        return decrypt_bytes(value).decode()
+
+
+class Ciphertext(TypeDecorator):
+    """Raw ciphertext column backing an EncryptedField (no processing at load)."""
+    impl = LargeBinary
+    cache_ok = True
+
+
+class EncryptedField:
+    """
+    Decrypt-on-first-access attribute over a raw ciphertext column.
+
+        _allergies = Column("allergies", Ciphertext, nullable=True)
+        allergies  = EncryptedField("_allergies")
+
+    Loading a row only fetches ciphertext; the value is decrypted the first
+    time it is read and memoized on the instance for as long as the
+    ciphertext is unchanged (i.e. for the life of the session).
+    Set LAZY_DECRYPTION=False to decrypt every field at load time instead.
+    """
+
+    def __init__(self, column_attr: str, binary: bool = False):
+        self.column_attr = column_attr
+        self.binary = binary
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.cache_key = f"_plain_{name}"
+        owner.__encrypted_fields__ = getattr(owner, "__encrypted_fields__", ()) + (name,)
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return getattr(owner, self.column_attr)
+        token = getattr(obj, self.column_attr)
+        if token is None:
+            return None
+        cached = obj.__dict__.get(self.cache_key)
+        if cached is not None and cached[0] is token:
+            return cached[1]
+        plain = decrypt_bytes(token)
+        if not self.binary:
+            plain = plain.decode()
+        obj.__dict__[self.cache_key] = (token, plain)
+        return plain
+
+    def __set__(self, obj, value):
+        if value is None:
+            setattr(obj, self.column_attr, None)
+            obj.__dict__.pop(self.cache_key, None)
+            return
+        token = encrypt_bytes(value if self.binary else value.encode())
+        setattr(obj, self.column_attr, token)
+        obj.__dict__[self.cache_key] = (token, value)
 
 
 # --- Engine ---
@@ -57,10 +115,92 @@ class Base(DeclarativeBase):
     pass
 
 
+@event.listens_for(Base, "load", propagate=True)
+def _eager_decrypt(target, context):
+    if not settings.LAZY_DECRYPTION:
+        for name in getattr(type(target), "__encrypted_fields__", ()):
+            getattr(target, name)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _sync_schema(conn):
+    """
+    Additive schema sync for databases created by an older build:
+    create_all() skips existing tables, so add any missing nullable
+    columns and missing indexes in place, and drop NOT NULL from columns
+    the models have since made nullable.
+    """
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_cols = {c["name"]: c for c in inspector.get_columns(table.name)}
+        relaxed = [col for col in table.columns
+                   if col.name in existing_cols and col.nullable and not existing_cols[col.name]["nullable"]]
+        if relaxed:
+            _relax_not_null(conn, table, relaxed, existing_cols)
+            existing_cols = {c["name"]: c for c in inspect(conn).get_columns(table.name)}
+        for col in table.columns:
+            if col.name in existing_cols:
+                continue
+            if not col.nullable:
+                logger.warning("Cannot auto-add NOT NULL column %s.%s", table.name, col.name)
+                continue
+            col_type = col.type.compile(dialect=conn.dialect)
+            conn.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {col.name} {col_type}')
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _relax_not_null(conn, table, columns, existing_cols):
+    """
+    Drop NOT NULL from `columns`. SQLite cannot alter a constraint, so the
+    table is rebuilt from the model and the rows copied across; JSON columns
+    holding the JSON literal 'null' become real NULLs on the way.
+    """
+    if conn.dialect.name != "sqlite":
+        for col in columns:
+            conn.exec_driver_sql(f'ALTER TABLE {table.name} ALTER COLUMN {col.name} DROP NOT NULL')
+        return
+    logger.info("Rebuilding %s to make %s nullable", table.name, ", ".join(c.name for c in columns))
+    old = f"_old_{table.name}"
+    relaxed = {c.name for c in columns if isinstance(c.type, JSON)}
+    copied = [c.name for c in table.columns if c.name in existing_cols]
+    select_list = ", ".join(f"NULLIF({n}, 'null')" if n in relaxed else n for n in copied)
+    # Keep other tables' foreign keys pointing at the name, not the renamed copy
+    conn.exec_driver_sql("PRAGMA legacy_alter_table = ON")
+    conn.exec_driver_sql(f"ALTER TABLE {table.name} RENAME TO {old}")
+    conn.exec_driver_sql("PRAGMA legacy_alter_table = OFF")
+    for index in inspect(conn).get_indexes(old):
+        conn.exec_driver_sql(f"DROP INDEX {index['name']}")
+    table.create(conn)
+    conn.exec_driver_sql(f"INSERT INTO {table.name} ({', '.join(copied)}) SELECT {select_list} FROM {old}")
+    conn.exec_driver_sql(f"DROP TABLE {old}")
+
+
 async def init_db():
     """Create all tables on startup."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_sync_schema)
+
+
+async def insert_ignore(session, table, rows: list):
+    """INSERT rows, silently skipping any that collide with an existing key. Returns rows inserted."""
+    if session.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    result = await session.execute(dialect_insert(table).on_conflict_do_nothing(), rows)
+    return result.rowcount
+
+
+def on_commit(session, callback):
+    """Run async `callback()` once `session` has committed successfully (see get_db)."""
+    session.info.setdefault("on_commit", []).append(callback)
 
 
 async def get_db() -> AsyncSession:
@@ -69,6 +209,8 @@ async def get_db() -> AsyncSession:
         try:
             yield session
             await session.commit()
+            for callback in session.info.pop("on_commit", []):
+                await callback()
         except Exception:
             await session.rollback()
             raise
@@ -0,0 +1,114 @@
+"""
+At-rest encryption primitives: AES-256-GCM with a key-version header.
+
+Ciphertext layout (binary, stored in LargeBinary columns):
+    u8   format (0x01 = AES-256-GCM)
+    u16  key version (big-endian)
+    12B  random nonce
+    ...  ciphertext + 16B GCM tag        (header is bound as associated data)
+
+Older rows may still hold Fernet tokens (base64 text starting with "gAAAAA");
+they decrypt transparently until services/reencryption.py rewrites them.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Optional, Union
+import base64
+import hashlib
+import os
+import struct
+
+from cryptography.fernet import Fernet, MultiFernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from core.config import settings
+
+FORMAT_AES_GCM = 0x01
+_HEADER = struct.Struct(">BH")
+_NONCE_SIZE = 12
+_FERNET_PREFIX = b"g"          # every Fernet token starts with base64(0x80) == "g"
+
+
+def _derive_key(raw_key: str) -> bytes:
+    """Derive a 32-byte AES-256 key from a config key."""
+    return hashlib.sha256(raw_key.encode()).digest()
+
+
+class KeyRing:
+    """Current key (used for all new ciphertext) plus retired keys for decryption."""
+
+    def __init__(self, current_version: int, keys: Dict[int, str]):
+        if current_version not in keys:
+            raise ValueError(f"No key configured for version {current_version}")
+        self.current_version = current_version
+        self._aead = {v: AESGCM(_derive_key(k)) for v, k in keys.items()}
+        # Legacy Fernet tokens were derived from the same raw keys
+        ordered = [keys[current_version]] + [k for v, k in keys.items() if v != current_version]
+        self._fernet = MultiFernet([
+            Fernet(base64.urlsafe_b64encode(_derive_key(k))) for k in ordered
+        ])
+
+    def encrypt(self, plaintext: bytes) -> bytes:
+        header = _HEADER.pack(FORMAT_AES_GCM, self.current_version)
+        nonce = os.urandom(_NONCE_SIZE)
+        return header + nonce + self._aead[self.current_version].encrypt(nonce, plaintext, header)
+
+    def decrypt(self, token: Union[bytes, str]) -> bytes:
+        if isinstance(token, str):
+            token = token.encode()
+        if token[:1] == _FERNET_PREFIX:
+            return self._fernet.decrypt(token)
+        fmt, version = _HEADER.unpack_from(token)
+        if fmt != FORMAT_AES_GCM:
+            raise ValueError(f"Unknown ciphertext format {fmt:#x}")
+        aead = self._aead.get(version)
+        if aead is None:
+            raise ValueError(f"No key configured for version {version}")
+        header_end = _HEADER.size
+        nonce = token[header_end:header_end + _NONCE_SIZE]
+        return aead.decrypt(nonce, token[header_end + _NONCE_SIZE:], token[:header_end])
+
+    def needs_rotation(self, token: Union[bytes, str]) -> bool:
+        """True for legacy Fernet tokens and ciphertext under a non-current key."""
+        if isinstance(token, str):
+            token = token.encode()
+        if token[:1] == _FERNET_PREFIX:
+            return True
+        return _HEADER.unpack_from(token)[1] != self.current_version
+
+
+keyring = KeyRing(
+    settings.ENCRYPTION_KEY_VERSION,
+    {**settings.ENCRYPTION_RETIRED_KEYS, settings.ENCRYPTION_KEY_VERSION: settings.ENCRYPTION_KEY},
+)
+
+
+# --- Per-request crypto counters ---
+@dataclass
+class CryptoStats:
+    encrypts: int = 0
+    decrypts: int = 0
+
+
+_crypto_stats: ContextVar[Optional[CryptoStats]] = ContextVar("crypto_stats", default=None)
+
+
+def begin_crypto_stats() -> CryptoStats:
+    """Start counting encrypt/decrypt calls for the current request/task."""
+    stats = CryptoStats()
+    _crypto_stats.set(stats)
+    return stats
+
+
+def encrypt_bytes(value: bytes) -> bytes:
+    stats = _crypto_stats.get()
+    if stats is not None:
+        stats.encrypts += 1
+    return keyring.encrypt(value)
+
+
+def decrypt_bytes(token: Union[bytes, str]) -> bytes:
+    stats = _crypto_stats.get()
+    if stats is not None:
+        stats.decrypts += 1
+    return keyring.decrypt(token)
@@ -0,0 +1,107 @@
+"""
+ASGI middleware shared across the API.
+
+- CryptoStatsMiddleware: counts encrypt/decrypt calls made while serving each
+  request and reports them as X-Crypto-Decrypts / X-Crypto-Encrypts headers.
+- RateLimitMiddleware: per-user (bearer token) or per-IP GCRA budgets, one
+  budget per router; answers 429 with Retry-After once a budget is spent.
+"""
+import json
+import logging
+import math
+
+from core.encryption import begin_crypto_stats
+from core.rate_limit import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Process-wide totals since startup (exposed for ops dashboards)
+crypto_totals = {"requests": 0, "encrypts": 0, "decrypts": 0}
+
+
+class CryptoStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = begin_crypto_stats()
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-crypto-decrypts", str(stats.decrypts).encode()))
+                headers.append((b"x-crypto-encrypts", str(stats.encrypts).encode()))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            crypto_totals["requests"] += 1
+            crypto_totals["encrypts"] += stats.encrypts
+            crypto_totals["decrypts"] += stats.decrypts
+            logger.debug("%s %s decrypts=%d encrypts=%d",
+                         scope.get("method"), scope.get("path"), stats.decrypts, stats.encrypts)
+
+
+class RateLimitMiddleware:
+    def __init__(self, app, limiter=rate_limiter):
+        self.app = app
+        self.limiter = limiter
+
+    @staticmethod
+    def _identity(scope) -> str:
+        """Authenticated callers are limited per user, everyone else per client IP."""
+        from core.security import _decode_token_cached
+
+        for name, value in scope.get("headers", []):
+            if name == b"authorization" and value[:7].lower() == b"bearer ":
+                try:
+                    sub = _decode_token_cached(value[7:].decode()).get("sub")
+                except Exception:
+                    break
+                if sub:
+                    return f"user:{sub}"
+                break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        budget = self.limiter.budget_for(scope["path"])
+        if budget is None:
+            await self.app(scope, receive, send)
+            return
+
+        decision = await self.limiter.check(self._identity(scope), budget)
+        limit_headers = [
+            (b"x-ratelimit-limit", str(budget.limit).encode()),
+            (b"x-ratelimit-remaining", str(decision.remaining).encode()),
+        ]
+        if not decision.allowed:
+            body = json.dumps({"detail": "Too many requests. Please slow down and try again shortly."}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(math.ceil(decision.retry_after)).encode()),
+                    *limit_headers,
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_limits(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + limit_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_limits)
@@ -0,0 +1,91 @@
+"""
+Compact binary record codec for encrypted health payloads.
+
+A record is a fixed, ordered set of numeric fields. Only the fields that are
+present are written, so a wearable reading with just a heart rate costs a few
+bytes instead of nine separate ciphertexts.
+
+Layout (little-endian):
+    u8   format version
+    u16  presence bitmask (bit i set → field i present)
+    f64  value for every present field, in field order
+
+GroupedRecordCodec uses the same header for per-metric aggregates (rollups).
+"""
+import struct
+from typing import Dict, Optional, Sequence
+
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<BH")
+
+
+class RecordCodec:
+    """Pack/unpack a dict of optional floats into the compact layout above."""
+
+    def __init__(self, fields: Sequence[str]):
+        if len(fields) > 16:
+            raise ValueError("RecordCodec supports at most 16 fields")
+        self.fields = tuple(fields)
+        self._bits = {name: 1 << i for i, name in enumerate(self.fields)}
+        # One precompiled struct per presence count keeps pack/unpack allocation-free
+        self._bodies = [struct.Struct(f"<{n}d") for n in range(len(self.fields) + 1)]
+
+    def pack(self, values: Dict[str, Optional[float]]) -> bytes:
+        mask = 0
+        present = []
+        for name in self.fields:
+            value = values.get(name)
+            if value is not None:
+                mask |= self._bits[name]
+                present.append(float(value))
+        return _HEADER.pack(FORMAT_VERSION, mask) + self._bodies[len(present)].pack(*present)
+
+    def unpack(self, data: bytes) -> Dict[str, Optional[float]]:
+        version, mask = _HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported record format version {version}")
+        names = [name for name in self.fields if mask & self._bits[name]]
+        values = self._bodies[len(names)].unpack_from(data, _HEADER.size)
+        record = dict.fromkeys(self.fields)
+        record.update(zip(names, values))
+        return record
+
+
+class GroupedRecordCodec:
+    """
+    Pack {group: {stat: float}} where every present group carries all stats,
+    e.g. per-metric aggregates. Same header as RecordCodec, with the bitmask
+    marking present groups; each present group adds len(stats) f64 values.
+    """
+
+    def __init__(self, groups: Sequence[str], stats: Sequence[str]):
+        if len(groups) > 16:
+            raise ValueError("GroupedRecordCodec supports at most 16 groups")
+        self.groups = tuple(groups)
+        self.stats = tuple(stats)
+        self._bits = {name: 1 << i for i, name in enumerate(self.groups)}
+        width = len(self.stats)
+        self._bodies = [struct.Struct(f"<{n * width}d") for n in range(len(self.groups) + 1)]
+
+    def pack(self, values: Dict[str, Dict[str, float]]) -> bytes:
+        mask = 0
+        flat = []
+        for name in self.groups:
+            group = values.get(name)
+            if group:
+                mask |= self._bits[name]
+                flat.extend(float(group[stat]) for stat in self.stats)
+        return _HEADER.pack(FORMAT_VERSION, mask) + self._bodies[bin(mask).count("1")].pack(*flat)
+
+    def unpack(self, data: bytes) -> Dict[str, Dict[str, float]]:
+        version, mask = _HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported record format version {version}")
+        names = [name for name in self.groups if mask & self._bits[name]]
+        flat = self._bodies[len(names)].unpack_from(data, _HEADER.size)
+        width = len(self.stats)
+        return {
+            name: dict(zip(self.stats, flat[i * width:(i + 1) * width]))
+            for i, name in enumerate(names)
+        }
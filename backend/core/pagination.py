@@ -0,0 +1,56 @@
+"""
+Keyset (cursor) pagination for time-ordered history endpoints.
+
+A page is fetched with `WHERE (time, id) < (cursor time, cursor id)` over a
+composite (owner, time, id) index, so every page costs the same no matter how
+deep into the history it is — unlike OFFSET, which scans every skipped row.
+
+The cursor is opaque to clients: base64url of the last row's (time, id).
+"""
+from datetime import datetime
+from typing import List, Optional, Tuple
+import base64
+import json
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: datetime, row_id: str) -> str:
+    raw = json.dumps([timestamp.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(timestamp), str(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def keyset_page(query, time_col, id_col, cursor: Optional[str], limit: int, descending: bool = True):
+    """Order `query` by (time, id), start after `cursor`, and fetch one extra row to detect more pages."""
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        if descending:
+            query = query.where(or_(time_col < timestamp, and_(time_col == timestamp, id_col < row_id)))
+        else:
+            query = query.where(or_(time_col > timestamp, and_(time_col == timestamp, id_col > row_id)))
+    if descending:
+        query = query.order_by(time_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(time_col.asc(), id_col.asc())
+    return query.limit(limit + 1)
+
+
+def split_page(rows: List, limit: int, time_attr: str) -> Tuple[List, Optional[str]]:
+    """Trim the look-ahead row; returns (page, cursor for the next page or None)."""
+    if len(rows) <= limit:
+        return list(rows), None
+    page = list(rows[:limit])
+    last = page[-1]
+    return page, encode_cursor(getattr(last, time_attr), last.id)
@@ -0,0 +1,181 @@
+"""
+Request rate limiting with GCRA (generic cell rate algorithm).
+
+Each key stores a single number — its theoretical arrival time (TAT) — so a
+check is one lookup and one write: O(1) time and state per key. A budget of
+N requests per W seconds admits a burst of N and then one request every W/N
+seconds, without the boundary spikes of fixed windows.
+
+Stores:
+- "local": in-process dict (default; one budget per uvicorn worker)
+- "redis": shared across workers via REDIS_URL, evaluated atomically in Lua
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+import logging
+import time
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Budget:
+    name: str
+    limit: int
+    window: float
+
+    @property
+    def interval(self) -> float:
+        return self.window / self.limit
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    remaining: int
+    retry_after: float = 0.0
+
+
+def _gcra(tat: Optional[float], now: float, budget: Budget):
+    """Return (decision, new_tat or None when rejected)."""
+    tat = max(tat or now, now)
+    new_tat = tat + budget.interval
+    allow_at = new_tat - budget.window
+    if now < allow_at:
+        return Decision(False, 0, allow_at - now), None
+    remaining = int((now - allow_at) / budget.interval)
+    return Decision(True, remaining), new_tat
+
+
+class LocalRateLimitStore:
+    """
+    Per-process TAT table. Ordered by last touch so expired keys are evicted
+    from the front a couple at a time — pruning stays O(1) per request.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._tat: "OrderedDict[str, float]" = OrderedDict()
+
+    async def hit(self, key: str, budget: Budget) -> Decision:
+        now = time.monotonic()
+        decision, new_tat = _gcra(self._tat.get(key), now, budget)
+        if new_tat is not None:
+            self._tat[key] = new_tat
+            self._tat.move_to_end(key)
+        self._prune(now)
+        return decision
+
+    def _prune(self, now: float):
+        for _ in range(2):
+            if not self._tat:
+                return
+            key, tat = next(iter(self._tat.items()))
+            if tat > now and len(self._tat) <= self.max_keys:
+                return
+            del self._tat[key]
+
+    def __len__(self):
+        return len(self._tat)
+
+
+_GCRA_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - window
+if now < allow_at then
+  return {0, tostring(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, tostring(math.floor((now - allow_at) / interval))}
+"""
+
+
+class RedisRateLimitStore:
+    """TAT table shared by all workers; uses the Redis clock so hosts can drift."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package (pip install redis)") from exc
+        self._client = redis.from_url(url, decode_responses=True)
+        self._script = self._client.register_script(_GCRA_LUA)
+
+    async def hit(self, key: str, budget: Budget) -> Decision:
+        allowed, value = await self._script(keys=[f"ratelimit:{key}"], args=[budget.interval, budget.window])
+        if int(allowed):
+            return Decision(True, int(float(value)))
+        return Decision(False, 0, float(value))
+
+
+# Never throttled, whatever the configuration says: an SOS must always go through
+ALWAYS_EXEMPT = frozenset({"/api/v1/emergency/trigger"})
+
+
+class RateLimiter:
+    """Resolves the budget for a path and applies it to the caller's key."""
+
+    def __init__(self, store, default: Budget, router_budgets: dict):
+        self.store = store
+        self.default = default
+        self.prefixes = [(f"/api/v1/{name}", budget) for name, budget in router_budgets.items()]
+        self.allowed = 0
+        self.rejected = 0
+        self.store_errors = 0
+
+    def budget_for(self, path: str) -> Optional[Budget]:
+        if path in ALWAYS_EXEMPT or not path.startswith("/api/"):
+            return None
+        for prefix, budget in self.prefixes:
+            if path == prefix or path.startswith(prefix + "/"):
+                return budget
+        return self.default
+
+    async def check(self, identity: str, budget: Budget) -> Decision:
+        try:
+            decision = await self.store.hit(f"{budget.name}:{identity}", budget)
+        except Exception:
+            # Fail open: an unreachable shared store must not take the API down
+            self.store_errors += 1
+            logger.warning("Rate limit store unavailable; allowing request", exc_info=True)
+            return Decision(True, budget.limit)
+        if decision.allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+        return decision
+
+    def stats(self) -> dict:
+        return {
+            "backend": settings.RATE_LIMIT_BACKEND,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "store_errors": self.store_errors,
+            "budgets": {b.name: f"{b.limit}/{b.window:g}s" for _, b in self.prefixes}
+            | {self.default.name: f"{self.default.limit}/{self.default.window:g}s"},
+        }
+
+
+def build_rate_limiter() -> RateLimiter:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        store = RedisRateLimitStore(settings.REDIS_URL)
+    else:
+        store = LocalRateLimitStore(settings.CACHE_MAX_ENTRIES)
+    window = settings.RATE_LIMIT_WINDOW
+    return RateLimiter(
+        store,
+        Budget("default", settings.RATE_LIMIT_REQUESTS, window),
+        {name: Budget(name, limit, window) for name, limit in settings.RATE_LIMIT_ROUTER_BUDGETS.items()},
+    )
+
+
+rate_limiter = build_rate_limiter()
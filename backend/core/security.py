@@ -1,23 +1,35 @@
 """
 Security utilities:
-- Password hashing (bcrypt)
+- Password hashing (bcrypt, on a bounded executor)
 - JWT access & refresh tokens
 - Biometric token verification (Face ID / Fingerprint stub)
 - Aadhaar FaceRD integration stub
-- Current user dependency
+- Current user dependency (with principal cache)
 """
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from enum import Enum
 from typing import Optional, Annotated
+import asyncio
+import base64
+import hmac
+import json
+import time
 import httpx
 import bcrypt
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 
+from core.cache import NamedCache
 from core.config import settings
-from core.database import get_db
+from core.database import Ciphertext, get_db, on_commit
+from sqlalchemy import DateTime, Enum as SAEnum, LargeBinary, inspect as sa_inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -37,6 +49,68 @@ def verify_password(plain: str, hashed: str) -> bool:
     return bcrypt.checkpw(_to_bytes(plain), hashed.encode("utf-8"))
 
 
+class PasswordHashingPool:
+    """
+    Runs bcrypt off the event loop on a dedicated, bounded executor.
+    At most `workers` hashes run at once; beyond `workers + max_queue`
+    in-flight requests new ones are rejected with 503 instead of piling up,
+    so a login storm cannot starve SOS or vitals traffic on the same worker.
+    """
+
+    def __init__(self, workers: int, max_queue: int, kind: str = "thread"):
+        if kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.workers = workers
+        self.max_in_flight = workers + max_queue
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn, *args):
+        if self.in_flight >= self.max_in_flight:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many sign-in attempts in progress. Please retry shortly.",
+                headers={"Retry-After": "1"},
+            )
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": max(self.in_flight - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_pool = PasswordHashingPool(
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_MAX_QUEUE,
+    settings.PASSWORD_HASH_EXECUTOR,
+)
+
+
+async def hash_password_async(plain: str) -> str:
+    return await password_pool.run(hash_password, plain)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await password_pool.run(verify_password, plain, hashed)
+
+
 # -- JWT Tokens ----------------------------------------------------------------
 
 def create_access_token(subject: str, extra: dict = {}) -> str:
@@ -104,6 +178,73 @@ async def verify_aadhaar_face(aadhaar_number: str, face_image_b64: str) -> dict:
         return resp.json()
 
 
+# -- Principal Cache -----------------------------------------------------------
+# get_current_user runs on every authenticated request. The user row is cached
+# (ciphertext columns stay encrypted in the cache) and re-attached to the
+# request's session without a SELECT. Any endpoint that changes the user must
+# call invalidate_principal().
+
+principal_cache = NamedCache("principal", ttl=settings.PRINCIPAL_CACHE_TTL)
+
+# Verified JWTs → payload, so repeat requests skip signature checks (per worker)
+_token_cache: "OrderedDict[str, dict]" = OrderedDict()
+_TOKEN_CACHE_SIZE = 4096
+
+
+def _decode_token_cached(token: str) -> dict:
+    payload = _token_cache.get(token)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        _token_cache.move_to_end(token)
+        return payload
+    payload = decode_token(token)
+    _token_cache[token] = payload
+    if len(_token_cache) > _TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    return payload
+
+
+def _serialize_user(user) -> str:
+    data = {}
+    for attr in sa_inspect(type(user)).column_attrs:
+        value = getattr(user, attr.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, bytes):
+            value = base64.b64encode(value).decode()
+        data[attr.key] = value
+    return json.dumps(data)
+
+
+def _deserialize_user(raw: str):
+    from models.user import User
+
+    data = json.loads(raw)
+    mapper = sa_inspect(User)
+    user = mapper.class_manager.new_instance()
+    for attr in mapper.column_attrs:
+        value = data.get(attr.key)
+        col_type = attr.columns[0].type
+        if value is not None:
+            if isinstance(col_type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(col_type, SAEnum) and col_type.enum_class is not None:
+                value = col_type.enum_class(value)
+            elif isinstance(col_type, (LargeBinary, Ciphertext)):
+                value = base64.b64decode(value)
+        set_committed_value(user, attr.key, value)
+    make_transient_to_detached(user)
+    return user
+
+
+async def invalidate_principal(user_id: str, db: AsyncSession = None):
+    """Drop a cached user now and again after `db` commits (closes the re-cache race)."""
+    await principal_cache.delete(user_id)
+    if db is not None:
+        on_commit(db, lambda: principal_cache.delete(user_id))
+
+
 # -- Current User Dependency ---------------------------------------------------
 
 async def get_current_user(
@@ -113,13 +254,20 @@ async def get_current_user(
     from models.user import User
     from sqlalchemy import select
 
-    payload = decode_token(token)
+    payload = _decode_token_cached(token)
     user_id: str = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token subject")
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    cached = await principal_cache.get(user_id)
+    if cached is not None:
+        user = _deserialize_user(cached)
+        db.add(user)
+    else:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user:
+            await principal_cache.set(user_id, _serialize_user(user))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
@@ -131,3 +279,15 @@ async def get_current_active_user(
     current_user=Depends(get_current_user),
 ):
     return current_user
+
+
+async def require_admin(x_admin_key: Annotated[Optional[str], Header()] = None):
+    """Guard for ops endpoints: X-Admin-Key must match ADMIN_API_KEY (DEBUG-only if unset)."""
+    if settings.ADMIN_API_KEY:
+        if not x_admin_key or not hmac.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+            raise HTTPException(status_code=403, detail="Admin key required")
+    elif not settings.DEBUG:
+        raise HTTPException(
+            status_code=403,
+            detail="Admin endpoints are disabled. Set ADMIN_API_KEY (or DEBUG=True) in .env.",
+        )
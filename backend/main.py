@@ -6,10 +6,14 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
+import asyncio
+import logging
 import uvicorn
 
 from core.config import settings
 from core.database import init_db
+from core.middleware import CryptoStatsMiddleware, RateLimitMiddleware
+from core.security import password_pool
 from routers import (
     auth,
     users,
@@ -22,14 +26,46 @@ from routers import (
     chat,
     wearables,
     travel,
+    admin,
 )
 
+logger = logging.getLogger(__name__)
+
+
+async def _flush_drift_periodically(recorder):
+    while True:
+        await asyncio.sleep(settings.DRIFT_FLUSH_SECONDS)
+        try:
+            await recorder.flush()
+        except Exception:               # deltas are kept; retried next interval
+            logger.exception("Drift histogram flush failed")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     await init_db()
+    if settings.MODEL_LOADING == "startup":
+        from services.model_registry import model_registry
+        await asyncio.to_thread(model_registry.warmup)
+    if settings.FOOD_CATALOGUE_LOADING == "startup":
+        from services.food_catalogue import get_catalogue
+        await asyncio.to_thread(get_catalogue)
+    background = []
+    if settings.REENCRYPT_ON_STARTUP:
+        from services.reencryption import reencrypt_all
+        background.append(asyncio.create_task(reencrypt_all(pause_s=0.05)))
+    from services.drift import drift_recorder
+    from services.shadow_scoring import shadow_scorer
+    background.append(asyncio.create_task(_flush_drift_periodically(drift_recorder)))
+    shadow_scorer.start()
     yield
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    await shadow_scorer.stop()
+    await drift_recorder.flush()
+    password_pool.shutdown()
 
 
 app = FastAPI(
@@ -53,6 +89,8 @@ A comprehensive backend API for the CareCompanion elderly app, built across 6 ph
 )
 
 # --- Middleware ---
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)    # innermost, so 429s still get CORS headers
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
@@ -61,6 +99,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
+app.add_middleware(CryptoStatsMiddleware)
 
 # --- Routers ---
 app.include_router(auth.router,            prefix="/api/v1/auth",        tags=["Phase 2 · Authentication"])
@@ -74,6 +113,7 @@ app.include_router(risk_prediction.router, prefix="/api/v1/risk",        tags=["
 app.include_router(chat.router,            prefix="/api/v1/chat",        tags=["Phase 4 · AI Companion"])
 app.include_router(travel.router,          prefix="/api/v1/travel",      tags=["Phase 4 · Travel Matching"])
 app.include_router(emergency.router,       prefix="/api/v1/emergency",   tags=["Phase 5 · Emergency SOS"])
+app.include_router(admin.router,           prefix="/api/v1/admin",       tags=["Phase 6 · Optimization"])
 
 
 @app.get("/", tags=["Health Check"])
@@ -1,19 +1,23 @@
 """
 SQLAlchemy ORM Models for CareCompanion.
 Sensitive health fields use EncryptedString (AES-256).
+Vital readings are packed into a single encrypted record (see core/packing.py).
 """
 from datetime import datetime, timezone
-from typing import Optional
+from typing import NamedTuple, Optional
 import uuid
 
 from sqlalchemy import (
     Column, String, Float, Integer, Boolean,
-    DateTime, ForeignKey, Text, Enum, JSON
+    DateTime, ForeignKey, Text, Enum, JSON, Index
 )
 from sqlalchemy.orm import relationship
 import enum
 
-from core.database import Base, EncryptedString
+from core.config import settings
+from core.database import Base, Ciphertext, EncryptedString, EncryptedField
+from core.encryption import encrypt_bytes
+from core.packing import GroupedRecordCodec, RecordCodec
 
 
 def now_utc():
@@ -69,10 +73,13 @@ class User(Base):
     language        = Column(String(10), default="en")
     mobility_level  = Column(Enum(MobilityLevel), default=MobilityLevel.self_reliant)
 
-    # Encrypted sensitive fields (HIPAA/GDPR)
-    aadhaar_number  = Column(EncryptedString, nullable=True)
-    medical_history = Column(EncryptedString, nullable=True)      # JSON string
-    allergies       = Column(EncryptedString, nullable=True)
+    # Encrypted sensitive fields (HIPAA/GDPR) — decrypted only when read
+    _aadhaar_number  = Column("aadhaar_number", Ciphertext, nullable=True)
+    _medical_history = Column("medical_history", Ciphertext, nullable=True)   # JSON string
+    _allergies       = Column("allergies", Ciphertext, nullable=True)
+    aadhaar_number  = EncryptedField("_aadhaar_number")
+    medical_history = EncryptedField("_medical_history")
+    allergies       = EncryptedField("_allergies")
 
     # UPI / biometric
     upi_id          = Column(String(100), nullable=True)
@@ -101,27 +108,285 @@ class User(Base):
 
 # ── Vitals (Phase 3) ──────────────────────────────────────────────────────────
 
+VITAL_METRICS = (
+    "heart_rate", "systolic_bp", "diastolic_bp", "glucose_level", "spo2",
+    "weight_kg", "steps", "sleep_hours", "temperature_c",
+)
+INTEGER_METRICS = {"steps"}
+
+vital_codec = RecordCodec(VITAL_METRICS)
+
+
+def format_metric(name: str, value: Optional[float]) -> Optional[str]:
+    """Render a numeric metric exactly as the legacy string columns stored it."""
+    if value is None:
+        return None
+    return str(int(value)) if name in INTEGER_METRICS else str(float(value))
+
+
+class VitalMetric:
+    """
+    Attribute facade for one metric of a Vital.
+    Reads/writes the same string values the per-column layout exposed, so
+    routers and services keep using `vital.heart_rate` unchanged.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.legacy_attr = f"legacy_{name}"
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        if obj._packed is None:
+            return getattr(obj, self.legacy_attr)
+        return format_metric(self.name, obj.metric_values()[self.name])
+
+    def __set__(self, obj, value):
+        values = dict(obj.metric_values())
+        values[self.name] = None if value is None else float(value)
+        obj.store_metrics(values)
+
+
 class Vital(Base):
     __tablename__ = "vitals"
+    __table_args__ = (
+        Index("ix_vitals_user_recorded_id", "user_id", "recorded_at", "id"),   # keyset pagination
+    )
 
     id              = Column(String, primary_key=True, default=new_uuid)
     user_id         = Column(String, ForeignKey("users.id"), nullable=False, index=True)
     recorded_at     = Column(DateTime(timezone=True), default=now_utc, index=True)
     source          = Column(String(50), default="manual")       # manual | wearable | cgm
 
-    # Encrypted health values
-    heart_rate      = Column(EncryptedString, nullable=True)     # bpm
-    systolic_bp     = Column(EncryptedString, nullable=True)     # mmHg
-    diastolic_bp    = Column(EncryptedString, nullable=True)
-    glucose_level   = Column(EncryptedString, nullable=True)     # mg/dL
-    spo2            = Column(EncryptedString, nullable=True)     # %
-    weight_kg       = Column(EncryptedString, nullable=True)
-    steps           = Column(EncryptedString, nullable=True)
-    sleep_hours     = Column(EncryptedString, nullable=True)
-    temperature_c   = Column(EncryptedString, nullable=True)
+    # All metrics of one reading in a single authenticated ciphertext
+    _packed         = Column("packed", Ciphertext, nullable=True)
+    packed          = EncryptedField("_packed", binary=True)
+
+    # Legacy per-column encrypted values (rows written before packing;
+    # migrated by services/vitals_storage.py)
+    legacy_heart_rate    = Column("heart_rate", EncryptedString, nullable=True)     # bpm
+    legacy_systolic_bp   = Column("systolic_bp", EncryptedString, nullable=True)    # mmHg
+    legacy_diastolic_bp  = Column("diastolic_bp", EncryptedString, nullable=True)
+    legacy_glucose_level = Column("glucose_level", EncryptedString, nullable=True)  # mg/dL
+    legacy_spo2          = Column("spo2", EncryptedString, nullable=True)           # %
+    legacy_weight_kg     = Column("weight_kg", EncryptedString, nullable=True)
+    legacy_steps         = Column("steps", EncryptedString, nullable=True)
+    legacy_sleep_hours   = Column("sleep_hours", EncryptedString, nullable=True)
+    legacy_temperature_c = Column("temperature_c", EncryptedString, nullable=True)
+
+    heart_rate      = VitalMetric()
+    systolic_bp     = VitalMetric()
+    diastolic_bp    = VitalMetric()
+    glucose_level   = VitalMetric()
+    spo2            = VitalMetric()
+    weight_kg       = VitalMetric()
+    steps           = VitalMetric()
+    sleep_hours     = VitalMetric()
+    temperature_c   = VitalMetric()
 
     user            = relationship("User", back_populates="vitals")
 
+    def metric_values(self) -> dict:
+        """Numeric metric values, decoded once per ciphertext and memoized."""
+        packed = self.packed
+        if packed is None:
+            return {
+                name: float(raw) if (raw := getattr(self, f"legacy_{name}")) is not None else None
+                for name in VITAL_METRICS
+            }
+        cached = self.__dict__.get("_metric_cache")
+        if cached is not None and cached[0] is packed:
+            return cached[1]
+        values = vital_codec.unpack(packed)
+        self.__dict__["_metric_cache"] = (packed, values)
+        return values
+
+    def store_metrics(self, values: dict):
+        """Write all metrics at once: one packed ciphertext, or legacy columns."""
+        if settings.VITALS_STORAGE != "packed":
+            for name in VITAL_METRICS:
+                setattr(self, f"legacy_{name}", format_metric(name, values.get(name)))
+            return
+        values = {name: values.get(name) for name in VITAL_METRICS}
+        packed = vital_codec.pack(values)
+        self.packed = packed
+        self.__dict__["_metric_cache"] = (packed, values)
+        # Clear legacy columns only where they were loaded (i.e. migrating an old row)
+        for name in VITAL_METRICS:
+            if self.__dict__.get(f"legacy_{name}") is not None:
+                setattr(self, f"legacy_{name}", None)
+
+    @classmethod
+    def from_metrics(cls, metrics: dict, **columns) -> "Vital":
+        """Build a Vital from numeric metrics with a single pack/encrypt."""
+        vital = cls(**columns)
+        vital.store_metrics(metrics)
+        return vital
+
+    def as_reading(self) -> "VitalReading":
+        return VitalReading(self.id, self.recorded_at, self.source, self.metric_values())
+
+    @classmethod
+    def row_from_metrics(cls, metrics: dict, **columns) -> dict:
+        """Same as from_metrics, but as a column-name dict for bulk Core inserts."""
+        if settings.VITALS_STORAGE != "packed":
+            return {**columns, **{name: format_metric(name, metrics.get(name)) for name in VITAL_METRICS}}
+        values = {name: metrics.get(name) for name in VITAL_METRICS}
+        return {**columns, "packed": encrypt_bytes(vital_codec.pack(values))}
+
+
+class VitalReading(NamedTuple):
+    """A stored reading as seen by derived-state updaters (rollups, latest values)."""
+    id: str
+    recorded_at: datetime
+    source: str
+    metrics: dict                                   # {metric: float or None}
+
+
+# ── Vital Rollups (Phase 3 · caregiver dashboards) ───────────────────────────
+
+ROLLUP_STATS = ("count", "sum", "min", "max", "last", "last_at")   # last_at: epoch seconds
+rollup_codec = GroupedRecordCodec(VITAL_METRICS, ROLLUP_STATS)
+
+
+class VitalRollup(Base):
+    """Per-user hourly/daily aggregates of every metric, maintained on write."""
+    __tablename__ = "vital_rollups"
+
+    user_id         = Column(String, ForeignKey("users.id"), primary_key=True)
+    granularity     = Column(String(8), primary_key=True)         # hour | day
+    bucket_start    = Column(DateTime(timezone=True), primary_key=True)
+
+    # {metric: {count, sum, min, max, last, last_at}} packed and encrypted
+    _stats          = Column("stats", Ciphertext, nullable=True)
+    stats           = EncryptedField("_stats", binary=True)
+    updated_at      = Column(DateTime(timezone=True), default=now_utc, onupdate=now_utc)
+
+    def metric_stats(self) -> dict:
+        packed = self.stats
+        return rollup_codec.unpack(packed) if packed is not None else {}
+
+    def store_metric_stats(self, stats: dict):
+        self.stats = rollup_codec.pack(stats)
+
+
+# ── Latest Vitals (Phase 3 · current state) ──────────────────────────────────
+
+latest_codec = GroupedRecordCodec(VITAL_METRICS, ("value", "recorded_at"))   # recorded_at: epoch seconds
+
+
+def _epoch(ts: datetime) -> float:
+    """Naive timestamps (SQLite round-trips) are UTC."""
+    return (ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts).timestamp()
+
+
+class LatestMetric:
+    """Last known value of one metric, in the same string format as Vital exposes."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return format_metric(self.name, obj.metric_values()[self.name])
+
+
+class UserLatestVital(Base):
+    """
+    One row per user with the last known value of every metric, upserted in
+    the same transaction as each vital insert. Metrics are tracked separately
+    because a reading often carries only some of them.
+    """
+    __tablename__ = "user_latest_vitals"
+
+    user_id         = Column(String, ForeignKey("users.id"), primary_key=True)
+    vital_id        = Column(String, nullable=True)               # newest reading overall
+    recorded_at     = Column(DateTime(timezone=True), nullable=True)
+    source          = Column(String(50), nullable=True)
+
+    # {metric: {value, recorded_at}} packed and encrypted
+    _latest         = Column("latest", Ciphertext, nullable=True)
+    latest          = EncryptedField("_latest", binary=True)
+    updated_at      = Column(DateTime(timezone=True), default=now_utc, onupdate=now_utc)
+
+    heart_rate      = LatestMetric()
+    systolic_bp     = LatestMetric()
+    diastolic_bp    = LatestMetric()
+    glucose_level   = LatestMetric()
+    spo2            = LatestMetric()
+    weight_kg       = LatestMetric()
+    steps           = LatestMetric()
+    sleep_hours     = LatestMetric()
+    temperature_c   = LatestMetric()
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.vital_id
+
+    def metric_readings(self) -> dict:
+        """{metric: {"value", "recorded_at"}} for metrics seen so far, memoized per ciphertext."""
+        packed = self.latest
+        if packed is None:
+            return {}
+        cached = self.__dict__.get("_readings_cache")
+        if cached is not None and cached[0] is packed:
+            return cached[1]
+        readings = latest_codec.unpack(packed)
+        self.__dict__["_readings_cache"] = (packed, readings)
+        return readings
+
+    def metric_values(self) -> dict:
+        readings = self.metric_readings()
+        return {name: readings[name]["value"] if name in readings else None for name in VITAL_METRICS}
+
+    @property
+    def measured_at(self) -> dict:
+        """When each metric's latest value was recorded."""
+        return {
+            name: datetime.fromtimestamp(r["recorded_at"], timezone.utc)
+            for name, r in self.metric_readings().items()
+        }
+
+    def fold(self, readings) -> bool:
+        """Apply VitalReadings (any order); returns True if anything changed."""
+        latest = {name: dict(r) for name, r in self.metric_readings().items()}
+        newest_at = _epoch(self.recorded_at) if self.recorded_at is not None else None
+        changed = False
+        for reading in readings:
+            at = _epoch(reading.recorded_at)
+            for name, value in reading.metrics.items():
+                if value is not None and (name not in latest or at >= latest[name]["recorded_at"]):
+                    latest[name] = {"value": value, "recorded_at": at}
+                    changed = True
+            if newest_at is None or at >= newest_at:
+                newest_at = at
+                self.vital_id, self.recorded_at, self.source = reading.id, reading.recorded_at, reading.source
+                changed = True
+        if changed:
+            self.latest = latest_codec.pack(latest)
+        return changed
+
+
+# ── Risk feature state (Phase 3 · incremental features) ─────────────────────
+
+class UserFeatureState(Base):
+    """
+    Risk-model inputs per user (services.feature_store.FeatureState: the
+    newest RISK_HISTORY_READINGS readings), folded forward in the same
+    transaction as each vital insert so a prediction reads one row instead
+    of re-decrypting recent history.
+    A row with no state is a placeholder awaiting its first build.
+    """
+    __tablename__ = "user_feature_states"
+
+    user_id         = Column(String, ForeignKey("users.id"), primary_key=True)
+    last_vital_id   = Column(String, nullable=True)              # last reading folded in (cache fingerprint)
+    _state          = Column("state", Ciphertext, nullable=True)
+    state           = EncryptedField("_state", binary=True)
+    updated_at      = Column(DateTime(timezone=True), default=now_utc, onupdate=now_utc)
+
 
 # ── Wearable Tokens (Phase 3) ─────────────────────────────────────────────────
 
@@ -131,8 +396,10 @@ class WearableToken(Base):
     id              = Column(String, primary_key=True, default=new_uuid)
     user_id         = Column(String, ForeignKey("users.id"), nullable=False)
     provider        = Column(String(50), nullable=False)         # thryve | vitalera | googlefit | apple_health
-    access_token    = Column(EncryptedString, nullable=False)
-    refresh_token   = Column(EncryptedString, nullable=True)
+    _access_token   = Column("access_token", Ciphertext, nullable=False)
+    _refresh_token  = Column("refresh_token", Ciphertext, nullable=True)
+    access_token    = EncryptedField("_access_token")
+    refresh_token   = EncryptedField("_refresh_token")
     expires_at      = Column(DateTime(timezone=True), nullable=True)
     connected_at    = Column(DateTime(timezone=True), default=now_utc)
 
@@ -165,28 +432,55 @@ class Medication(Base):
 
 class MealPlan(Base):
     __tablename__ = "meal_plans"
+    __table_args__ = (
+        Index("ix_meal_plans_user_date", "user_id", "date"),
+    )
 
     id              = Column(String, primary_key=True, default=new_uuid)
     user_id         = Column(String, ForeignKey("users.id"), nullable=False, index=True)
     date            = Column(String(10), nullable=False)         # YYYY-MM-DD
     meal_type       = Column(Enum(MealType), nullable=False)
-    items           = Column(JSON, nullable=False)               # [{"name": ..., "quantity": ..., "calories": ...}]
+    # Generated plans reference a shared MealItemSet; the inline payload is NULL then
+    items_payload   = Column("items", JSON(none_as_null=True), nullable=True)   # [{"name": ..., "quantity": ..., "calories": ...}]
+    items_hash      = Column(String(32), ForeignKey("meal_item_sets.hash"), nullable=True)
     total_calories  = Column(Float, nullable=True)
     total_protein_g = Column(Float, nullable=True)
     total_carbs_g   = Column(Float, nullable=True)
     total_fat_g     = Column(Float, nullable=True)
     sodium_mg       = Column(Float, nullable=True)
+    potassium_mg    = Column(Float, nullable=True)
+    glycemic_load   = Column(Float, nullable=True)               # sum of GI × available carbs / 100
     generated_by    = Column(String(50), default="ml_model")    # ml_model | dietitian | manual
     notes           = Column(Text, nullable=True)
     created_at      = Column(DateTime(timezone=True), default=now_utc)
 
     user            = relationship("User", back_populates="meal_plans")
+    item_set        = relationship("MealItemSet", lazy="joined")
+
+    @property
+    def items(self) -> list:
+        return self.item_set.items if self.item_set is not None else self.items_payload
+
+
+class MealItemSet(Base):
+    """
+    Content-addressed meal item lists (services.meal_plans): plans generated
+    for the same meal and profile share one row instead of each storing a copy.
+    """
+    __tablename__ = "meal_item_sets"
+
+    hash            = Column(String(32), primary_key=True)       # sha256 of the canonical JSON, truncated
+    items           = Column(JSON, nullable=False)
+    created_at      = Column(DateTime(timezone=True), default=now_utc)
 
 
 # ── Risk Scores (Phase 3) ─────────────────────────────────────────────────────
 
 class RiskScore(Base):
     __tablename__ = "risk_scores"
+    __table_args__ = (
+        Index("ix_risk_scores_user_computed_id", "user_id", "computed_at", "id"),
+    )
 
     id              = Column(String, primary_key=True, default=new_uuid)
     user_id         = Column(String, ForeignKey("users.id"), nullable=False, index=True)
@@ -222,6 +516,9 @@ class EmergencyContact(Base):
 
 class SOSEvent(Base):
     __tablename__ = "sos_events"
+    __table_args__ = (
+        Index("ix_sos_events_user_triggered_id", "user_id", "triggered_at", "id"),
+    )
 
     id              = Column(String, primary_key=True, default=new_uuid)
     user_id         = Column(String, ForeignKey("users.id"), nullable=False, index=True)
@@ -232,7 +529,8 @@ class SOSEvent(Base):
     status          = Column(Enum(SOSStatus), default=SOSStatus.pending)
 
     # Encrypted health snapshot sent to responders
-    health_snapshot = Column(EncryptedString, nullable=True)     # JSON with vitals + meds + history
+    _health_snapshot = Column("health_snapshot", Ciphertext, nullable=True)  # JSON with vitals + meds + history
+    health_snapshot = EncryptedField("_health_snapshot")
 
     # Dispatch tracking
     police_notified = Column(Boolean, default=False)
@@ -262,11 +560,15 @@ class ChatSession(Base):
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        Index("ix_chat_messages_session_timestamp_id", "session_id", "timestamp", "id"),
+    )
 
     id              = Column(String, primary_key=True, default=new_uuid)
     session_id      = Column(String, ForeignKey("chat_sessions.id"), nullable=False, index=True)
     role            = Column(String(10), nullable=False)         # user | assistant
-    content         = Column(EncryptedString, nullable=False)   # encrypted for privacy
+    _content        = Column("content", Ciphertext, nullable=False)   # encrypted for privacy
+    content         = EncryptedField("_content")
     timestamp       = Column(DateTime(timezone=True), default=now_utc)
 
     session         = relationship("ChatSession", back_populates="messages")
@@ -290,3 +592,67 @@ class TravelProfile(Base):
     updated_at      = Column(DateTime(timezone=True), default=now_utc, onupdate=now_utc)
 
     user            = relationship("User", back_populates="travel_profiles")
+
+
+# ── Re-encryption progress (ops) ─────────────────────────────────────────────
+
+class ReencryptionCheckpoint(Base):
+    __tablename__ = "reencryption_checkpoints"
+
+    table_name      = Column(String(100), primary_key=True)
+    key_version     = Column(Integer, nullable=False)            # rotation target
+    last_pk         = Column(String, nullable=True)              # resume point (keyset)
+    rows_scanned    = Column(Integer, default=0)
+    values_rewritten = Column(Integer, default=0)
+    completed_at    = Column(DateTime(timezone=True), nullable=True)
+    updated_at      = Column(DateTime(timezone=True), default=now_utc, onupdate=now_utc)
+
+
+# ── Batch risk scoring runs (ops) ────────────────────────────────────────────
+
+class RiskScoringRun(Base):
+    __tablename__ = "risk_scoring_runs"
+
+    run_date        = Column(String(10), primary_key=True)       # YYYY-MM-DD; one run per day
+    last_user_id    = Column(String, nullable=True)              # resume point (keyset)
+    users_scored    = Column(Integer, default=0)
+    scores_written  = Column(Integer, default=0)
+    started_at      = Column(DateTime(timezone=True), default=now_utc)
+    completed_at    = Column(DateTime(timezone=True), nullable=True)
+    updated_at      = Column(DateTime(timezone=True), default=now_utc, onupdate=now_utc)
+
+
+# ── Model drift histograms (Phase 6 · monitoring) ────────────────────────────
+
+class DriftHistogram(Base):
+    """
+    Population-level histograms of risk scores and model inputs per model
+    version and UTC day (services.drift). Aggregate counts only — no user ids.
+    """
+    __tablename__ = "drift_histograms"
+
+    risk_type       = Column(String(20), primary_key=True)
+    model_version   = Column(String(20), primary_key=True)
+    day             = Column(String(10), primary_key=True)       # YYYY-MM-DD
+    histograms      = Column(JSON, nullable=True)                # {feature: {bucket: count}}
+    updated_at      = Column(DateTime(timezone=True), default=now_utc, onupdate=now_utc)
+
+
+# ── Shadow model scores (Phase 6 · model refinement) ─────────────────────────
+
+class ShadowScore(Base):
+    """
+    A candidate model's score for a live prediction (services.shadow_scoring),
+    kept for offline comparison with the served RiskScore before promotion.
+    """
+    __tablename__ = "shadow_scores"
+
+    id              = Column(String, primary_key=True, default=new_uuid)
+    risk_score_id   = Column(String, nullable=False, index=True)   # RiskScore.id (no FK: side table)
+    model_name      = Column(String(50), nullable=False)           # fall_risk | cardiac_risk
+    model_version   = Column(String(20), nullable=False)
+    score           = Column(Float, nullable=False)
+    primary_version = Column(String(20), nullable=False)           # version that served the request
+    primary_score   = Column(Float, nullable=False)
+    latency_ms      = Column(Float, nullable=False)                # candidate predict time
+    computed_at     = Column(DateTime(timezone=True), default=now_utc, index=True)
@@ -0,0 +1,96 @@
+"""
+Admin Router — Phase 6: Pilot Testing & Optimization
+Operational metrics and batch jobs for the pilot deployment. Guarded by X-Admin-Key.
+"""
+import asyncio
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import cache_stats
+from core.database import get_db
+from core.middleware import crypto_totals
+from core.rate_limit import rate_limiter
+from core.security import password_pool, require_admin
+from models.user import RiskScoringRun, RiskType
+from services.batch_scoring import run_batch_scoring, run_summary
+from services.drift import drift_report
+from services.ml_service import HEURISTIC_VERSION, RISK_MODELS, meal_plan_cache_info
+from services.model_registry import MODEL_NAMES, model_registry
+from services.shadow_scoring import shadow_scorer
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+# One population scoring run per API worker at a time
+_scoring_task: Optional[asyncio.Task] = None
+
+
+@router.get("/metrics", summary="Cache, encryption, password-hashing, rate-limit, shadow-scoring and meal-plan counters for this worker")
+async def metrics():
+    return {
+        "cache": cache_stats(),
+        "crypto": dict(crypto_totals),
+        "password_hashing": password_pool.stats(),
+        "rate_limit": rate_limiter.stats(),
+        "shadow": shadow_scorer.stats(),
+        "meal_plan_cache": meal_plan_cache_info(),
+    }
+
+
+@router.post("/risk-scoring/runs", status_code=202,
+             summary="Start (or resume) batch risk scoring of all active users in the background")
+async def start_risk_scoring(run_date: Optional[date] = Query(None, description="Defaults to today (UTC)")):
+    global _scoring_task
+    if _scoring_task is not None and not _scoring_task.done():
+        raise HTTPException(status_code=409, detail="A risk scoring run is already in progress")
+    _scoring_task = asyncio.create_task(run_batch_scoring(run_date.isoformat() if run_date else None))
+    return {"status": "started", "run_date": run_date}
+
+
+@router.get("/risk-scoring/runs/{run_date}", summary="Progress of a batch risk scoring run")
+async def risk_scoring_status(run_date: date, db: AsyncSession = Depends(get_db)):
+    run = await db.get(RiskScoringRun, run_date.isoformat())
+    if not run:
+        raise HTTPException(status_code=404, detail="No scoring run for this date")
+    summary = run_summary(run)
+    summary["running"] = _scoring_task is not None and not _scoring_task.done()
+    return summary
+
+
+@router.get("/models", summary="Deployed risk-model versions and the one this worker serves")
+async def list_models():
+    return model_registry.status()
+
+
+@router.post("/models/{name}/activate", summary="Hot-swap a risk model to another deployed version")
+async def activate_model(name: str, version: str = Query(..., max_length=20)):
+    if name not in MODEL_NAMES:
+        raise HTTPException(status_code=404, detail=f"Unknown model '{name}'")
+    try:
+        model = await asyncio.to_thread(model_registry.activate, name, version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid model artifact: {e}")
+    return {"name": model.name, "version": model.version, "model_used": model.model_used}
+
+
+@router.get("/drift/{risk_type}",
+            summary="Score and feature drift (PSI/KS) of a model version against a reference window")
+async def model_drift(
+    risk_type: RiskType,
+    version: Optional[str] = Query(None, max_length=20, description="Defaults to the version this worker serves"),
+    reference_version: Optional[str] = Query(None, max_length=20, description="Defaults to `version`"),
+    current_days: int = Query(7, ge=1, le=90),
+    reference_days: int = Query(7, ge=1, le=90),
+    db: AsyncSession = Depends(get_db),
+):
+    model_name = RISK_MODELS.get(risk_type.value)
+    if model_name is None:
+        raise HTTPException(status_code=404, detail=f"No model is deployed for '{risk_type.value}' risk")
+    if version is None:
+        model = await asyncio.to_thread(model_registry.get, model_name)
+        version = model.version if model else HEURISTIC_VERSION
+    return await drift_report(db, risk_type, version, reference_version, current_days, reference_days)
@@ -11,10 +11,10 @@ import uuid
 
 from core.database import get_db
 from core.security import (
-    hash_password, verify_password,
+    hash_password_async, verify_password_async,
     create_access_token, create_refresh_token, decode_token,
     verify_biometric_token, verify_aadhaar_face,
-    get_current_active_user,
+    get_current_active_user, invalidate_principal,
 )
 from core.config import settings
 from models.user import User
@@ -39,7 +39,7 @@ async def register(payload: RegisterRequest, db: AsyncSession = Depends(get_db))
         full_name=payload.full_name,
         phone=payload.phone,
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=await hash_password_async(payload.password),
         date_of_birth=payload.date_of_birth,
         gender=payload.gender,
         language=payload.language,
@@ -69,7 +69,7 @@ async def login(
     result = await db.execute(select(User).where(User.phone == form_data.username))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account is inactive")
@@ -89,7 +89,7 @@ async def login_json(payload: LoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.phone == payload.phone))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(payload.password, user.hashed_password):
+    if not user or not await verify_password_async(payload.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account is inactive")
@@ -152,6 +152,7 @@ async def aadhaar_verify(
     current_user.aadhaar_number = payload.aadhaar_number
     current_user.biometric_enrolled = True
     await db.flush()
+    await invalidate_principal(current_user.id, db)
 
     return {
         "verified": True,
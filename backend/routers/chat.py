@@ -2,14 +2,15 @@
 Chat Router — Phase 4: On-Device Conversational AI Companion
 Mistral-7B / Llama-3B with Active Listening & session memory
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 import uuid, json
 
 from core.database import get_db
+from core.pagination import keyset_page, split_page
 from core.security import get_current_active_user
 from models.user import ChatSession, ChatMessage, Medication
 from schemas.schemas import ChatMessageRequest, ChatMessageResponse, ChatHistoryResponse
@@ -130,9 +131,11 @@ async def send_message(
 
 
 @router.get("/sessions/{session_id}/history", response_model=ChatHistoryResponse,
-            summary="Retrieve full chat history for a session")
+            summary="Retrieve chat history for a session, oldest first, one page at a time")
 async def get_chat_history(
     session_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user=Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -146,12 +149,11 @@ async def get_chat_history(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    msgs_result = await db.execute(
-        select(ChatMessage)
-        .where(ChatMessage.session_id == session_id)
-        .order_by(ChatMessage.timestamp)
-    )
-    messages = msgs_result.scalars().all()
+    msgs_result = await db.execute(keyset_page(
+        select(ChatMessage).where(ChatMessage.session_id == session_id),
+        ChatMessage.timestamp, ChatMessage.id, cursor, limit, descending=False,
+    ))
+    messages, next_cursor = split_page(msgs_result.scalars().all(), limit, "timestamp")
 
     return ChatHistoryResponse(
         session_id=session_id,
@@ -165,4 +167,5 @@ async def get_chat_history(
             )
             for m in messages
         ],
+        next_cursor=next_cursor,
     )
@@ -1,22 +1,21 @@
 """
 Diet Router — Phase 3: Personalized AI Meal Plans (Random Forest / K-Means)
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
-from typing import List
-import uuid, json
+from typing import List, Optional
+from datetime import date as Date
 
 from core.database import get_db
 from core.security import get_current_active_user
-from models.user import MealPlan, Medication
-from schemas.schemas import DietGenerateRequest, MealPlanResponse
-from services.ml_service import generate_meal_plan
+from models.user import MealPlan, MealType
+from schemas.schemas import DietGenerateRequest, DietRangeRequest, FoodResponse, MealPlanResponse
+from services.food_catalogue import get_catalogue
+from services.meal_plans import resolve_conditions, save_meal_plans
 
 router = APIRouter()
 
-MEAL_TYPES = ["breakfast", "lunch", "dinner", "snack"]
-
 
 @router.post("/generate", response_model=List[MealPlanResponse], status_code=201,
              summary="Generate full-day AI meal plan (Random Forest + K-Means)")
@@ -29,41 +28,52 @@ async def generate_daily_plan(
     Generates personalized meal plans using dietary clustering (K-Means)
     and condition-aware recommendations (Random Forest).
     Accounts for diabetes, hypertension, and dietary preferences.
+    Regenerating a date replaces its plans instead of adding more.
     """
-    conditions = payload.conditions or []
-    # Infer conditions from medical history if not provided
-    if not conditions and current_user.medical_history:
-        try:
-            conditions = json.loads(current_user.medical_history)
-        except Exception:
-            pass
+    try:
+        day = Date.fromisoformat(payload.date)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="date must be YYYY-MM-DD")
+    return await save_meal_plans(
+        db, current_user.id, day, 1,
+        conditions=resolve_conditions(current_user, payload.conditions),
+        calorie_target=payload.calorie_target,
+        dietary_preferences=payload.dietary_preferences,
+    )
 
-    created_plans = []
-    for meal_type in MEAL_TYPES:
-        meal_data = generate_meal_plan(
-            meal_type=meal_type,
-            conditions=conditions,
-            calorie_target=payload.calorie_target,
-            dietary_preferences=payload.dietary_preferences,
-        )
-        plan = MealPlan(
-            id=str(uuid.uuid4()),
-            user_id=current_user.id,
-            date=payload.date,
-            meal_type=meal_type,
-            items=meal_data["items"],
-            total_calories=meal_data["total_calories"],
-            total_protein_g=meal_data["total_protein_g"],
-            total_carbs_g=meal_data["total_carbs_g"],
-            total_fat_g=meal_data["total_fat_g"],
-            sodium_mg=meal_data["sodium_mg"],
-            generated_by=meal_data["generated_by"],
-        )
-        db.add(plan)
-        created_plans.append(plan)
 
-    await db.flush()
-    return created_plans
+@router.post("/generate-range", response_model=List[MealPlanResponse], status_code=201,
+             summary="Generate meal plans for a week or month (start_date + days) in one pass")
+async def generate_plan_range(
+    payload: DietRangeRequest,
+    current_user=Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Same plans as /generate for each of `days` days from `start_date`,
+    written with one bulk insert; days that already have plans are updated.
+    """
+    return await save_meal_plans(
+        db, current_user.id, payload.start_date, payload.days,
+        conditions=resolve_conditions(current_user, payload.conditions),
+        calorie_target=payload.calorie_target,
+        dietary_preferences=payload.dietary_preferences,
+    )
+
+
+@router.get("/foods", response_model=List[FoodResponse],
+            summary="Search the food catalogue by name prefix (typo-tolerant) and tags")
+async def search_foods(
+    q: str = Query("", max_length=100, description="Name or word prefix, e.g. 'moong'"),
+    tags: List[str] = Query([], description="vegetarian | diabetic_safe | low_sodium (all must match)"),
+    meal_type: Optional[MealType] = None,
+    region: Optional[str] = Query(None, max_length=50),
+    limit: int = Query(20, ge=1, le=100),
+    current_user=Depends(get_current_active_user),
+):
+    catalogue = get_catalogue()
+    ids = catalogue.search(q, limit, tags, meal_type.value if meal_type else None, region)
+    return [catalogue.describe(i) for i in ids]
 
 
 @router.get("/{date}", response_model=List[MealPlanResponse],
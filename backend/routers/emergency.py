@@ -8,20 +8,22 @@ Endpoints:
 - PATCH /{id}   — Update SOS event status (resolve/cancel)
 - GET  /history  — View SOS event history
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 import uuid, json
 
 from core.database import get_db
+from core.pagination import NEXT_CURSOR_HEADER, keyset_page, split_page
 from core.security import get_current_active_user
-from models.user import SOSEvent, EmergencyContact, Vital, Medication
+from models.user import SOSEvent, EmergencyContact, Medication
 from schemas.schemas import (
     SOSCreateRequest, SOSUpdateRequest, SOSResponse,
     EmergencyContactCreate, EmergencyContactResponse,
 )
+from services.vitals_latest import get_latest_vitals
 from services.emergency_service import (
     dispatch_to_hawkeye, send_sms_alert, build_health_snapshot,
 )
@@ -48,14 +50,8 @@ async def trigger_sos(
     2. Dispatches to nearest police patrol via Hyderabad HawkEye API
     3. Sends SMS to all emergency contacts with GPS location
     """
-    # Fetch latest vitals
-    vitals_result = await db.execute(
-        select(Vital)
-        .where(Vital.user_id == current_user.id)
-        .order_by(desc(Vital.recorded_at))
-        .limit(5)
-    )
-    vitals = vitals_result.scalars().all()
+    # Last known value of each vital (primary-key lookup)
+    latest_vitals = await get_latest_vitals(db, current_user.id)
 
     # Fetch active medications
     meds_result = await db.execute(
@@ -67,7 +63,7 @@ async def trigger_sos(
     medications = meds_result.scalars().all()
 
     # Build health snapshot
-    snapshot = build_health_snapshot(current_user, vitals, medications)
+    snapshot = build_health_snapshot(current_user, latest_vitals, medications)
 
     # Create SOS event
     sos = SOSEvent(
@@ -152,17 +148,20 @@ async def update_sos(
 @router.get("/history", response_model=List[SOSResponse],
             summary="Get SOS event history")
 async def sos_history(
-    limit: int = 10,
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header"),
     current_user=Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(SOSEvent)
-        .where(SOSEvent.user_id == current_user.id)
-        .order_by(desc(SOSEvent.triggered_at))
-        .limit(limit)
-    )
-    return result.scalars().all()
+    result = await db.execute(keyset_page(
+        select(SOSEvent).where(SOSEvent.user_id == current_user.id),
+        SOSEvent.triggered_at, SOSEvent.id, cursor, limit,
+    ))
+    page, next_cursor = split_page(result.scalars().all(), limit, "triggered_at")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return page
 
 
 # ── Emergency Contacts ────────────────────────────────────────────────────────
@@ -11,6 +11,7 @@ from core.database import get_db
 from core.security import get_current_active_user
 from models.user import Medication
 from schemas.schemas import MedicationCreate, MedicationResponse
+from services.risk_cache import invalidate_risk_scores
 
 router = APIRouter()
 
@@ -29,6 +30,7 @@ async def add_medication(
     )
     db.add(med)
     await db.flush()
+    invalidate_risk_scores(db, current_user.id)
     return med
 
 
@@ -60,3 +62,4 @@ async def delete_medication(
         raise HTTPException(status_code=404, detail="Medication not found")
     med.is_active = False
     await db.flush()
+    invalidate_risk_scores(db, current_user.id)
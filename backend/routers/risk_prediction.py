@@ -4,125 +4,131 @@ Risk Prediction Router — Phase 3: Predictive Modeling
 - Cardiac Readmission: Stacking Ensemble (AUC=0.867)
 - Diabetic Risk
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
-from typing import List
+from sqlalchemy import select
+from typing import List, Optional
 from datetime import date, timedelta
-import uuid, json
+import uuid
 
 from core.database import get_db
+from core.pagination import NEXT_CURSOR_HEADER, keyset_page, split_page
 from core.security import get_current_active_user
-from models.user import RiskScore, Vital, Medication
-from schemas.schemas import RiskPredictionRequest, RiskScoreResponse, RiskType
-from services.ml_service import (
-    extract_fall_risk_features, extract_cardiac_features,
-    predict_fall_risk, predict_cardiac_risk,
+from models.user import RiskScore
+from schemas.schemas import MultiRiskPredictionRequest, RiskPredictionRequest, RiskScoreResponse, RiskType
+from services.ml_service import RISK_MODELS, RISK_SCORERS, build_user_profile
+from services.drift import drift_recorder
+from services.feature_store import get_feature_state
+from services.risk_cache import (
+    active_medication_ids, cached_score, input_fingerprint, last_vital_id, remember_score,
 )
+from services.shadow_scoring import shadow_scorer
 
-router = APIRouter()
+RISK_CACHE_HEADER = "X-Risk-Cache"
 
+router = APIRouter()
 
-def _user_profile_dict(user, medications):
-    try:
-        conditions = json.loads(user.medical_history) if user.medical_history else []
-    except Exception:
-        conditions = []
 
-    age = 70  # Default; calculate from DOB in production
-    if user.date_of_birth:
-        try:
-            from datetime import date as _date
-            dob = _date.fromisoformat(user.date_of_birth)
-            age = (_date.today() - dob).days // 365
-        except Exception:
-            pass
+async def _score_risks(db: AsyncSession, user, risk_types: List[RiskType], response: Response) -> List[RiskScore]:
+    """
+    Load the user's inputs once and score each risk type from them: cached
+    scores are reused while inputs are unchanged, the rest are computed from
+    one feature-store read and inserted with a single flush.
+    """
+    medication_ids = await active_medication_ids(db, user.id)
+    user_profile = build_user_profile(user, len(medication_ids))
+    vital_marker = await last_vital_id(db, user.id)
 
-    return {
-        "age": age,
-        "bmi": 26.0,
-        "conditions": conditions,
-        "medication_count": len([m for m in medications if m.is_active]),
-        "prior_falls": 0,
-        "mobility_level": user.mobility_level or "self_reliant",
-    }
+    scores, pending = {}, []
+    for risk_type in risk_types:
+        # Inputs unchanged since the last score → return it instead of a duplicate
+        fingerprint = input_fingerprint(vital_marker, risk_type, user_profile, medication_ids)
+        cached = await cached_score(db, user.id, risk_type, fingerprint)
+        if cached is not None:
+            scores[risk_type] = cached
+        else:
+            pending.append((risk_type, fingerprint))
 
+    if pending:
+        # Running vitals features, maintained on every vital write
+        feature_state = await get_feature_state(db, user.id)
+        for risk_type, fingerprint in pending:
+            extract, predict = RISK_SCORERS[risk_type.value]
+            prediction = predict(extract(feature_state, user_profile))
+            scores[risk_type] = RiskScore(
+                id=str(uuid.uuid4()),
+                user_id=user.id,
+                risk_type=risk_type,
+                score=prediction["score"],
+                risk_level=prediction["risk_level"],
+                model_used=prediction["model_used"],
+                model_version=prediction["model_version"],
+                prediction_window_days=prediction["prediction_window_days"],
+                feature_snapshot=prediction.get("feature_snapshot"),
+            )
+            db.add(scores[risk_type])
+        await db.flush()
+        for risk_type, fingerprint in pending:
+            remember_score(db, scores[risk_type], fingerprint)
+            # Candidate models replay the same features after the response is committed
+            shadow_scorer.submit_on_commit(db, RISK_MODELS[risk_type.value], scores[risk_type],
+                                           scores[risk_type].feature_snapshot)
+        drift_recorder.record_on_commit(db, [scores[risk_type] for risk_type, _ in pending])
 
-def _vitals_as_dicts(vitals):
-    result = []
-    for v in vitals:
-        result.append({
-            "heart_rate": float(v.heart_rate) if v.heart_rate else None,
-            "systolic_bp": float(v.systolic_bp) if v.systolic_bp else None,
-            "diastolic_bp": float(v.diastolic_bp) if v.diastolic_bp else None,
-            "glucose_level": float(v.glucose_level) if v.glucose_level else None,
-            "spo2": float(v.spo2) if v.spo2 else None,
-            "steps": int(v.steps) if v.steps else None,
-            "sleep_hours": float(v.sleep_hours) if v.sleep_hours else None,
-        })
-    return result
+    response.status_code = 201 if pending else 200
+    response.headers[RISK_CACHE_HEADER] = (
+        "hit" if not pending else "miss" if len(pending) == len(risk_types) else "partial"
+    )
+    return [scores[risk_type] for risk_type in risk_types]
 
 
 @router.post("/predict", response_model=RiskScoreResponse, status_code=201,
              summary="Run ML risk prediction for fall, cardiac, or diabetic risk")
 async def predict_risk(
     payload: RiskPredictionRequest,
+    response: Response,
     current_user=Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
-    # Fetch last 30 days of vitals
-    vitals_result = await db.execute(
-        select(Vital)
-        .where(Vital.user_id == current_user.id)
-        .order_by(desc(Vital.recorded_at))
-        .limit(30)
-    )
-    vitals = vitals_result.scalars().all()
-    vitals_dicts = _vitals_as_dicts(vitals)
+    if payload.risk_type.value not in RISK_SCORERS:
+        raise HTTPException(status_code=422, detail=f"Risk type '{payload.risk_type}' not yet supported")
+    scores = await _score_risks(db, current_user, [payload.risk_type], response)
+    return scores[0]
 
-    # Fetch medications
-    meds_result = await db.execute(
-        select(Medication).where(Medication.user_id == current_user.id)
-    )
-    medications = meds_result.scalars().all()
-    user_profile = _user_profile_dict(current_user, medications)
 
-    # Run appropriate model
-    if payload.risk_type == RiskType.fall:
-        features = extract_fall_risk_features(vitals_dicts, user_profile)
-        prediction = predict_fall_risk(features)
-    elif payload.risk_type == RiskType.cardiac:
-        features = extract_cardiac_features(vitals_dicts, user_profile)
-        prediction = predict_cardiac_risk(features)
+@router.post("/predict-all", response_model=List[RiskScoreResponse], status_code=201,
+             summary="Score all supported risk types (or a subset) from one data load")
+async def predict_all_risks(
+    response: Response,
+    payload: Optional[MultiRiskPredictionRequest] = None,
+    current_user=Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    if payload and payload.risk_types:
+        risk_types = list(dict.fromkeys(payload.risk_types))
+        unsupported = [r.value for r in risk_types if r.value not in RISK_SCORERS]
+        if unsupported:
+            raise HTTPException(status_code=422, detail=f"Risk types not yet supported: {', '.join(unsupported)}")
     else:
-        raise HTTPException(status_code=422, detail=f"Risk type '{payload.risk_type}' not yet supported")
-
-    score_record = RiskScore(
-        id=str(uuid.uuid4()),
-        user_id=current_user.id,
-        risk_type=payload.risk_type,
-        score=prediction["score"],
-        risk_level=prediction["risk_level"],
-        model_used=prediction["model_used"],
-        model_version=prediction["model_version"],
-        prediction_window_days=prediction["prediction_window_days"],
-        feature_snapshot=prediction.get("feature_snapshot"),
-    )
-    db.add(score_record)
-    await db.flush()
-    return score_record
+        risk_types = [RiskType(name) for name in RISK_SCORERS]
+    return await _score_risks(db, current_user, risk_types, response)
 
 
 @router.get("/history", response_model=List[RiskScoreResponse],
             summary="Get risk score history")
 async def risk_history(
+    response: Response,
     risk_type: RiskType = None,
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header"),
     current_user=Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
-    q = select(RiskScore).where(RiskScore.user_id == current_user.id).order_by(desc(RiskScore.computed_at)).limit(limit)
+    q = select(RiskScore).where(RiskScore.user_id == current_user.id)
     if risk_type:
         q = q.where(RiskScore.risk_type == risk_type)
-    result = await db.execute(q)
-    return result.scalars().all()
+    result = await db.execute(keyset_page(q, RiskScore.computed_at, RiskScore.id, cursor, limit))
+    page, next_cursor = split_page(result.scalars().all(), limit, "computed_at")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return page
@@ -5,8 +5,9 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db
-from core.security import get_current_active_user
+from core.security import get_current_active_user, invalidate_principal
 from schemas.schemas import UserResponse, UserUpdate
+from services.risk_cache import invalidate_risk_scores
 
 router = APIRouter()
 
@@ -39,6 +40,8 @@ async def update_me(
         setattr(current_user, field, value)
 
     await db.flush()
+    await invalidate_principal(current_user.id, db)
+    invalidate_risk_scores(db, current_user.id)
     return current_user
 
 
@@ -50,3 +53,5 @@ async def deactivate_account(
     """Soft-delete: marks account inactive and schedules data erasure (GDPR Article 17)."""
     current_user.is_active = False
     await db.flush()
+    await invalidate_principal(current_user.id, db)
+    invalidate_risk_scores(db, current_user.id)
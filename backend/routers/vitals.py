@@ -1,17 +1,25 @@
 """
 Vitals Router — Phase 3: Health Data Collection
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select
 from typing import List, Optional
-from datetime import datetime, date
+from datetime import datetime, date, timedelta, timezone
 import uuid
 
 from core.database import get_db
+from core.pagination import NEXT_CURSOR_HEADER, keyset_page, split_page
 from core.security import get_current_active_user
-from models.user import Vital
-from schemas.schemas import VitalCreate, VitalResponse
+from models.user import Vital, VitalRollup, VITAL_METRICS
+from schemas.schemas import (
+    VitalCreate, VitalResponse,
+    VitalBatchCreate, VitalBatchItemResult, VitalBatchResponse, VitalStreamResponse,
+    RollupGranularity, VitalSummaryBucket, VitalSummaryResponse, LatestVitalsResponse,
+)
+from services.vitals_ingest import ingest_ndjson, insert_vitals, on_vitals_written, validate_reading
+from services.vitals_latest import get_latest_vitals
+from services.vitals_rollups import summarize
 
 router = APIRouter()
 
@@ -23,57 +31,131 @@ async def create_vital(
     current_user=Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
-    vital = Vital(
+    vital = Vital.from_metrics(
+        payload.model_dump(include=set(VITAL_METRICS)),
         id=str(uuid.uuid4()),
         user_id=current_user.id,
         source=payload.source,
-        heart_rate=str(payload.heart_rate) if payload.heart_rate is not None else None,
-        systolic_bp=str(payload.systolic_bp) if payload.systolic_bp is not None else None,
-        diastolic_bp=str(payload.diastolic_bp) if payload.diastolic_bp is not None else None,
-        glucose_level=str(payload.glucose_level) if payload.glucose_level is not None else None,
-        spo2=str(payload.spo2) if payload.spo2 is not None else None,
-        weight_kg=str(payload.weight_kg) if payload.weight_kg is not None else None,
-        steps=str(payload.steps) if payload.steps is not None else None,
-        sleep_hours=str(payload.sleep_hours) if payload.sleep_hours is not None else None,
-        temperature_c=str(payload.temperature_c) if payload.temperature_c is not None else None,
     )
+    if payload.recorded_at is not None:
+        vital.recorded_at = payload.recorded_at
     db.add(vital)
     await db.flush()
+    await on_vitals_written(db, current_user.id, [vital.as_reading()])
     return vital
 
 
+@router.post("/batch", response_model=VitalBatchResponse, status_code=201,
+             summary="Log many vital readings at once (wearable sync / backfill)")
+async def create_vitals_batch(
+    payload: VitalBatchCreate,
+    current_user=Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Every item is validated first; valid readings are stored in bulk and
+    invalid ones are reported per index without failing the whole batch.
+    """
+    results, valid = [], []
+    for index, item in enumerate(payload.readings):
+        reading, errors = validate_reading(item)
+        if errors:
+            results.append(VitalBatchItemResult(index=index, status="invalid", errors=errors))
+        else:
+            result = VitalBatchItemResult(index=index, status="created")
+            results.append(result)
+            valid.append((result, reading))
+
+    ids = await insert_vitals(db, current_user.id, (reading for _, reading in valid))
+    for (result, _), vital_id in zip(valid, ids):
+        result.id = vital_id
+
+    return VitalBatchResponse(
+        received=len(payload.readings),
+        created=len(ids),
+        rejected=len(payload.readings) - len(ids),
+        results=results,
+    )
+
+
+@router.post("/stream", response_model=VitalStreamResponse, status_code=201,
+             summary="Stream an NDJSON dump of vital readings (one VitalCreate per line)")
+async def stream_vitals(
+    request: Request,
+    current_user=Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    The body is read incrementally and committed every few thousand readings,
+    so uploads of any size use constant memory. Invalid lines are skipped and
+    reported; readings from committed chunks are kept even if the upload breaks off.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in ("application/x-ndjson", "application/jsonl"):
+        raise HTTPException(status_code=415, detail="Send readings as application/x-ndjson")
+    return await ingest_ndjson(db, current_user.id, request.stream())
+
+
 @router.get("/", response_model=List[VitalResponse],
             summary="Get vital history")
 async def get_vitals(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header"),
+    skip: int = Query(0, ge=0, deprecated=True, description="Offset paging; use cursor instead"),
     current_user=Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Vital)
-        .where(Vital.user_id == current_user.id)
-        .order_by(desc(Vital.recorded_at))
-        .offset(skip)
-        .limit(limit)
-    )
-    return result.scalars().all()
+    q = keyset_page(select(Vital).where(Vital.user_id == current_user.id),
+                    Vital.recorded_at, Vital.id, cursor, limit)
+    if skip and not cursor:
+        q = q.offset(skip)
+    result = await db.execute(q)
+    page, next_cursor = split_page(result.scalars().all(), limit, "recorded_at")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return page
 
 
-@router.get("/latest", response_model=VitalResponse,
-            summary="Get the most recent vital reading")
+@router.get("/latest", response_model=LatestVitalsResponse,
+            summary="Get the last known value of every metric")
 async def get_latest_vital(
     current_user=Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
-    from fastapi import HTTPException
+    latest = await get_latest_vitals(db, current_user.id)
+    if not latest:
+        raise HTTPException(status_code=404, detail="No vitals recorded yet")
+    return latest
+
+
+@router.get("/summary", response_model=VitalSummaryResponse,
+            summary="Hourly or daily min/max/mean/last per metric (dashboard trends)")
+async def get_vitals_summary(
+    granularity: RollupGranularity = RollupGranularity.day,
+    days: int = Query(30, ge=1, le=366),
+    current_user=Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    if granularity == RollupGranularity.day:
+        since = since.replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        since = since.replace(minute=0, second=0, microsecond=0)
     result = await db.execute(
-        select(Vital)
-        .where(Vital.user_id == current_user.id)
-        .order_by(desc(Vital.recorded_at))
-        .limit(1)
+        select(VitalRollup)
+        .where(
+            VitalRollup.user_id == current_user.id,
+            VitalRollup.granularity == granularity.value,
+            VitalRollup.bucket_start >= since,
+        )
+        .order_by(VitalRollup.bucket_start)
+    )
+    return VitalSummaryResponse(
+        granularity=granularity,
+        buckets=[
+            VitalSummaryBucket(bucket_start=r.bucket_start, metrics=summarize(r.metric_stats()))
+            for r in result.scalars()
+            if r.stats is not None
+        ],
     )
-    vital = result.scalar_one_or_none()
-    if not vital:
-        raise HTTPException(status_code=404, detail="No vitals recorded yet")
-    return vital
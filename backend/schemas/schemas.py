@@ -3,7 +3,7 @@ Pydantic v2 schemas for request validation and response serialization.
 """
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from typing import Optional, List, Any, Dict
-from datetime import datetime
+from datetime import date, datetime, timezone
 from enum import Enum
 
 
@@ -25,6 +25,10 @@ class SOSStatus(str, Enum):
     resolved = "resolved"
     cancelled = "cancelled"
 
+class RollupGranularity(str, Enum):
+    hour = "hour"
+    day = "day"
+
 class MealType(str, Enum):
     breakfast = "breakfast"
     lunch = "lunch"
@@ -128,6 +132,58 @@ class VitalCreate(BaseModel):
     sleep_hours: Optional[float] = Field(None, ge=0, le=24, example=7.5)
     temperature_c: Optional[float] = Field(None, ge=30, le=45, example=36.7)
     source: str = Field("manual", example="wearable")
+    recorded_at: Optional[datetime] = Field(None, description="When the reading was taken; defaults to now")
+
+    @field_validator("recorded_at")
+    @classmethod
+    def to_utc(cls, v: Optional[datetime]) -> Optional[datetime]:
+        # Stored as naive wall-clock on SQLite, so offsets must be converted, not kept
+        if v is None:
+            return v
+        return v.replace(tzinfo=timezone.utc) if v.tzinfo is None else v.astimezone(timezone.utc)
+
+class VitalBatchCreate(BaseModel):
+    readings: List[Any] = Field(..., min_length=1, max_length=5000,
+                                description="Items in VitalCreate format")
+
+class VitalBatchItemResult(BaseModel):
+    index: int
+    status: str                                  # created | invalid
+    id: Optional[str] = None
+    errors: Optional[List[str]] = None
+
+class VitalBatchResponse(BaseModel):
+    received: int
+    created: int
+    rejected: int
+    results: List[VitalBatchItemResult]
+
+class VitalStreamLineError(BaseModel):
+    line: int
+    errors: List[str]
+
+class VitalStreamResponse(BaseModel):
+    lines: int
+    created: int
+    rejected: int
+    chunks_committed: int
+    errors: List[VitalStreamLineError]            # first 100 rejected lines
+    errors_truncated: bool
+
+class VitalMetricSummary(BaseModel):
+    count: int
+    min: float
+    max: float
+    mean: float
+    last: float
+
+class VitalSummaryBucket(BaseModel):
+    bucket_start: datetime
+    metrics: Dict[str, VitalMetricSummary]
+
+class VitalSummaryResponse(BaseModel):
+    granularity: RollupGranularity
+    buckets: List[VitalSummaryBucket]             # oldest first
 
 class VitalResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -146,6 +202,10 @@ class VitalResponse(BaseModel):
     sleep_hours: Optional[str]
     temperature_c: Optional[str]
 
+class LatestVitalsResponse(VitalResponse):
+    """Newest reading's id/source/time, with the last known value of every metric."""
+    measured_at: Dict[str, datetime]              # when each metric's value was recorded
+
 
 # ── Wearables ─────────────────────────────────────────────────────────────────
 
@@ -197,6 +257,13 @@ class DietGenerateRequest(BaseModel):
     calorie_target: Optional[int] = Field(None, example=1500)
     dietary_preferences: Optional[List[str]] = Field(None, example=["vegetarian", "low-sodium"])
 
+class DietRangeRequest(BaseModel):
+    start_date: date = Field(..., example="2026-03-01")
+    days: int = Field(7, ge=1, le=90, example=30)
+    conditions: Optional[List[str]] = Field(None, example=["diabetes", "hypertension"])
+    calorie_target: Optional[int] = Field(None, example=1500)
+    dietary_preferences: Optional[List[str]] = Field(None, example=["vegetarian", "low-sodium"])
+
 class MealItem(BaseModel):
     name: str
     quantity: str
@@ -205,6 +272,22 @@ class MealItem(BaseModel):
     carbs_g: Optional[float] = None
     fat_g: Optional[float] = None
 
+class FoodResponse(BaseModel):
+    id: int
+    name: str
+    quantity: str
+    calories: float
+    protein_g: float
+    carbs_g: float
+    fat_g: float
+    sodium_mg: float
+    potassium_mg: float
+    gi: float
+    glycemic_load: float
+    meals: List[str]
+    tags: List[str]
+    region: Optional[str] = None
+
 class MealPlanResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: str
@@ -217,6 +300,8 @@ class MealPlanResponse(BaseModel):
     total_carbs_g: Optional[float]
     total_fat_g: Optional[float]
     sodium_mg: Optional[float]
+    potassium_mg: Optional[float]
+    glycemic_load: Optional[float]
     generated_by: str
     created_at: datetime
 
@@ -251,8 +336,11 @@ class WorkoutPlanResponse(BaseModel):
 class RiskPredictionRequest(BaseModel):
     risk_type: RiskType = Field(..., example="fall")
 
+class MultiRiskPredictionRequest(BaseModel):
+    risk_types: Optional[List[RiskType]] = Field(None, min_length=1, example=["fall", "cardiac"])   # default: all supported
+
 class RiskScoreResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
     id: str
     user_id: str
     risk_type: str
@@ -324,6 +412,7 @@ class ChatMessageResponse(BaseModel):
 class ChatHistoryResponse(BaseModel):
     session_id: str
     messages: List[ChatMessageResponse]
+    next_cursor: Optional[str] = None            # pass as ?cursor= for the next page
 
 
 # ── Travel ────────────────────────────────────────────────────────────────────
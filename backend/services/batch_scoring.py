@@ -0,0 +1,182 @@
+"""
+Batch Risk Scoring — nightly fall and cardiac scores for every active user.
+
+Walks active users in id order, BATCH_SCORING_CHUNK_SIZE at a time:
+- one query loads the chunk's feature-store states (services.feature_store),
+  one more counts their active medications;
+- feature extraction + scoring fan out to a process pool (states and
+  profiles are plain picklable values);
+- the chunk's RiskScore rows are written with one multi-row insert, and
+  folded into the drift histograms (services.drift) once committed.
+
+- Idempotent: score ids are derived from (run date, user, risk type), so a
+  rerun of the same day inserts nothing twice.
+- Resumable: the last scored user id is checkpointed per run date in
+  `risk_scoring_runs`; a rerun continues after the last committed chunk.
+
+Usage (from backend/):
+    python -m services.batch_scoring [--run-date YYYY-MM-DD] [--chunk-size 500] [--workers 4]
+Or start it from POST /api/v1/admin/risk-scoring/runs.
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.database import AsyncSessionLocal, init_db, insert_ignore
+from models.user import Medication, RiskScore, RiskScoringRun, RiskType, User
+from services.drift import drift_recorder
+from services.feature_store import FeatureState, get_feature_states
+from services.ml_service import (
+    build_user_profile, extract_cardiac_features, extract_fall_risk_features,
+    predict_cardiac_risk_batch, predict_fall_risk_batch,
+)
+
+_SCORERS = (
+    (RiskType.fall, extract_fall_risk_features, predict_fall_risk_batch),
+    (RiskType.cardiac, extract_cardiac_features, predict_cardiac_risk_batch),
+)
+
+
+def score_id(run_date: str, user_id: str, risk_type: RiskType) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"risk-scoring/{run_date}/{user_id}/{risk_type.value}"))
+
+
+def score_users(batch: List[Tuple[str, FeatureState, dict]]) -> List[Tuple[str, RiskType, dict]]:
+    """Worker-side: (user_id, feature state, profile) → (user_id, risk type, prediction)."""
+    results = []
+    for risk_type, extract, predict_batch in _SCORERS:
+        features = [extract(state, profile) for _, state, profile in batch]
+        predictions = predict_batch(features)
+        results.extend((user_id, risk_type, p) for (user_id, _, _), p in zip(batch, predictions))
+    return results
+
+
+async def _load_chunk(db: AsyncSession, after: Optional[str], chunk_size: int):
+    q = select(User).where(User.is_active.is_(True)).order_by(User.id).limit(chunk_size)
+    if after is not None:
+        q = q.where(User.id > after)
+    users = (await db.execute(q)).scalars().all()
+    if not users:
+        return users, {}, {}
+    ids = [u.id for u in users]
+    states = await get_feature_states(db, ids)
+    counts = await db.execute(
+        select(Medication.user_id, func.count())
+        .where(Medication.user_id.in_(ids), Medication.is_active.is_(True))
+        .group_by(Medication.user_id)
+    )
+    return users, states, dict(counts.all())
+
+
+async def _score_chunk(executor: Executor, workers: int, batch: list) -> list:
+    loop = asyncio.get_running_loop()
+    step = max(1, -(-len(batch) // workers))
+    parts = await asyncio.gather(*(
+        loop.run_in_executor(executor, score_users, batch[i:i + step])
+        for i in range(0, len(batch), step)
+    ))
+    return [result for part in parts for result in part]
+
+
+async def run_batch_scoring(run_date: Optional[str] = None, chunk_size: int = None,
+                            workers: int = None) -> dict:
+    """Score every active user once for `run_date` (default: today, UTC); returns the run summary."""
+    run_date = run_date or datetime.now(timezone.utc).date().isoformat()
+    date.fromisoformat(run_date)
+    chunk_size = chunk_size or settings.BATCH_SCORING_CHUNK_SIZE
+    workers = workers or settings.BATCH_SCORING_WORKERS or os.cpu_count() or 1
+
+    async with AsyncSessionLocal() as db:
+        await insert_ignore(db, RiskScoringRun.__table__, [{"run_date": run_date, "users_scored": 0, "scores_written": 0}])
+        await db.commit()
+        run = await db.get(RiskScoringRun, run_date)
+        if run.completed_at is not None:
+            return run_summary(run, skipped=True)
+        after = run.last_user_id
+
+    started = time.perf_counter()
+    scored_now = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            async with AsyncSessionLocal() as db:
+                users, states, med_counts = await _load_chunk(db, after, chunk_size)
+                batch = [(u.id, states[u.id], build_user_profile(u, med_counts.get(u.id, 0))) for u in users]
+                results = await _score_chunk(executor, workers, batch) if batch else []
+                computed_at = datetime.now(timezone.utc)
+                written = await insert_ignore(db, RiskScore.__table__, [
+                    {
+                        "id": score_id(run_date, user_id, risk_type),
+                        "user_id": user_id,
+                        "risk_type": risk_type,
+                        "score": p["score"],
+                        "risk_level": p["risk_level"],
+                        "model_used": p["model_used"],
+                        "model_version": p["model_version"],
+                        "prediction_window_days": p["prediction_window_days"],
+                        "feature_snapshot": p.get("feature_snapshot"),
+                        "computed_at": computed_at,
+                    }
+                    for user_id, risk_type, p in results
+                ]) if results else 0
+
+                run = await db.get(RiskScoringRun, run_date)
+                run.users_scored += len(users)
+                run.scores_written += written
+                if users:
+                    after = run.last_user_id = users[-1].id
+                else:
+                    run.completed_at = computed_at
+                await db.commit()
+            if written:                     # a rerun of an already committed chunk inserts nothing
+                for user_id, risk_type, p in results:
+                    drift_recorder.record(risk_type, p["model_version"], p["score"],
+                                          p.get("feature_snapshot"), computed_at)
+            scored_now += len(users)
+            if not users:
+                break
+
+    elapsed = time.perf_counter() - started
+    await drift_recorder.flush()
+    summary = run_summary(run, skipped=False)
+    summary["users_per_sec"] = round(scored_now / elapsed, 1) if elapsed else None
+    return summary
+
+
+def run_summary(run: RiskScoringRun, skipped: bool = False) -> dict:
+    return {
+        "run_date": run.run_date,
+        "users_scored": run.users_scored,
+        "scores_written": run.scores_written,
+        "last_user_id": run.last_user_id,
+        "started_at": run.started_at,
+        "completed_at": run.completed_at,
+        "skipped": skipped,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute fall and cardiac risk scores for every active user")
+    parser.add_argument("--run-date", default=None, help="YYYY-MM-DD (default: today, UTC)")
+    parser.add_argument("--chunk-size", type=int, default=settings.BATCH_SCORING_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=settings.BATCH_SCORING_WORKERS,
+                        help="scoring processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    async def _run():
+        await init_db()
+        print(f"[batch_scoring] {await run_batch_scoring(args.run_date, args.chunk_size, args.workers)}")
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
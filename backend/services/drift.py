@@ -0,0 +1,292 @@
+"""
+Drift Monitoring — streaming score and feature distributions per model version.
+
+Every RiskScore written (POST /risk/predict[-all] and the batch scoring job)
+is folded into fixed-memory log-bucket histograms, one per feature of its
+`feature_snapshot` plus one for the score itself, keyed by
+(risk type, model version, UTC day):
+
+- buckets are relative-width (value v goes to ceil(log_γ(|v| / 1e-4)), ±
+  by sign, zero bucket below 1e-4), so any range from 0/1 flags to step
+  counts is resolved to ~1% without choosing bin edges up front;
+- at most MAX_BUCKETS per histogram (the lowest buckets are folded together
+  when exceeded); histograms merge by adding counts.
+
+Each worker accumulates deltas in memory and merges them into
+`drift_histograms` every DRIFT_FLUSH_SECONDS (and at shutdown). The drift
+endpoint sums at most a few dozen of those rows and compares the current
+window against a reference window:
+
+- PSI over the reference deciles: < 0.1 stable, < 0.25 moderate, else significant
+- KS: largest gap between the two cumulative distributions
+
+No user ids or raw values are stored — only bucket counts.
+
+Usage (from backend/):
+    GET /api/v1/admin/drift/{risk_type}?version=&reference_version=&current_days=7&reference_days=7
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+import math
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import AsyncSessionLocal, insert_ignore, on_commit
+from models.user import DriftHistogram, RiskType
+
+GAMMA = 1.02
+MIN_VALUE = 1e-4
+MAX_BUCKETS = 512
+MIN_SAMPLES = 30                        # per side, before drift is reported
+PSI_MODERATE, PSI_SIGNIFICANT = 0.1, 0.25
+_LOG_GAMMA = math.log(GAMMA)
+_EPSILON = 1e-4                         # PSI smoothing for empty bins
+
+
+class LogHistogram:
+    """Sparse relative-error histogram; bucket key → count."""
+
+    __slots__ = ("counts",)
+
+    def __init__(self, counts: Optional[Dict[int, int]] = None):
+        self.counts = counts or {}
+
+    @staticmethod
+    def key(value: float) -> int:
+        magnitude = abs(value)
+        if magnitude < MIN_VALUE:
+            return 0
+        k = math.ceil(math.log(magnitude / MIN_VALUE) / _LOG_GAMMA) + 1
+        return k if value > 0 else -k
+
+    @staticmethod
+    def value(key: int) -> float:
+        """Representative (log-midpoint) value of a bucket."""
+        if key == 0:
+            return 0.0
+        magnitude = MIN_VALUE * GAMMA ** (abs(key) - 1.5)
+        return magnitude if key > 0 else -magnitude
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, value: float, count: int = 1):
+        k = self.key(value)
+        self.counts[k] = self.counts.get(k, 0) + count
+        self._bound()
+
+    def merge(self, other: "LogHistogram"):
+        for k, count in other.counts.items():
+            self.counts[k] = self.counts.get(k, 0) + count
+        self._bound()
+
+    def _bound(self):
+        if len(self.counts) <= MAX_BUCKETS:
+            return
+        keys = sorted(self.counts)
+        excess = len(keys) - MAX_BUCKETS
+        floor = keys[excess]
+        for k in keys[:excess]:
+            self.counts[floor] += self.counts.pop(k)
+
+    def quantile(self, q: float) -> Optional[float]:
+        total = self.total
+        if not total:
+            return None
+        rank, seen = q * (total - 1), 0
+        for k in sorted(self.counts):
+            seen += self.counts[k]
+            if seen > rank:
+                return self.value(k)
+        return self.value(max(self.counts))
+
+    def to_json(self) -> Dict[str, int]:
+        return {str(k): count for k, count in self.counts.items()}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, int]) -> "LogHistogram":
+        return cls({int(k): count for k, count in data.items()})
+
+
+# -- Recording ------------------------------------------------------------------
+
+def _observations(score: float, feature_snapshot: Optional[dict]) -> Iterable[Tuple[str, float]]:
+    yield "score", score
+    for name, value in (feature_snapshot or {}).items():
+        if isinstance(value, (int, float)) and math.isfinite(value):
+            yield name, float(value)
+
+
+class DriftRecorder:
+    """Per-worker histogram deltas awaiting the next flush."""
+
+    def __init__(self):
+        self._pending: Dict[Tuple[str, str, str], Dict[str, LogHistogram]] = {}
+
+    def record(self, risk_type: RiskType, model_version: str, score: float,
+               feature_snapshot: Optional[dict] = None, computed_at: Optional[datetime] = None):
+        day = (computed_at or datetime.now(timezone.utc)).date().isoformat()
+        key = (RiskType(risk_type).value, model_version, day)
+        hists = self._pending.setdefault(key, {})
+        for name, value in _observations(score, feature_snapshot):
+            hists.setdefault(name, LogHistogram()).add(value)
+
+    def record_on_commit(self, db: AsyncSession, scores: List):
+        """Record RiskScore rows once the transaction that inserts them commits."""
+        rows = [(s.risk_type, s.model_version, s.score, s.feature_snapshot) for s in scores]
+
+        async def _record():
+            for row in rows:
+                self.record(*row)
+        on_commit(db, _record)
+
+    async def flush(self) -> int:
+        """Merge pending deltas into drift_histograms; returns rows updated."""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            async with AsyncSessionLocal() as db:
+                await insert_ignore(db, DriftHistogram.__table__, [
+                    {"risk_type": r, "model_version": v, "day": d} for r, v, d in pending
+                ])
+                for (risk_type, version, day), deltas in pending.items():
+                    result = await db.execute(
+                        select(DriftHistogram)
+                        .where(DriftHistogram.risk_type == risk_type, DriftHistogram.model_version == version,
+                               DriftHistogram.day == day)
+                        .with_for_update()
+                        .execution_options(populate_existing=True)
+                    )
+                    row = result.scalar_one()
+                    stored = dict(row.histograms or {})
+                    for name, delta in deltas.items():
+                        hist = LogHistogram.from_json(stored.get(name, {}))
+                        hist.merge(delta)
+                        stored[name] = hist.to_json()
+                    row.histograms = stored
+                await db.commit()
+        except BaseException:
+            # Keep the deltas for the next attempt rather than losing them; also
+            # on cancellation, so a flush interrupted at shutdown is redone by the final one
+            for key, deltas in pending.items():
+                hists = self._pending.setdefault(key, {})
+                for name, delta in deltas.items():
+                    hists.setdefault(name, LogHistogram()).merge(delta)
+            raise
+        return len(pending)
+
+
+drift_recorder = DriftRecorder()
+
+
+# -- Comparison -----------------------------------------------------------------
+
+def psi(reference: LogHistogram, current: LogHistogram, bins: int = 10) -> float:
+    """Population stability index over the reference distribution's quantile bins."""
+    ref_total, cur_total = reference.total, current.total
+    keys = sorted(reference.counts)
+    edges, seen, step = [], 0, 1
+    for k in keys:
+        seen += reference.counts[k]
+        while step < bins and seen >= step * ref_total / bins:
+            if not edges or edges[-1] != k:
+                edges.append(k)
+            step += 1
+
+    def binned(hist: LogHistogram) -> List[int]:
+        out = [0] * (len(edges) + 1)
+        for k, count in hist.counts.items():
+            i = 0
+            while i < len(edges) and k > edges[i]:
+                i += 1
+            out[i] += count
+        return out
+
+    total = 0.0
+    for r, c in zip(binned(reference), binned(current)):
+        r = max(r / ref_total, _EPSILON)
+        c = max(c / cur_total, _EPSILON)
+        total += (c - r) * math.log(c / r)
+    return total
+
+
+def ks(reference: LogHistogram, current: LogHistogram) -> float:
+    """Kolmogorov–Smirnov statistic on the shared bucket grid."""
+    ref_total, cur_total = reference.total, current.total
+    ref_cdf = cur_cdf = gap = 0.0
+    for k in sorted(set(reference.counts) | set(current.counts)):
+        ref_cdf += reference.counts.get(k, 0) / ref_total
+        cur_cdf += current.counts.get(k, 0) / cur_total
+        gap = max(gap, abs(ref_cdf - cur_cdf))
+    return gap
+
+
+def _status(value: float) -> str:
+    if value < PSI_MODERATE:
+        return "stable"
+    return "moderate" if value < PSI_SIGNIFICANT else "significant"
+
+
+def _sum_rows(rows: List[DriftHistogram]) -> Dict[str, LogHistogram]:
+    merged: Dict[str, LogHistogram] = {}
+    for row in rows:
+        for name, data in (row.histograms or {}).items():
+            merged.setdefault(name, LogHistogram()).merge(LogHistogram.from_json(data))
+    return merged
+
+
+async def drift_report(db: AsyncSession, risk_type: RiskType, version: str,
+                       reference_version: Optional[str] = None,
+                       current_days: int = 7, reference_days: int = 7) -> dict:
+    """
+    Compare `version` over the last `current_days` days with the reference:
+    the `reference_days` most recent days of data before that window (same
+    version), or the most recent days of `reference_version`.
+    """
+    reference_version = reference_version or version
+    today = datetime.now(timezone.utc).date()
+    start = (today - timedelta(days=current_days - 1)).isoformat()
+    base = select(DriftHistogram).where(DriftHistogram.risk_type == risk_type.value)
+
+    current_rows = (await db.execute(
+        base.where(DriftHistogram.model_version == version, DriftHistogram.day >= start)
+    )).scalars().all()
+    ref_q = base.where(DriftHistogram.model_version == reference_version)
+    if reference_version == version:
+        ref_q = ref_q.where(DriftHistogram.day < start)
+    reference_rows = (await db.execute(
+        ref_q.order_by(DriftHistogram.day.desc()).limit(reference_days)
+    )).scalars().all()
+
+    current, reference = _sum_rows(current_rows), _sum_rows(reference_rows)
+    features = {}
+    for name in sorted(set(current) | set(reference), key=lambda n: (n != "score", n)):
+        cur, ref = current.get(name, LogHistogram()), reference.get(name, LogHistogram())
+        entry = {
+            "current_count": cur.total,
+            "reference_count": ref.total,
+            "current_p50": cur.quantile(0.5),
+            "reference_p50": ref.quantile(0.5),
+            "psi": None, "ks": None, "status": "insufficient_data",
+        }
+        if cur.total >= MIN_SAMPLES and ref.total >= MIN_SAMPLES:
+            entry["psi"] = round(psi(ref, cur), 4)
+            entry["ks"] = round(ks(ref, cur), 4)
+            entry["status"] = _status(entry["psi"])
+        features[name] = entry
+
+    def window(rows):
+        days = sorted(row.day for row in rows)
+        return {"from": days[0] if days else None, "to": days[-1] if days else None, "days": len(days)}
+
+    return {
+        "risk_type": risk_type.value,
+        "version": version,
+        "reference_version": reference_version,
+        "current": window(current_rows),
+        "reference": window(reference_rows),
+        "features": features,
+    }
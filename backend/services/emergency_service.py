@@ -108,20 +108,21 @@ async def send_sms_alert(
         return False
 
 
-def build_health_snapshot(user, vitals_history: list, medications: list) -> dict:
+def build_health_snapshot(user, latest, medications: list) -> dict:
     """
     Assemble a concise health snapshot for first responders.
+    `latest` is the user's UserLatestVital (last known value per metric) or None.
     This is encrypted before storage (AES-256).
     """
     latest_vitals = {}
-    if vitals_history:
-        v = vitals_history[0]
+    if latest:
         latest_vitals = {
-            "heart_rate": v.heart_rate,
-            "blood_pressure": f"{v.systolic_bp}/{v.diastolic_bp}" if v.systolic_bp else None,
-            "glucose_level": v.glucose_level,
-            "spo2": v.spo2,
-            "recorded_at": v.recorded_at.isoformat() if v.recorded_at else None,
+            "heart_rate": latest.heart_rate,
+            "blood_pressure": f"{latest.systolic_bp}/{latest.diastolic_bp}" if latest.systolic_bp else None,
+            "glucose_level": latest.glucose_level,
+            "spo2": latest.spo2,
+            "recorded_at": latest.recorded_at.isoformat() if latest.recorded_at else None,
+            "measured_at": {name: ts.isoformat() for name, ts in latest.measured_at.items()},
         }
 
     try:
@@ -0,0 +1,282 @@
+"""
+Feature Store — per-user risk-model inputs, updated on every vital write.
+
+`user_feature_states` keeps one packed, encrypted FeatureState per user:
+the metric values of the user's RISK_HISTORY_READINGS most recent readings
+(by recorded_at, then id — the window POST /risk/predict used to query),
+newest first. Every vital write folds its readings in: a reading newer than
+the oldest one kept replaces it, older ones are counted and dropped, so the
+state is independent of write order.
+
+`stats()` is VitalColumns.stats() over exactly that window, so POST
+/risk/predict and the batch scoring job get the same features as from the
+raw history (benchmarks.bench_features checks parity) while reading one
+row instead of decrypting the last readings.
+
+Users whose history predates this table, or whose state was written in an
+older layout, get their state built from raw vitals on first read or write.
+For audits, rebuild or verify every state from raw history (pause ingestion
+while rebuilding):
+    python -m services.feature_store --rebuild|--verify [--user-id ID]
+"""
+import argparse
+import asyncio
+import bisect
+import math
+import struct
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.database import AsyncSessionLocal, init_db, insert_ignore
+from core.encryption import encrypt_bytes
+from models.user import UserFeatureState, Vital, VitalReading
+from services.ml_service import VITAL_COLUMNS, VitalColumns
+from services.vitals_rollups import as_utc
+
+STATE_VERSION = 2                    # 1: whole-history running statistics (rebuilt on first use)
+
+# u8 version | u16 kept | f64 readings folded | kept × (recorded_at, id key, VITAL_COLUMNS values; NaN = missing)
+_HEADER = struct.Struct("<BHd")
+_ROW = struct.Struct("<" + "d" * (2 + len(VITAL_COLUMNS)))
+_REBUILD_CHUNK = 2000
+
+
+def _order_key(reading: VitalReading) -> tuple:
+    """(recorded_at epoch, id prefix): newest-first order with the id as tiebreak, as float64s."""
+    try:
+        id_key = float(int(reading.id.replace("-", "")[:12], 16))      # 48 bits, exact in a float64
+    except ValueError:
+        id_key = 0.0
+    return as_utc(reading.recorded_at).timestamp(), id_key
+
+
+class FeatureState:
+    """The newest `size` readings' metric values; `stats()` is VitalColumns.stats() over them."""
+
+    __slots__ = ("size", "keys", "rows", "readings")
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = size or settings.RISK_HISTORY_READINGS
+        self.keys = []                   # negated order keys, ascending = newest first
+        self.rows = []                   # VITAL_COLUMNS values, aligned with keys
+        self.readings = 0
+
+    # -- Updates --------------------------------------------------------------
+
+    def fold(self, reading: VitalReading):
+        self.readings += 1
+        at, id_key = _order_key(reading)
+        key = (-at, -id_key)
+        if len(self.keys) == self.size and key >= self.keys[-1]:
+            return                                   # older than every reading kept
+        i = bisect.bisect_left(self.keys, key)
+        self.keys.insert(i, key)
+        self.rows.insert(i, [math.nan if (v := reading.metrics.get(name)) is None else float(v)
+                             for name in VITAL_COLUMNS])
+        del self.keys[self.size:], self.rows[self.size:]
+
+    # -- Reads ----------------------------------------------------------------
+
+    def columns(self) -> VitalColumns:
+        return VitalColumns(np.array(self.rows, dtype=np.float64).reshape(len(self.rows), len(VITAL_COLUMNS)))
+
+    def stats(self) -> Dict[str, dict]:
+        return self.columns().stats()
+
+    # -- Storage --------------------------------------------------------------
+
+    def pack(self) -> bytes:
+        body = b"".join(_ROW.pack(-at, -id_key, *row) for (at, id_key), row in zip(self.keys, self.rows))
+        return _HEADER.pack(STATE_VERSION, len(self.rows), self.readings) + body
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "FeatureState":
+        """Raises ValueError for states written in another layout (rebuild those from raw history)."""
+        if len(data) < _HEADER.size or data[0] != STATE_VERSION:
+            raise ValueError(f"Unsupported feature state version {data[0] if data else None}")
+        _, kept, readings = _HEADER.unpack_from(data)
+        state = cls()
+        state.readings = int(readings)
+        for at, id_key, *row in _ROW.iter_unpack(data[_HEADER.size:_HEADER.size + kept * _ROW.size]):
+            state.keys.append((-at, -id_key))
+            state.rows.append(row)
+        del state.keys[state.size:], state.rows[state.size:]
+        return state
+
+
+def _unpack(row: Optional[UserFeatureState]) -> Optional[FeatureState]:
+    """The row's state, or None when it has none yet or it is in an older layout."""
+    if row is None or row.state is None:
+        return None
+    try:
+        return FeatureState.unpack(row.state)
+    except ValueError:
+        return None
+
+
+async def _build_from_history(db: AsyncSession, user_id: str) -> FeatureState:
+    state = FeatureState()
+    result = await db.execute(
+        select(Vital).where(Vital.user_id == user_id)
+        .order_by(Vital.recorded_at.desc(), Vital.id.desc()).limit(state.size)
+    )
+    for vital in result.scalars():
+        state.fold(vital.as_reading())
+    total = await db.scalar(select(func.count()).select_from(Vital).where(Vital.user_id == user_id))
+    state.readings = int(total or 0)
+    return state
+
+
+async def _locked_row(db: AsyncSession, user_id: str):
+    """(row locked for update, its state, whether it was just built from raw history)."""
+    await insert_ignore(db, UserFeatureState.__table__, [{"user_id": user_id}])
+    result = await db.execute(
+        select(UserFeatureState)
+        .where(UserFeatureState.user_id == user_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    row = result.scalar_one()
+    state = _unpack(row)
+    if state is None:
+        return row, await _build_from_history(db, user_id), True
+    return row, state, False
+
+
+async def update_feature_state(db: AsyncSession, user_id: str, readings: Iterable[VitalReading]):
+    """Fold readings in, inside the caller's transaction (after the vitals insert)."""
+    readings = list(readings)
+    row, state, built = await _locked_row(db, user_id)
+    if not built:                       # a fresh build already saw the new rows
+        for reading in readings:
+            state.fold(reading)
+    row.state = state.pack()
+    if readings:
+        row.last_vital_id = readings[-1].id
+    await db.flush()
+
+
+async def get_feature_state(db: AsyncSession, user_id: str) -> FeatureState:
+    """The user's current feature state (built from raw history on first use)."""
+    state = _unpack(await db.get(UserFeatureState, user_id))
+    if state is not None:
+        return state
+    row, state, _ = await _locked_row(db, user_id)
+    row.state = state.pack()
+    await db.flush()
+    return state
+
+
+async def get_feature_states(db: AsyncSession, user_ids: list) -> Dict[str, FeatureState]:
+    """States for many users with one query; missing ones are built individually."""
+    result = await db.execute(select(UserFeatureState).where(UserFeatureState.user_id.in_(user_ids)))
+    states = {row.user_id: _unpack(row) for row in result.scalars()}
+    for user_id in user_ids:
+        if states.get(user_id) is None:
+            states[user_id] = await get_feature_state(db, user_id)
+    return states
+
+
+async def _replay(user_id: Optional[str], visit):
+    """Stream raw vitals in (user, id) order; `visit(user_id, state)` once per user."""
+    last_key, current, state = None, None, None
+    while True:
+        async with AsyncSessionLocal() as db:
+            q = select(Vital).order_by(Vital.user_id, Vital.id).limit(_REBUILD_CHUNK)
+            if user_id:
+                q = q.where(Vital.user_id == user_id)
+            if last_key:
+                q = q.where(or_(Vital.user_id > last_key[0], and_(Vital.user_id == last_key[0], Vital.id > last_key[1])))
+            rows = (await db.execute(q)).scalars().all()
+            readings = [(vital.user_id, vital.as_reading()) for vital in rows]
+        for uid, reading in readings:
+            if uid != current:
+                if current is not None:
+                    await visit(current, state)
+                current, state = uid, FeatureState()
+            state.fold(reading)
+        if len(rows) < _REBUILD_CHUNK:
+            if current is not None:
+                await visit(current, state)
+            return
+        last_key = (rows[-1].user_id, rows[-1].id)
+
+
+async def rebuild_feature_states(user_id: Optional[str] = None) -> int:
+    """Recompute states from raw vitals (all users, or one). Returns users rebuilt."""
+    async with AsyncSessionLocal() as db:
+        q = delete(UserFeatureState)
+        if user_id:
+            q = q.where(UserFeatureState.user_id == user_id)
+        await db.execute(q)
+        await db.commit()
+
+    rebuilt = 0
+    pending = []
+
+    async def flush():
+        nonlocal rebuilt
+        if pending:
+            async with AsyncSessionLocal() as db:
+                await insert_ignore(db, UserFeatureState.__table__, pending)
+                await db.commit()
+            rebuilt += len(pending)
+            pending.clear()
+
+    async def store(uid: str, state: FeatureState):
+        pending.append({"user_id": uid, "state": encrypt_bytes(state.pack())})
+        if len(pending) >= 500:
+            await flush()
+
+    await _replay(user_id, store)
+    await flush()
+    return rebuilt
+
+
+def _same_stats(a: dict, b: dict) -> bool:
+    """Equal up to float rounding (NaN: window means of metrics without a default)."""
+    return all(
+        math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-9) or (math.isnan(x) and math.isnan(y))
+        for name in a for key in a[name] for x, y in [(a[name][key], b[name][key])]
+    )
+
+
+async def verify_feature_states(user_id: Optional[str] = None) -> dict:
+    """Compare stored states with a replay of raw history; nothing is written."""
+    report = {"checked": 0, "mismatched": []}
+
+    async def compare(uid: str, state: FeatureState):
+        async with AsyncSessionLocal() as db:
+            stored = _unpack(await db.get(UserFeatureState, uid))
+        report["checked"] += 1
+        if stored is None or stored.readings != state.readings or not _same_stats(stored.stats(), state.stats()):
+            report["mismatched"].append(uid)
+
+    await _replay(user_id, compare)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or verify per-user risk feature states from raw vitals")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--rebuild", action="store_true")
+    mode.add_argument("--verify", action="store_true")
+    parser.add_argument("--user-id", default=None)
+    args = parser.parse_args()
+
+    async def _run():
+        await init_db()
+        if args.rebuild:
+            print(f"[feature_store] rebuilt {await rebuild_feature_states(args.user_id)} users")
+        else:
+            print(f"[feature_store] {await verify_feature_states(args.user_id)}")
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
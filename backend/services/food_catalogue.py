@@ -0,0 +1,277 @@
+"""
+Food Catalogue — the foods meal plans are built from, held as column arrays with indexes.
+
+The catalogue is the curated MEAL_DATABASE dishes plus, when FOOD_CATALOGUE_CSV
+is set, a bulk nutrient table (IFCT-style: one row per food, per serving or
+per 100 g). Recognised columns (case-insensitive, aliases in COLUMNS):
+
+    name, quantity, calories (or energy_kj), protein_g, carbs_g, fat_g,
+    sodium_mg, potassium_mg, gi, glycemic_load, meals ("breakfast|lunch"),
+    region, vegetarian, vegan, tags
+
+Missing meals default to every meal; a food is vegetarian (or vegan) only
+when the vegetarian (vegan) column or its tags say so; missing tags are derived from the
+nutrients (services.meal_planner.derived_tags). A missing glycemic load is
+derived from the glycemic index (meal_planner.DEFAULT_GI when that is
+missing too).
+
+Storage: a NutrientMatrix (float32 nutrients and GI, uint8 meal/tag bitmasks) plus
+region codes — tens of thousands of foods in a few MB. Indexes:
+- inverted posting lists (sorted int32 food ids) per tag, meal and region;
+  filters intersect them;
+- a sorted word list for prefix search ("moo" → "Moong dal chilla");
+- name trigrams for typo-tolerant fallback ("mung dal").
+
+Loaded once per process on first use, or in the lifespan when
+FOOD_CATALOGUE_LOADING=startup. GET /api/v1/diet/foods?q= searches it and
+the meal planner (ml_service.plan_meal) plans from its nutrient matrix.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import csv
+import re
+import threading
+
+import numpy as np
+
+from core.config import settings
+from services.meal_planner import MEALS, TAGS, MealPlanner, NutrientMatrix
+
+# canonical field → accepted CSV headers
+COLUMNS = {
+    "name": ("name", "food_name", "food"),
+    "quantity": ("quantity", "serving", "portion"),
+    "calories": ("calories", "energy_kcal", "enerc_kcal", "kcal"),
+    "protein_g": ("protein_g", "protein", "protcnt"),
+    "carbs_g": ("carbs_g", "carbohydrate", "carbohydrate_g", "choavldf", "carbs"),
+    "fat_g": ("fat_g", "fat", "total_fat", "fatce"),
+    "sodium_mg": ("sodium_mg", "sodium", "na"),
+    "potassium_mg": ("potassium_mg", "potassium", "k"),
+    "gi": ("gi", "glycemic_index"),
+    "glycemic_load": ("glycemic_load", "gl"),
+    "meals": ("meals", "meal_types", "meal_type"),
+    "region": ("region", "cuisine"),
+    "vegetarian": ("vegetarian", "veg", "is_vegetarian"),
+    "vegan": ("vegan", "is_vegan"),
+    "tags": ("tags",),
+}
+_KJ_HEADERS = ("energy_kj", "enerc_kj", "enerc")
+_NUMERIC = ("calories", "protein_g", "carbs_g", "fat_g", "sodium_mg", "potassium_mg")
+_OPTIONAL = ("gi", "glycemic_load")
+_TRUE = {"1", "true", "yes", "y", "veg"}
+_WORD = re.compile(r"[a-z0-9]+")
+_TRIGRAM_MIN_SHARE = 0.4             # share of the query's trigrams a fuzzy match must contain
+
+
+def normalize(text: str) -> str:
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _split(value: str) -> List[str]:
+    return [part.strip().lower() for part in re.split(r"[|;,]", value or "") if part.strip()]
+
+
+def builtin_records() -> List[dict]:
+    """MEAL_DATABASE dishes: one record per dish, with every meal it is listed under."""
+    from services.ml_service import MEAL_DATABASE
+
+    records: Dict[str, dict] = {}
+    for meal_type, lists in MEAL_DATABASE.items():
+        for items in lists.values():
+            for item in items:
+                # curated dishes are vegetarian unless marked otherwise
+                record = records.setdefault(item["name"], {"vegetarian": True, **item, "meals": [],
+                                                           "region": "curated"})
+                if meal_type not in record["meals"]:
+                    record["meals"].append(meal_type)
+    return list(records.values())
+
+
+def read_csv(path: Path) -> Iterable[dict]:
+    """Planner records from a nutrient CSV; rows without a name or energy are skipped."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        headers = {h.strip().lower(): h for h in reader.fieldnames or []}
+        source = {field: next((headers[a] for a in aliases if a in headers), None)
+                  for field, aliases in COLUMNS.items()}
+        kj = next((headers[a] for a in _KJ_HEADERS if a in headers), None)
+        for row in reader:
+            name = (row.get(source["name"]) or "").strip() if source["name"] else ""
+            if not name:
+                continue
+            record = {"name": name, "quantity": (row.get(source["quantity"]) or "100 g").strip()
+                      if source["quantity"] else "100 g"}
+            try:
+                for field in _NUMERIC:
+                    raw = row.get(source[field]) if source[field] else None
+                    record[field] = float(raw) if raw not in (None, "") else 0.0
+                for field in _OPTIONAL:
+                    raw = row.get(source[field]) if source[field] else None
+                    if raw not in (None, ""):
+                        record[field] = float(raw)
+                if not record["calories"] and kj and row.get(kj):
+                    record["calories"] = round(float(row[kj]) / 4.184, 1)
+            except ValueError:
+                continue
+            meals = [m for m in _split(row.get(source["meals"]) if source["meals"] else "") if m in MEALS]
+            record["meals"] = meals or list(MEALS)
+            record["region"] = ((row.get(source["region"]) or "") if source["region"] else "").strip().lower()
+            for flag in ("vegetarian", "vegan"):
+                if source[flag]:
+                    record[flag] = (row.get(source[flag]) or "").strip().lower() in _TRUE
+            tags = _split(row.get(source["tags"]) if source["tags"] else "")
+            if tags:
+                record["tags"] = tags
+            yield record
+
+
+class FoodCatalogue:
+    """Column-stored foods with inverted, prefix and trigram indexes."""
+
+    def __init__(self, records: Iterable[dict]):
+        records = list(records)
+        self.foods = NutrientMatrix.from_records(records)
+        self.regions = sorted({r.get("region") or "" for r in records})
+        self.region = np.array([self.regions.index(r.get("region") or "") for r in records], dtype=np.uint16)
+        self.planner = MealPlanner(self.foods)
+
+        ids = np.arange(len(records), dtype=np.int32)
+        self.by_tag = {t: ids[(self.foods.tags & (1 << i)) != 0] for i, t in enumerate(TAGS)}
+        self.by_meal = {m: ids[(self.foods.meals & (1 << i)) != 0] for i, m in enumerate(MEALS)}
+        self.by_region = {r: ids[self.region == i] for i, r in enumerate(self.regions) if r}
+
+        self._normalized = [normalize(name) for name in self.foods.names]
+        pairs = sorted((word, i) for i, name in enumerate(self._normalized) for word in set(name.split()))
+        self._words = [word for word, _ in pairs]
+        self._word_ids = np.array([i for _, i in pairs], dtype=np.int32)
+        self._name_len = np.array([len(name) for name in self._normalized], dtype=np.int32)
+        grams = defaultdict(list)
+        for i, name in enumerate(self._normalized):
+            for gram in _trigrams(name):
+                grams[gram].append(i)
+        self._trigram_index = {g: np.array(ids, dtype=np.int32) for g, ids in grams.items()}
+
+    def __len__(self):
+        return len(self.foods)
+
+    # -- Lookups ----------------------------------------------------------------
+
+    def _constraints(self, tags: Iterable[str], meal_type: Optional[str], region: Optional[str]):
+        """(posting lists, tag bits, meal bit, region code) — None when a key is unknown."""
+        tags = list(tags)
+        if any(t not in self.by_tag for t in tags) or (meal_type and meal_type not in self.by_meal) \
+                or (region and region.lower() not in self.by_region):
+            return None
+        postings = [self.by_tag[t] for t in tags]
+        meal_bit = 0
+        if meal_type:
+            postings.append(self.by_meal[meal_type])
+            meal_bit = 1 << MEALS.index(meal_type)
+        code = None
+        if region:
+            postings.append(self.by_region[region.lower()])
+            code = self.regions.index(region.lower())
+        tag_bits = sum(1 << TAGS.index(t) for t in tags)
+        return postings, tag_bits, meal_bit, code
+
+    def _matches(self, ids: np.ndarray, tag_bits: int, meal_bit: int, code: Optional[int]) -> np.ndarray:
+        ok = (self.foods.tags[ids] & tag_bits) == tag_bits
+        if meal_bit:
+            ok &= (self.foods.meals[ids] & meal_bit) != 0
+        if code is not None:
+            ok &= self.region[ids] == code
+        return ok
+
+    def filter(self, tags: Iterable[str] = (), meal_type: Optional[str] = None,
+               region: Optional[str] = None) -> Optional[np.ndarray]:
+        """Food ids matching every given constraint (None = unconstrained); unknown keys match nothing."""
+        constraints = self._constraints(tags, meal_type, region)
+        if constraints is None:
+            return np.empty(0, np.int32)
+        postings, tag_bits, meal_bit, code = constraints
+        if not postings:
+            return None
+        # Walk the most selective posting list, check the other constraints on the columns
+        shortest = min(postings, key=len)
+        return shortest[self._matches(shortest, tag_bits, meal_bit, code)]
+
+    def prefix_ids(self, query: str) -> np.ndarray:
+        """Foods with a word starting with each query word (all must match)."""
+        result = None
+        for token in normalize(query).split():
+            lo = bisect_left(self._words, token)
+            hi = bisect_left(self._words, token + "\uffff", lo)
+            hits = np.unique(self._word_ids[lo:hi])
+            result = hits if result is None else np.intersect1d(result, hits, assume_unique=True)
+        return result if result is not None else np.empty(0, np.int32)
+
+    def trigram_ids(self, query: str) -> np.ndarray:
+        """Foods sharing at least _TRIGRAM_MIN_SHARE of the query's trigrams, best first."""
+        grams = _trigrams(normalize(query))
+        postings = [self._trigram_index[g] for g in grams if g in self._trigram_index]
+        if not postings:
+            return np.empty(0, np.int32)
+        counts = np.bincount(np.concatenate(postings), minlength=len(self))
+        ids = np.flatnonzero(counts >= _TRIGRAM_MIN_SHARE * len(grams)).astype(np.int32)
+        return ids[np.argsort(-counts[ids], kind="stable")]
+
+    def search(self, query: str = "", limit: int = 20, tags: Iterable[str] = (),
+               meal_type: Optional[str] = None, region: Optional[str] = None) -> List[int]:
+        """Prefix matches (shortest names first), then fuzzy matches, within the filters."""
+        if not normalize(query):
+            ids = self.filter(tags, meal_type, region)
+            return (ids if ids is not None else np.arange(len(self), dtype=np.int32))[:limit].tolist()
+        constraints = self._constraints(tags, meal_type, region)
+        if constraints is None:
+            return []
+        postings, tag_bits, meal_bit, code = constraints
+
+        def within(ids):
+            return ids[self._matches(ids, tag_bits, meal_bit, code)] if postings else ids
+
+        prefix = within(self.prefix_ids(query))
+        results = prefix[np.argsort(self._name_len[prefix], kind="stable")[:limit]].tolist()
+        if len(results) < limit:
+            seen = set(results)
+            for i in within(self.trigram_ids(query)).tolist():
+                if i not in seen:
+                    results.append(i)
+                    if len(results) == limit:
+                        break
+        return results
+
+    def describe(self, i: int) -> dict:
+        food = self.foods.item(i)
+        food["id"] = i
+        food["meals"] = [m for b, m in enumerate(MEALS) if self.foods.meals[i] & (1 << b)]
+        food["tags"] = [t for b, t in enumerate(TAGS) if self.foods.tags[i] & (1 << b)]
+        food["region"] = self.regions[self.region[i]] or None
+        return food
+
+
+_catalogue: Optional[FoodCatalogue] = None
+_load_lock = threading.Lock()
+
+
+def load_catalogue(csv_path: Optional[str] = None) -> FoodCatalogue:
+    records = builtin_records()
+    if csv_path:
+        records.extend(read_csv(Path(csv_path)))
+    return FoodCatalogue(records)
+
+
+def get_catalogue() -> FoodCatalogue:
+    """The process-wide catalogue, loaded on first use."""
+    global _catalogue
+    if _catalogue is None:
+        with _load_lock:
+            if _catalogue is None:
+                _catalogue = load_catalogue(settings.FOOD_CATALOGUE_CSV or None)
+    return _catalogue
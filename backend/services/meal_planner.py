@@ -0,0 +1,299 @@
+"""
+Meal Planner — pick foods that meet a day's nutrient targets under diet constraints.
+
+Foods are held as a precomputed nutrient matrix (one float32 row per food:
+kcal, protein, carbs, fat, sodium, potassium, glycemic load) with bitmasks
+for the meals they suit and their tags. Glycemic load is GI × available
+carbs / 100; foods without a glycemic index are taken as DEFAULT_GI
+(the low/medium boundary). A day's targets come from the calorie target
+(default DEFAULT_CALORIE_TARGET) split over MEAL_SHARES, with macros as a
+share of energy (less carbohydrate for diabetics), a sodium ceiling (lower
+for hypertension / low-sodium), a potassium goal (DASH level for
+hypertension) and a glycemic-load ceiling (lower for diabetics).
+
+Each meal is solved in two vectorized steps:
+1. candidates — foods allowed for the meal (vegetarian and vegan are hard
+   constraints), foods meeting the diabetic-safe / low-sodium preferences
+   first, then by how closely their macro balance matches the meal's
+   targets (cached per meal and constraint set); the best CANDIDATES that
+   fit in the meal's calories are kept, so less-preferred foods only come
+   in when too few preferred ones exist;
+2. exhaustive search over every set of 1 … MAX_ITEMS of those candidates as
+   one matrix product (sets × candidates indicator @ candidates × nutrients),
+   scored by weighted squared relative error to the targets plus a steep
+   penalty for sodium above the ceiling and a small one per item missing a
+   preference; the MEAL_OPTIONS lowest-scoring sets are kept.
+
+A day is then chosen among every combination of the meals' options
+(MEAL_OPTIONS ** 4 = 625 alternatives by default) in one more product:
+day plans × foods indicator @ foods × nutrients gives each alternative's
+daily kcal, macros, sodium, potassium and glycemic load. Alternatives are
+ranked by their meals' costs plus the daily macro error, steep penalties
+for sodium and glycemic load above the ceilings and the potassium
+shortfall (rank_days); plan_day returns the best.
+
+The indicator matrices depend only on (CANDIDATES, MAX_ITEMS) and are built
+once, so a plan costs a few small NumPy operations regardless of catalogue
+size. Plans are deterministic for a given profile.
+
+    python -m benchmarks.bench_meal_planner --foods 5000
+    python -m benchmarks.bench_plan_ranking
+"""
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+NUTRIENTS = ("calories", "protein_g", "carbs_g", "fat_g", "sodium_mg", "potassium_mg", "glycemic_load")
+MEALS = ("breakfast", "lunch", "dinner", "snack")
+TAGS = ("vegetarian", "diabetic_safe", "low_sodium", "vegan")
+
+MEAL_SHARES = {"breakfast": 0.25, "lunch": 0.35, "dinner": 0.30, "snack": 0.10}
+DEFAULT_CALORIE_TARGET = 1600        # kcal/day, sedentary older adult
+PROTEIN_SHARE, FAT_SHARE = 0.20, 0.30
+CARB_SHARE, DIABETIC_CARB_SHARE = 0.50, 0.40
+SODIUM_LIMIT_MG, LOW_SODIUM_LIMIT_MG = 2300, 1500
+POTASSIUM_GOAL_MG, DASH_POTASSIUM_GOAL_MG = 3500, 4700
+GLYCEMIC_LOAD_LIMIT, DIABETIC_GLYCEMIC_LOAD_LIMIT = 120, 80    # per day; < 80 is a low-GL diet
+DEFAULT_GI = 55                      # foods without a glycemic index
+
+# Per-serving thresholds used to tag foods that don't carry explicit tags
+DIABETIC_SAFE_MAX_CARBS_G = 30
+DIABETIC_SAFE_MAX_GL = 20            # "high" glycemic load per serving starts at 20
+LOW_SODIUM_MAX_MG = 140              # FDA "low sodium" per serving
+
+CANDIDATES = 16
+MAX_ITEMS = 4
+MEAL_OPTIONS = 5
+_WEIGHTS = np.array([4.0, 1.0, 1.0, 1.0], dtype=np.float32)   # kcal, protein, carbs, fat
+_SODIUM_PENALTY = 25.0
+_PREFERENCE_PENALTY = 0.1           # per item missing a diabetic-safe / low-sodium preference
+_GLYCEMIC_LOAD_PENALTY = 25.0
+_POTASSIUM_WEIGHT = 1.0
+
+
+def _bits(names: Iterable[str], vocabulary: tuple) -> int:
+    return sum(1 << vocabulary.index(name) for name in names if name in vocabulary)
+
+
+_VEGETARIAN, _VEGAN = _bits(["vegetarian"], TAGS), _bits(["vegan"], TAGS)
+
+
+def glycemic_index(record: dict) -> float:
+    return float(record["gi"]) if record.get("gi") not in (None, "") else DEFAULT_GI
+
+
+def glycemic_load(record: dict) -> float:
+    """The record's glycemic load, or GI × available carbs / 100."""
+    if record.get("glycemic_load") not in (None, ""):
+        return float(record["glycemic_load"])
+    return glycemic_index(record) * float(record.get("carbs_g") or 0) / 100
+
+
+class NutrientMatrix:
+    """Column-oriented foods: names, quantities, nutrients (n × 7), GI, meal and tag bitmasks."""
+
+    def __init__(self, names: List[str], quantities: List[str], nutrients: np.ndarray,
+                 gi: np.ndarray, meals: np.ndarray, tags: np.ndarray):
+        self.names = names
+        self.quantities = quantities
+        self.nutrients = np.ascontiguousarray(nutrients, dtype=np.float32)
+        self.gi = np.asarray(gi, dtype=np.float32)
+        self.meals = np.asarray(meals, dtype=np.uint8)
+        self.tags = np.asarray(tags, dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "NutrientMatrix":
+        """
+        Records: NUTRIENTS values (glycemic_load is derived from an optional "gi"
+        when absent), "name", "quantity", "meals" and optional "tags".
+        """
+        names, quantities, rows, gi, meals, tags = [], [], [], [], [], []
+        for r in records:
+            names.append(r["name"])
+            quantities.append(r.get("quantity", ""))
+            rows.append([float(r.get(n) or 0) for n in NUTRIENTS[:-1]] + [glycemic_load(r)])
+            gi.append(glycemic_index(r))
+            meals.append(_bits(r["meals"], MEALS))
+            tags.append(_bits(r["tags"], TAGS) if "tags" in r else _bits(derived_tags(r), TAGS))
+            if tags[-1] & _VEGAN:
+                tags[-1] |= _VEGETARIAN
+        return cls(names, quantities, np.array(rows, dtype=np.float32).reshape(-1, len(NUTRIENTS)),
+                   np.array(gi), np.array(meals), np.array(tags))
+
+    def item(self, i: int) -> dict:
+        kcal, protein, carbs, fat, sodium, potassium, load = (round(float(v), 1) for v in self.nutrients[i])
+        return {"name": self.names[i], "quantity": self.quantities[i], "calories": kcal,
+                "protein_g": protein, "carbs_g": carbs, "fat_g": fat, "sodium_mg": sodium,
+                "potassium_mg": potassium, "gi": round(float(self.gi[i])), "glycemic_load": load}
+
+
+def derived_tags(record: dict) -> List[str]:
+    tags = []
+    if record.get("vegetarian", False) or record.get("vegan", False):
+        tags.append("vegetarian")
+    if record.get("vegan", False):
+        tags.append("vegan")
+    if (record.get("carbs_g") or 0) <= DIABETIC_SAFE_MAX_CARBS_G and glycemic_load(record) < DIABETIC_SAFE_MAX_GL:
+        tags.append("diabetic_safe")
+    if (record.get("sodium_mg") or 0) <= LOW_SODIUM_MAX_MG:
+        tags.append("low_sodium")
+    return tags
+
+
+def daily_targets(profile: dict) -> np.ndarray:
+    """
+    [kcal, protein g, carbs g, fat g, sodium ceiling mg, potassium goal mg,
+    glycemic-load ceiling] for a meal_profile() — aligned with NUTRIENTS.
+    """
+    kcal = float(profile.get("calorie_target") or DEFAULT_CALORIE_TARGET)
+    diabetic, low_sodium = profile.get("diabetic"), profile.get("low_sodium")
+    carb_share = DIABETIC_CARB_SHARE if diabetic else CARB_SHARE
+    sodium = LOW_SODIUM_LIMIT_MG if low_sodium else SODIUM_LIMIT_MG
+    potassium = DASH_POTASSIUM_GOAL_MG if low_sodium else POTASSIUM_GOAL_MG
+    load = DIABETIC_GLYCEMIC_LOAD_LIMIT if diabetic else GLYCEMIC_LOAD_LIMIT
+    return np.array([kcal, kcal * PROTEIN_SHARE / 4, kcal * carb_share / 4, kcal * FAT_SHARE / 9,
+                     sodium, potassium, load], dtype=np.float32)
+
+
+@lru_cache(maxsize=None)
+def _indicator(k: int) -> np.ndarray:
+    """(sets × k) 0/1 matrix of every subset of 1 … MAX_ITEMS of k candidates."""
+    sets = [c for size in range(1, min(MAX_ITEMS, k) + 1) for c in combinations(range(k), size)]
+    out = np.zeros((len(sets), k), dtype=np.float32)
+    for row, members in enumerate(sets):
+        out[row, list(members)] = 1.0
+    return out
+
+
+class MealPlanner:
+    def __init__(self, foods: NutrientMatrix):
+        self.foods = foods
+        self._rankings: Dict[tuple, np.ndarray] = {}
+
+    def _ranked(self, meal: str, profile: dict) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Allowed foods for the meal and constraint flags with how many of the
+        soft constraints (diabetic-safe, low-sodium) each one misses: foods
+        missing fewer first, then best macro balance. The balance (cosine of
+        nutrients/targets to the all-ones direction) does not depend on the
+        calorie target, so the ranking is computed once per key.
+        """
+        flags = (bool(profile.get("vegetarian")), bool(profile.get("vegan")),
+                 bool(profile.get("diabetic")), bool(profile.get("low_sodium")))
+        key = (meal,) + flags
+        ranked = self._rankings.get(key)
+        if ranked is None:
+            vegetarian, vegan, diabetic, low_sodium = flags
+            foods = self.foods
+            allowed = (foods.meals & (1 << MEALS.index(meal))) != 0
+            hard = _bits([t for t, on in (("vegetarian", vegetarian), ("vegan", vegan)) if on], TAGS)
+            allowed &= (foods.tags & hard) == hard
+            idx = np.flatnonzero(allowed)
+            misses = np.zeros(len(idx), dtype=np.float32)
+            for tag, on in (("diabetic_safe", diabetic), ("low_sodium", low_sodium)):
+                if on:
+                    misses += (foods.tags[idx] & (1 << TAGS.index(tag))) == 0
+            ratios = foods.nutrients[idx, :4] / daily_targets({"diabetic": diabetic})[:4]
+            fit = ratios.sum(axis=1) / (np.linalg.norm(ratios, axis=1) * 2.0 + 1e-9)
+            order = np.lexsort((-fit, misses))
+            ranked = self._rankings[key] = (idx[order], misses[order])
+        return ranked
+
+    def _candidates(self, meal: str, profile: dict, target: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Up to CANDIDATES food ids (sorted) and their soft-constraint misses."""
+        ranked, misses = self._ranked(meal, profile)
+        if len(ranked) > CANDIDATES:
+            # Foods meeting more soft constraints first; within those, the best
+            # balanced ones that fit in the meal, larger ones only to fill up.
+            # Less-preferred foods only come in when too few preferred ones exist.
+            too_big = self.foods.nutrients[ranked, 0] > target[0] * 1.1
+            keep = np.argsort(misses * 2 + too_big, kind="stable")[:CANDIDATES]
+            ranked, misses = ranked[keep], misses[keep]
+        order = np.argsort(ranked)
+        return ranked[order], misses[order]
+
+    def meal_options(self, meal: str, profile: dict, targets: np.ndarray,
+                     limit: int = MEAL_OPTIONS) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The `limit` best item sets for one meal: (candidate food ids, options ×
+        candidates 0/1 matrix, option costs), best first.
+        """
+        target = targets * np.float32(MEAL_SHARES.get(meal, MEAL_SHARES["snack"]))
+        idx, misses = self._candidates(meal, profile, target)
+        if not len(idx):
+            return idx, np.zeros((1, 0), dtype=np.float32), np.zeros(1, dtype=np.float32)
+        sets = _indicator(len(idx))
+        totals = sets @ self.foods.nutrients[idx]                          # sets × nutrients
+        error = (totals[:, :4] - target[:4]) / target[:4]
+        cost = (error * error) @ _WEIGHTS
+        over = np.maximum(totals[:, 4] - target[4], 0.0) / target[4]
+        cost += _SODIUM_PENALTY * over * over
+        cost += _PREFERENCE_PENALTY * (sets @ misses)
+        if limit < len(cost):
+            best = np.argpartition(cost, limit - 1)[:limit]
+            best = best[np.lexsort((best, cost[best]))]
+        else:
+            best = np.lexsort((np.arange(len(cost)), cost))
+        return idx, sets[best], cost[best]
+
+    def plan_meal(self, meal: str, profile: dict, targets: Optional[np.ndarray] = None) -> List[dict]:
+        if targets is None:
+            targets = daily_targets(profile)
+        idx, options, _ = self.meal_options(meal, profile, targets, limit=1)
+        return [self.foods.item(int(i)) for i in idx[options[0] > 0]]
+
+    def score_days(self, profile: dict, options: int = MEAL_OPTIONS):
+        """
+        Every combination of each meal's `options` best item sets, scored at once.
+
+        Returns (food ids, days × foods servings matrix, days × NUTRIENTS
+        totals, day costs, per-meal (ids, option matrix)); day d takes option
+        np.unravel_index(d, shape) of each meal, in MEALS order.
+        """
+        targets = daily_targets(profile)
+        per_meal = [self.meal_options(meal, profile, targets, options) for meal in MEALS]
+        foods = np.unique(np.concatenate([idx for idx, _, _ in per_meal]))
+        days = np.zeros((1, len(foods)), dtype=np.float32)
+        cost = np.zeros(1, dtype=np.float32)
+        for idx, sets, meal_cost in per_meal:
+            # meal options over the day's food columns, combined with every partial day so far
+            columns = np.zeros((len(sets), len(foods)), dtype=np.float32)
+            columns[:, np.searchsorted(foods, idx)] = sets
+            days = (days[:, None, :] + columns[None, :, :]).reshape(-1, len(foods))
+            cost = (cost[:, None] + meal_cost[None, :]).ravel()
+
+        totals = days @ self.foods.nutrients[foods]                        # days × nutrients
+        error = (totals[:, :4] - targets[:4]) / targets[:4]
+        cost = cost + (error * error) @ _WEIGHTS
+        sodium = np.maximum(totals[:, 4] - targets[4], 0.0) / targets[4]
+        potassium = np.maximum(targets[5] - totals[:, 5], 0.0) / targets[5]
+        load = np.maximum(totals[:, 6] - targets[6], 0.0) / targets[6]
+        cost += (_SODIUM_PENALTY * sodium * sodium + _POTASSIUM_WEIGHT * potassium * potassium
+                 + _GLYCEMIC_LOAD_PENALTY * load * load)
+        return foods, days, totals, cost, [(idx, sets) for idx, sets, _ in per_meal]
+
+    def rank_days(self, profile: dict, limit: int = 10, options: int = MEAL_OPTIONS) -> List[dict]:
+        """
+        The `limit` best day plans among the options**4 alternatives:
+        {"meals": {meal: items}, "totals": {nutrient: value}, "cost": float}.
+        """
+        _, _, totals, cost, per_meal = self.score_days(profile, options)
+        best = np.argsort(cost, kind="stable")[:limit]
+        shape = tuple(len(sets) for _, sets in per_meal)
+        ranked = []
+        for day in best.tolist():
+            choice = np.unravel_index(day, shape)
+            meals = {meal: [self.foods.item(int(i)) for i in idx[sets[int(c)] > 0]]
+                     for meal, (idx, sets), c in zip(MEALS, per_meal, choice)}
+            ranked.append({"meals": meals, "cost": round(float(cost[day]), 4),
+                           "totals": {n: round(float(v), 1) for n, v in zip(NUTRIENTS, totals[day])}})
+        return ranked
+
+    def plan_day(self, profile: dict) -> Dict[str, List[dict]]:
+        """The best-ranked day: MEALS → items."""
+        return self.rank_days(profile, limit=1)[0]["meals"]
@@ -0,0 +1,109 @@
+"""
+Meal Plans — generate and store a user's plans for one day or a range of days.
+
+POST /diet/generate and POST /diet/generate-range both go through
+`save_meal_plans`:
+- the condition profile (conditions, calorie target, preferences) is
+  resolved once per request and reused for every day and meal;
+- the plans already stored for the range are read with one query; a
+  (date, meal type) slot that has one is updated in place, so regenerating
+  a day never duplicates it (extra copies left by older builds are removed);
+- every new slot is written with one executemany INSERT;
+- item lists are content-addressed: each distinct list is stored once in
+  `meal_item_sets` (plans are deterministic per meal and profile, so most
+  users share a handful) and plans reference it by hash; generation itself
+  is memoized per day plan (constraints, calorie target) in ml_service;
+- the stored plans are returned with one more query, by date and meal.
+"""
+from datetime import date, timedelta
+from typing import List, Optional
+import json
+import uuid
+
+from sqlalchemy import and_, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import insert_ignore
+from models.user import MealItemSet, MealPlan, MealType, now_utc
+from services.ml_service import meal_profile, plan_meal
+
+MEAL_TYPES = [meal_type.value for meal_type in MealType]
+
+
+def resolve_conditions(user, conditions: Optional[list]) -> list:
+    """Requested conditions, or the ones in the user's medical history."""
+    if conditions:
+        return conditions
+    if user.medical_history:
+        try:
+            return json.loads(user.medical_history)
+        except Exception:
+            pass
+    return []
+
+
+def plan_days(start: date, days: int, profile: dict) -> List[dict]:
+    """Plan rows (without ids) for `days` consecutive days from `start`."""
+    rows = []
+    for offset in range(days):
+        day = (start + timedelta(days=offset)).isoformat()
+        for meal_type in MEAL_TYPES:
+            meal = plan_meal(meal_type, profile)
+            rows.append({"date": day, "meal_type": MealType(meal_type), **meal})
+    return rows
+
+
+async def store_item_sets(db: AsyncSession, rows: List[dict]):
+    """Move each row's items into meal_item_sets (once per distinct list) and reference them by hash."""
+    item_sets = {}
+    for row in rows:
+        item_sets.setdefault(row["items_hash"], row.pop("items"))
+        row["items_payload"] = None
+    if item_sets:
+        await insert_ignore(db, MealItemSet.__table__, [
+            {"hash": h, "items": items, "created_at": now_utc()} for h, items in item_sets.items()
+        ])
+
+
+async def save_meal_plans(db: AsyncSession, user_id: str, start: date, days: int, conditions: list,
+                          calorie_target: Optional[int] = None,
+                          dietary_preferences: Optional[list] = None) -> List[MealPlan]:
+    """Generate and upsert every meal of `days` days from `start`; returns the stored plans."""
+    profile = meal_profile(conditions, calorie_target, dietary_preferences)
+    first, last = start.isoformat(), (start + timedelta(days=days - 1)).isoformat()
+    in_range = and_(MealPlan.user_id == user_id, MealPlan.date >= first, MealPlan.date <= last)
+
+    existing = {}
+    duplicates = []
+    result = await db.execute(
+        select(MealPlan.id, MealPlan.date, MealPlan.meal_type).where(in_range).order_by(MealPlan.created_at)
+    )
+    for plan_id, day, meal_type in result:
+        if (day, meal_type) in existing:
+            duplicates.append(plan_id)
+        else:
+            existing[(day, meal_type)] = plan_id
+
+    inserts, updates = [], []
+    now = now_utc()
+    rows = plan_days(start, days, profile)
+    await store_item_sets(db, rows)
+    for row in rows:
+        plan_id = existing.get((row["date"], row["meal_type"]))
+        if plan_id is None:
+            inserts.append({"id": str(uuid.uuid4()), "user_id": user_id, "created_at": now, **row})
+        else:
+            updates.append({"id": plan_id, **row})
+
+    if duplicates:
+        await db.execute(delete(MealPlan).where(MealPlan.id.in_(duplicates)))
+    if updates:
+        await db.execute(update(MealPlan), updates)
+    if inserts:
+        await db.execute(insert(MealPlan), inserts)
+
+    result = await db.execute(
+        select(MealPlan).where(in_range).execution_options(populate_existing=True)
+    )
+    order = {meal_type: i for i, meal_type in enumerate(MEAL_TYPES)}
+    return sorted(result.scalars().all(), key=lambda p: (p.date, order[p.meal_type.value]))
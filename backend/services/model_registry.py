@@ -0,0 +1,233 @@
+"""
+Model Registry — versioned risk-model artifacts, loaded lazily or at startup.
+
+Artifacts live under MODEL_DIR, one directory per model and version:
+
+    ml_artifacts/
+        fall_risk/
+            CURRENT              optional; the version to serve (default: highest)
+            1.1.0/
+                manifest.json    {"kind": "tree_ensemble", "model_used": "XGBoost",
+                                  "features": [...], "arrays": [...], "params": {...}}
+                feature.npy, threshold.npy, ...
+
+Kinds: "tree_ensemble" (gradient-boosted trees compiled by services.tree_engine)
+and "logistic" (coef.npy + intercept).
+
+Arrays are opened with np.load(mmap_mode="r"): read-only views of the page
+cache, so every uvicorn worker and batch-scoring process on the host shares
+one copy instead of unpickling its own.
+
+Hot swap: `activate()` loads the new version completely, then replaces the
+registry entry in a single assignment — in-flight predictions finish on the
+model they started with. Other workers see the new CURRENT file within
+MODEL_REFRESH_SECONDS. A model with no artifacts falls back to the built-in
+heuristic in ml_service.
+
+Usage (from backend/):
+    python -m services.model_registry [--activate NAME VERSION]
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from core.config import settings
+from services.tree_engine import TreeEnsemble
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAMES = ("fall_risk", "cardiac_risk")
+MANIFEST = "manifest.json"
+CURRENT = "CURRENT"
+MAX_VERSION_LENGTH = 20   # RiskScore.model_version
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    name: str
+    version: str
+    kind: str
+    model_used: str
+    features: tuple
+    predict: Callable[[np.ndarray], np.ndarray] = field(repr=False)   # (rows × features) → probabilities
+    loaded_at: float = 0.0
+
+    def vector(self, features: dict) -> np.ndarray:
+        return np.array([float(features[name]) for name in self.features], dtype=np.float64)
+
+    def score(self, features: dict) -> float:
+        return float(self.predict(self.vector(features)[None, :])[0])
+
+
+# kind → loader(manifest, arrays) returning the predict callable
+LOADERS: Dict[str, Callable[[dict, Dict[str, np.ndarray]], Callable]] = {}
+
+
+def loader(kind: str):
+    def register(fn):
+        LOADERS[kind] = fn
+        return fn
+    return register
+
+
+@loader("logistic")
+def _load_logistic(manifest: dict, arrays: Dict[str, np.ndarray]):
+    coef = arrays["coef"]
+    intercept = float(manifest.get("params", {}).get("intercept", 0.0))
+
+    def predict(rows: np.ndarray) -> np.ndarray:
+        return 1.0 / (1.0 + np.exp(-(rows @ coef + intercept)))
+    return predict
+
+
+@loader("tree_ensemble")
+def _load_tree_ensemble(manifest: dict, arrays: Dict[str, np.ndarray]):
+    params = manifest.get("params", {})
+    return TreeEnsemble(arrays, params["max_depth"], params["objective"], params["base_score"]).predict
+
+
+def version_key(version: str):
+    """Numeric-aware ordering: 1.10.0 sorts after 1.9.2."""
+    return tuple((0, int(part)) if part.isdigit() else (1, part) for part in version.lstrip("v").split("."))
+
+
+def load_artifact(path: Path, name: str) -> LoadedModel:
+    manifest = json.loads((path / MANIFEST).read_text())
+    kind = manifest["kind"]
+    if kind not in LOADERS:
+        raise ValueError(f"Unknown model kind '{kind}' in {path}")
+    version = path.name
+    if len(version) > MAX_VERSION_LENGTH:
+        raise ValueError(f"Model version '{version}' is longer than {MAX_VERSION_LENGTH} characters")
+    arrays = {a: np.load(path / f"{a}.npy", mmap_mode="r", allow_pickle=False) for a in manifest.get("arrays", [])}
+    return LoadedModel(
+        name=name,
+        version=version,
+        kind=kind,
+        model_used=manifest.get("model_used", kind),
+        features=tuple(manifest["features"]),
+        predict=LOADERS[kind](manifest, arrays),
+        loaded_at=time.time(),
+    )
+
+
+class ModelRegistry:
+    """Per-process view of MODEL_DIR; `get()` is cheap enough to call on every prediction."""
+
+    def __init__(self, root: str, refresh_s: float):
+        self.root = Path(root)
+        self.refresh_s = refresh_s
+        self._active: Dict[str, Optional[LoadedModel]] = {}
+        self._pinned: Dict[tuple, LoadedModel] = {}
+        self._checked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def versions(self, name: str) -> List[str]:
+        base = self.root / name
+        if not base.is_dir():
+            return []
+        return sorted((p.name for p in base.iterdir() if (p / MANIFEST).is_file()), key=version_key)
+
+    def wanted_version(self, name: str) -> Optional[str]:
+        pinned = self.root / name / CURRENT
+        if pinned.is_file():
+            return pinned.read_text().strip() or None
+        versions = self.versions(name)
+        return versions[-1] if versions else None
+
+    def get(self, name: str) -> Optional[LoadedModel]:
+        """Active model, or None when no artifact is deployed (use the heuristic)."""
+        if time.monotonic() - self._checked.get(name, float("-inf")) < self.refresh_s:
+            return self._active.get(name)
+        with self._lock:
+            if time.monotonic() - self._checked.get(name, float("-inf")) >= self.refresh_s:
+                self._refresh(name)
+        return self._active.get(name)
+
+    def _refresh(self, name: str):
+        current = self._active.get(name)
+        wanted = self.wanted_version(name)
+        self._checked[name] = time.monotonic()
+        if wanted is None:
+            self._active[name] = None
+        elif current is None or current.version != wanted:
+            try:
+                self._active[name] = load_artifact(self.root / name / wanted, name)
+                logger.info("Loaded model %s %s", name, wanted)
+            except Exception:
+                # Keep serving whatever was loaded before rather than failing predictions
+                logger.exception("Could not load model %s %s", name, wanted)
+
+    def load_version(self, name: str, version: str) -> LoadedModel:
+        """A specific version regardless of CURRENT (shadow candidates); loaded once per process."""
+        key = (name, version)
+        model = self._pinned.get(key)
+        if model is None:
+            with self._lock:
+                model = self._pinned.get(key)
+                if model is None:
+                    model = self._pinned[key] = load_artifact(self.root / name / version, name)
+        return model
+
+    def activate(self, name: str, version: str) -> LoadedModel:
+        """Load `version`, pin it in CURRENT (for other workers) and swap it in."""
+        if version not in self.versions(name):
+            raise FileNotFoundError(f"No artifact for {name} {version}")
+        model = load_artifact(self.root / name / version, name)
+        _warm(model)
+        tmp = self.root / name / f".{CURRENT}.{os.getpid()}"
+        tmp.write_text(version)
+        os.replace(tmp, self.root / name / CURRENT)
+        with self._lock:
+            self._active[name] = model
+            self._checked[name] = time.monotonic()
+        return model
+
+    def warmup(self, names=MODEL_NAMES):
+        """Load every deployed model now and run one prediction to fault its pages in."""
+        for name in names:
+            self._checked.pop(name, None)
+            model = self.get(name)
+            if model is not None:
+                _warm(model)
+
+    def status(self) -> dict:
+        report = {}
+        for name in MODEL_NAMES:
+            model = self._active.get(name)
+            report[name] = {
+                "available": self.versions(name),
+                "wanted": self.wanted_version(name),
+                "active": model.version if model else None,
+                "model_used": model.model_used if model else None,
+            }
+        return report
+
+
+def _warm(model: LoadedModel):
+    model.predict(np.zeros((1, len(model.features))))
+
+
+model_registry = ModelRegistry(settings.MODEL_DIR, settings.MODEL_REFRESH_SECONDS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List deployed risk models or switch the served version")
+    parser.add_argument("--activate", nargs=2, metavar=("NAME", "VERSION"))
+    args = parser.parse_args()
+    if args.activate:
+        model = model_registry.activate(*args.activate)
+        print(f"[model_registry] {model.name} now serving {model.version} ({model.model_used})")
+    print(f"[model_registry] {json.dumps(model_registry.status(), indent=2)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Re-encryption Job — rotate at-rest ciphertext to AES-256-GCM under the current key.
+
+Walks every encrypted column (EncryptedBytes/EncryptedString and the
+Ciphertext columns behind EncryptedField) table by table in primary-key
+order, rewriting legacy Fernet tokens and values sealed with a retired key.
+
+- Bounded memory: one chunk of REENCRYPTION_CHUNK_SIZE rows at a time.
+- Online: each chunk is its own short transaction, and every UPDATE is a
+  compare-and-swap on the old ciphertext, so a value the API rewrote in the
+  meantime is never clobbered.
+- Resumable: progress is checkpointed per table in `reencryption_checkpoints`;
+  a rerun continues from the last committed chunk.
+
+Usage (from backend/):
+    python -m services.reencryption [--chunk-size 500]
+Or set REENCRYPT_ON_STARTUP=True to run it as a background task of the API.
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import LargeBinary, bindparam, inspect, select, type_coerce, update
+from sqlalchemy.types import NullType
+
+from core.config import settings
+from core.database import AsyncSessionLocal, Base, Ciphertext, EncryptedBytes, engine, init_db
+from core.encryption import keyring
+from models.user import ReencryptionCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+def encrypted_columns():
+    """Yield (table, [encrypted columns]) for every table holding ciphertext."""
+    for table in Base.metadata.sorted_tables:
+        cols = [c for c in table.columns if isinstance(c.type, (Ciphertext, EncryptedBytes))]
+        if cols:
+            yield table, cols
+
+
+def _ensure_binary_columns(conn):
+    """PostgreSQL: convert legacy TEXT ciphertext columns to BYTEA in place."""
+    if conn.dialect.name != "postgresql":
+        return
+    inspector = inspect(conn)
+    for table, cols in encrypted_columns():
+        types = {c["name"]: str(c["type"]).upper() for c in inspector.get_columns(table.name)}
+        for col in cols:
+            if types.get(col.name) == "TEXT":
+                conn.exec_driver_sql(
+                    f"ALTER TABLE {table.name} ALTER COLUMN {col.name} "
+                    f"TYPE BYTEA USING convert_to({col.name}, 'UTF8')"
+                )
+
+
+async def reencrypt_table(table, columns, chunk_size: int, pause_s: float = 0.0) -> dict:
+    pk = table.primary_key.columns.values()[0]
+    raw_cols = [type_coerce(c, LargeBinary).label(c.name) for c in columns]
+    # Keep onupdate timestamps untouched: rotation is not a data change
+    untouched = {c.name: c for c in table.columns if c.onupdate is not None}
+    updates = {
+        col.name: update(table)
+        .where(pk == bindparam("_pk"), type_coerce(col, NullType()) == bindparam("_old", type_=NullType()))
+        .values({**untouched, col.name: bindparam("_new", type_=LargeBinary)})
+        for col in columns
+    }
+
+    async with AsyncSessionLocal() as db:
+        checkpoint = await db.get(ReencryptionCheckpoint, table.name)
+        if checkpoint is None or checkpoint.key_version != keyring.current_version:
+            checkpoint = await db.merge(ReencryptionCheckpoint(
+                table_name=table.name, key_version=keyring.current_version,
+                last_pk=None, rows_scanned=0, values_rewritten=0, completed_at=None,
+            ))
+            await db.commit()
+        if checkpoint.completed_at is not None:
+            return {"table": table.name, "rows_scanned": checkpoint.rows_scanned,
+                    "values_rewritten": checkpoint.values_rewritten, "skipped": True}
+        last_pk = checkpoint.last_pk
+
+    while True:
+        async with AsyncSessionLocal() as db:
+            q = select(pk, *raw_cols).order_by(pk).limit(chunk_size)
+            if last_pk is not None:
+                q = q.where(pk > last_pk)
+            rows = (await db.execute(q)).all()
+
+            rewritten = 0
+            for col in columns:
+                params = [
+                    {"_pk": row[0], "_old": old, "_new": keyring.encrypt(keyring.decrypt(old))}
+                    for row in rows
+                    if (old := row._mapping[col.name]) is not None and keyring.needs_rotation(old)
+                ]
+                if params:
+                    result = await db.execute(updates[col.name], params)
+                    rewritten += max(result.rowcount, 0)
+
+            checkpoint = await db.get(ReencryptionCheckpoint, table.name)
+            checkpoint.rows_scanned += len(rows)
+            checkpoint.values_rewritten += rewritten
+            if rows:
+                last_pk = checkpoint.last_pk = rows[-1][0]
+            else:
+                checkpoint.completed_at = datetime.now(timezone.utc)
+            await db.commit()
+
+        if not rows:
+            return {"table": table.name, "rows_scanned": checkpoint.rows_scanned,
+                    "values_rewritten": checkpoint.values_rewritten, "skipped": False}
+        if pause_s:
+            await asyncio.sleep(pause_s)
+
+
+async def reencrypt_all(chunk_size: int = None, pause_s: float = 0.0) -> list:
+    """Rotate every encrypted table; returns a per-table summary."""
+    chunk_size = chunk_size or settings.REENCRYPTION_CHUNK_SIZE
+    async with engine.begin() as conn:
+        await conn.run_sync(_ensure_binary_columns)
+    summary = []
+    for table, cols in encrypted_columns():
+        report = await reencrypt_table(table, cols, chunk_size, pause_s)
+        logger.info("Re-encrypted %s", report)
+        summary.append(report)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-encrypt stored health data under the current key")
+    parser.add_argument("--chunk-size", type=int, default=settings.REENCRYPTION_CHUNK_SIZE)
+    parser.add_argument("--pause-ms", type=int, default=0, help="sleep between chunks to limit DB load")
+    args = parser.parse_args()
+
+    async def _run():
+        await init_db()
+        for report in await reencrypt_all(args.chunk_size, args.pause_ms / 1000):
+            print(f"[reencryption] {report}")
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Risk Score Cache — reuse the last score while its inputs are unchanged.
+
+Clients call POST /risk/predict whenever the health tab opens. A score is
+cached per (user, risk type) together with a fingerprint of everything that
+feeds the model:
+- the last vital folded into the user's feature state (changes on every write)
+- the set of active medications
+- the user profile inputs (age, conditions, mobility, ...)
+- the version of the model that would score it
+
+A request whose fingerprint matches gets the stored RiskScore back — no
+feature extraction, no prediction, no duplicate row. Writes to vitals,
+medications and the user profile also drop the entries explicitly after
+commit; the fingerprint keeps other workers' caches (and any write racing a
+prediction) from ever serving a stale score.
+
+The cache holds only fingerprint and score id, never health data.
+Hit rate: GET /api/v1/admin/metrics → cache.caches.risk_scores.
+"""
+from typing import List, Optional
+import hashlib
+import json
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import NamedCache
+from core.config import settings
+from core.database import on_commit
+from models.user import Medication, RiskScore, RiskType, UserFeatureState
+from services.ml_service import HEURISTIC_VERSION, RISK_MODELS
+from services.model_registry import model_registry
+
+risk_score_cache = NamedCache("risk_scores", ttl=settings.RISK_SCORE_CACHE_TTL)
+
+
+def _key(user_id: str, risk_type: RiskType) -> str:
+    return f"{user_id}:{risk_type.value}"
+
+
+async def active_medication_ids(db: AsyncSession, user_id: str) -> List[str]:
+    result = await db.execute(
+        select(Medication.id).where(Medication.user_id == user_id, Medication.is_active == True)
+    )
+    return sorted(result.scalars().all())
+
+
+async def last_vital_id(db: AsyncSession, user_id: str) -> Optional[str]:
+    result = await db.execute(select(UserFeatureState.last_vital_id).where(UserFeatureState.user_id == user_id))
+    return result.scalar_one_or_none()
+
+
+def input_fingerprint(last_vital_id: Optional[str], risk_type: RiskType,
+                      user_profile: dict, medication_ids: List[str]) -> str:
+    model_name = RISK_MODELS.get(risk_type.value)
+    model = model_registry.get(model_name) if model_name else None
+    raw = json.dumps(
+        [last_vital_id, medication_ids, user_profile, model.version if model else HEURISTIC_VERSION],
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+async def cached_score(db: AsyncSession, user_id: str, risk_type: RiskType,
+                       fingerprint: str) -> Optional[RiskScore]:
+    cached = await risk_score_cache.get(_key(user_id, risk_type), valid=lambda v: v.startswith(f"{fingerprint}:"))
+    if cached is None:
+        return None
+    return await db.get(RiskScore, cached.split(":", 1)[1])
+
+
+def remember_score(db: AsyncSession, score: RiskScore, fingerprint: str):
+    """Cache `score` once the transaction that inserted it commits."""
+    key = _key(score.user_id, score.risk_type)
+    on_commit(db, lambda: risk_score_cache.set(key, f"{fingerprint}:{score.id}"))
+
+
+def invalidate_risk_scores(db: AsyncSession, user_id: str):
+    """Drop a user's cached scores after `db` commits (the fingerprint covers the window before)."""
+    pending = db.info.setdefault("risk_cache_invalidated", set())
+    if user_id in pending:
+        return
+    pending.add(user_id)
+
+    async def _delete():
+        for risk_type in RiskType:
+            await risk_score_cache.delete(_key(user_id, risk_type))
+    on_commit(db, _delete)
@@ -0,0 +1,160 @@
+"""
+Shadow Scoring — candidate model versions scored on live traffic, off the request path.
+
+SHADOW_MODELS names candidate versions per model, e.g.
+
+    SHADOW_MODELS='{"fall_risk": ["2.0.0"]}'
+
+Once a POST /risk/predict[-all] transaction commits, the served score and
+its feature vector are handed to this worker's ShadowScorer:
+
+- `submit()` never waits: the queue holds at most SHADOW_QUEUE_SIZE items
+  and anything beyond that is dropped (and counted), so a slow candidate
+  or a traffic spike can only lose shadow samples, never delay a response;
+- a background task drains the queue in batches, scores each item with
+  every candidate in a thread (versions equal to the one that served the
+  request are skipped), and writes one `shadow_scores` row per candidate
+  with its predict latency;
+- candidates load once per process through model_registry.load_version.
+
+Compare offline by joining shadow_scores.risk_score_id to risk_scores.id;
+queue depth, drops and per-model latency: GET /api/v1/admin/metrics → shadow.
+"""
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.database import AsyncSessionLocal, on_commit
+from models.user import RiskScore, ShadowScore, new_uuid, now_utc
+from services.model_registry import model_registry
+
+logger = logging.getLogger(__name__)
+
+_BATCH = 64   # items scored and written per round trip
+
+
+class ShadowScorer:
+    """Bounded, drop-on-overload queue of predictions to replay on candidate models."""
+
+    def __init__(self, candidates: Dict[str, List[str]], max_queue: int):
+        self.candidates = {name: list(versions) for name, versions in candidates.items() if versions}
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self.submitted = 0
+        self.dropped = 0
+        self.scored = 0
+        self.failed = 0
+        self._latency: Dict[str, List[float]] = {}     # "name/version" → [count, total ms, max ms]
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.candidates)
+
+    def submit(self, model_name: str, risk_score_id: str, features: dict,
+               primary_version: str, primary_score: float) -> bool:
+        """Queue one served prediction for shadow scoring; False if it was dropped."""
+        if model_name not in self.candidates or self._task is None:
+            return False
+        try:
+            self._queue.put_nowait((model_name, risk_score_id, features, primary_version, primary_score))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def submit_on_commit(self, db: AsyncSession, model_name: str, score: RiskScore, features: dict):
+        if model_name not in self.candidates:
+            return
+        item = (model_name, score.id, features, score.model_version, score.score)
+
+        async def _submit():
+            self.submit(*item)
+        on_commit(db, _submit)
+
+    # -- Worker ---------------------------------------------------------------
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < _BATCH and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                rows = await asyncio.to_thread(self._score, batch)
+                if rows:
+                    async with AsyncSessionLocal() as db:
+                        await db.execute(insert(ShadowScore), rows)
+                        await db.commit()
+                    self.scored += len(rows)
+            except Exception:
+                self.failed += len(batch)
+                logger.exception("Shadow scoring batch failed")
+
+    def _score(self, batch: list) -> List[dict]:
+        rows = []
+        computed_at = now_utc()
+        for model_name, risk_score_id, features, primary_version, primary_score in batch:
+            for version in self.candidates[model_name]:
+                if version == primary_version:
+                    continue
+                try:
+                    model = model_registry.load_version(model_name, version)
+                    started = time.perf_counter()
+                    score = model.score(features)
+                    latency_ms = (time.perf_counter() - started) * 1000
+                except Exception as exc:
+                    self.failed += 1
+                    logger.warning("Shadow model %s %s could not score: %s", model_name, version, exc)
+                    continue
+                self._observe(f"{model_name}/{version}", latency_ms)
+                rows.append({
+                    "id": new_uuid(),
+                    "risk_score_id": risk_score_id,
+                    "model_name": model_name,
+                    "model_version": version,
+                    "score": round(score, 4),
+                    "primary_version": primary_version,
+                    "primary_score": primary_score,
+                    "latency_ms": round(latency_ms, 3),
+                    "computed_at": computed_at,
+                })
+        return rows
+
+    def _observe(self, key: str, latency_ms: float):
+        stats = self._latency.setdefault(key, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += latency_ms
+        stats[2] = max(stats[2], latency_ms)
+
+    def stats(self) -> dict:
+        return {
+            "candidates": self.candidates,
+            "running": self._task is not None and not self._task.done(),
+            "queued": self._queue.qsize(),
+            "max_queue": self._queue.maxsize,
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "scored": self.scored,
+            "failed": self.failed,
+            "latency_ms": {
+                key: {"count": n, "mean": round(total / n, 3), "max": round(worst, 3)}
+                for key, (n, total, worst) in self._latency.items()
+            },
+        }
+
+
+shadow_scorer = ShadowScorer(settings.SHADOW_MODELS, settings.SHADOW_QUEUE_SIZE)
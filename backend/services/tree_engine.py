@@ -0,0 +1,195 @@
+"""
+Tree Engine — gradient-boosted tree ensembles evaluated with NumPy only.
+
+A trained ensemble is exported once from the training environment as an
+XGBoost JSON dump (`booster.dump_model(path, dump_format="json")`) plus its
+config (`booster.save_config()`) and compiled here into flat per-node arrays
+shared by all trees:
+
+    feature    int32    split feature index (leaves: 0)
+    threshold  float32  go left when x < threshold
+    left/right int32    child node indices (leaves point to themselves)
+    missing    int32    child taken when x is NaN
+    value      float32  leaf value (internal nodes: 0)
+    roots      int32    first node of each tree
+
+Because leaves loop back to themselves, a batch is evaluated by stepping
+every (row, tree) cursor max_depth times with np.take gathers — no Python
+per row or per node — and summing the leaf values. Comparisons are done in
+float32, as XGBoost does, so scores match the library to ~1e-7.
+
+The dump carries no intercept: XGBoost ≥ 2.0 estimates base_score from the
+labels and only records it in the config (learner.learner_model_param), so
+it is read from there, or must be given explicitly — never assumed.
+
+The compiled arrays are saved as .npy next to a registry manifest, so API
+workers memory-map them (services.model_registry, kind "tree_ensemble")
+and never import xgboost.
+
+Usage (from backend/):
+    python -m services.tree_engine dump.json ml_artifacts/fall_risk/2.0.0 \\
+        --features age bmi ... --model-used XGBoost (--config config.json | --base-score B)
+"""
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+import argparse
+import json
+
+import numpy as np
+
+ARRAYS = ("feature", "threshold", "left", "right", "missing", "value", "roots")
+OBJECTIVES = ("binary:logistic", "reg:squarederror")
+_ROW_BLOCK = 1024   # rows per traversal step; bounds the (rows × trees) cursor matrix
+
+
+def _feature_index(split: str, features: Sequence[str]) -> int:
+    if split in features:
+        return features.index(split)
+    if split.startswith("f") and split[1:].isdigit():
+        return int(split[1:])
+    raise ValueError(f"Split feature '{split}' is not in the model's feature list")
+
+
+def compile_dump(trees: List[dict], features: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Flatten an XGBoost JSON dump (list of nested trees) into the arrays above."""
+    feature, threshold, left, right, missing, value, roots = [], [], [], [], [], [], []
+    max_depth = 0
+    for tree in trees:
+        roots.append(len(feature))
+        base = len(feature)
+        # Pre-order walk; node ids are only unique within a tree, so remap them
+        slots: Dict[int, int] = {}
+        order = []
+        stack = [(tree, 0)]
+        while stack:
+            node, depth = stack.pop()
+            slots[node["nodeid"]] = base + len(order)
+            order.append(node)
+            max_depth = max(max_depth, depth)
+            for child in reversed(node.get("children", [])):
+                stack.append((child, depth + 1))
+        for node in order:
+            me = slots[node["nodeid"]]
+            if "leaf" in node:
+                feature.append(0)
+                threshold.append(0.0)
+                left.append(me)
+                right.append(me)
+                missing.append(me)
+                value.append(node["leaf"])
+            else:
+                feature.append(_feature_index(node["split"], features))
+                threshold.append(node["split_condition"])
+                left.append(slots[node["yes"]])
+                right.append(slots[node["no"]])
+                missing.append(slots[node["missing"]])
+                value.append(0.0)
+    return {
+        "feature": np.asarray(feature, dtype=np.int32),
+        "threshold": np.asarray(threshold, dtype=np.float32),
+        "left": np.asarray(left, dtype=np.int32),
+        "right": np.asarray(right, dtype=np.int32),
+        "missing": np.asarray(missing, dtype=np.int32),
+        "value": np.asarray(value, dtype=np.float32),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "max_depth": max_depth,
+    }
+
+
+class TreeEnsemble:
+    """Batch predictor over compiled (possibly memory-mapped) node arrays."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], max_depth: int,
+                 objective: str, base_score: float):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unsupported objective '{objective}'")
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.max_depth = int(max_depth)
+        self.objective = objective
+        # XGBoost adds base_score in margin space
+        self.base_margin = (
+            float(np.log(base_score / (1.0 - base_score))) if objective == "binary:logistic" else float(base_score)
+        )
+        # Traversal form: children interleaved so one gather picks the branch
+        # (index 2·node + go_right), and a flag for splits whose missing branch is right
+        self._children = np.stack([self.left, self.right], axis=1).ravel().astype(np.intp)
+        self._missing_right = (self.missing == self.right) & (self.left != self.right)
+        self._roots = np.asarray(self.roots, dtype=np.intp)
+
+    def margin(self, rows: np.ndarray) -> np.ndarray:
+        rows = np.asarray(rows, dtype=np.float32)
+        if rows.ndim == 1:
+            rows = rows[None, :]
+        out = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), _ROW_BLOCK):
+            out[start:start + _ROW_BLOCK] = self._margin_block(rows[start:start + _ROW_BLOCK])
+        return out
+
+    def _margin_block(self, x: np.ndarray) -> np.ndarray:
+        n, width = x.shape
+        flat = np.ascontiguousarray(x).ravel()
+        row_offset = (np.arange(n, dtype=np.intp) * width)[:, None]
+        has_nan = bool(np.isnan(flat).any())
+        node = np.broadcast_to(self._roots, (n, len(self._roots))).copy()
+        for _ in range(self.max_depth):
+            xv = flat.take(self.feature.take(node) + row_offset)
+            go_right = xv >= self.threshold.take(node)      # NaN compares False → left ...
+            if has_nan:
+                go_right |= np.isnan(xv) & self._missing_right.take(node)   # ... unless missing is right
+            node = self._children.take(node * 2 + go_right)
+        return self.value.take(node).sum(axis=1, dtype=np.float32) + np.float32(self.base_margin)
+
+    def predict(self, rows: np.ndarray) -> np.ndarray:
+        m = self.margin(rows)
+        if self.objective == "binary:logistic":
+            return (1.0 / (1.0 + np.exp(-m.astype(np.float64)))).astype(np.float32)
+        return m
+
+
+def booster_params(config: dict) -> Tuple[str, float]:
+    """(objective, base_score) from a booster config, i.e. json.loads(booster.save_config())."""
+    learner = config["learner"]
+    # Stored as a string; XGBoost ≥ 3 writes a vector such as "[5E-1]"
+    raw = learner["learner_model_param"]["base_score"].strip("[]").split(",")[0]
+    return learner["objective"]["name"], float(raw)
+
+
+def save_artifact(trees: List[dict], path: Path, features: Sequence[str], model_used: str,
+                  objective: str, base_score: float):
+    """Compile a dump and write it as a model-registry artifact directory."""
+    compiled = compile_dump(trees, features)
+    path.mkdir(parents=True, exist_ok=True)
+    for name in ARRAYS:
+        np.save(path / f"{name}.npy", compiled[name])
+    (path / "manifest.json").write_text(json.dumps({
+        "kind": "tree_ensemble",
+        "model_used": model_used,
+        "features": list(features),
+        "arrays": list(ARRAYS),
+        "params": {"objective": objective, "base_score": base_score, "max_depth": compiled["max_depth"],
+                   "n_trees": len(trees)},
+    }, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile an XGBoost JSON dump into a model-registry artifact")
+    parser.add_argument("dump", type=Path)
+    parser.add_argument("artifact_dir", type=Path, help="e.g. ml_artifacts/fall_risk/2.0.0")
+    parser.add_argument("--features", nargs="+", required=True, help="feature names in model column order")
+    parser.add_argument("--model-used", default="XGBoost")
+    parser.add_argument("--objective", default="binary:logistic", choices=OBJECTIVES)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--config", type=Path, help="booster.save_config() output; supplies objective and base_score")
+    source.add_argument("--base-score", type=float, help="intercept as a probability (logistic) or raw value")
+    args = parser.parse_args()
+    trees = json.loads(args.dump.read_text())
+    objective, base_score = args.objective, args.base_score
+    if args.config:
+        objective, base_score = booster_params(json.loads(args.config.read_text()))
+    save_artifact(trees, args.artifact_dir, args.features, args.model_used, objective, base_score)
+    print(f"[tree_engine] wrote {len(trees)} trees to {args.artifact_dir}")
+
+
+if __name__ == "__main__":
+    main()
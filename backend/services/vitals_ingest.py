@@ -0,0 +1,162 @@
+"""
+Vitals Ingestion — bulk write path for wearable syncs and backfills.
+
+Readings are validated up front, each packed and encrypted once, and written
+with one executemany INSERT per chunk of VITALS_INGEST_CHUNK_SIZE rows —
+no ORM unit-of-work or per-row flush. Derived state (hourly/daily rollups,
+latest value per metric) is updated in the same transaction via on_vitals_written.
+
+- insert_vitals: JSON batches (POST /vitals/batch)
+- ingest_ndjson: NDJSON uploads of any size (POST /vitals/stream), parsed
+  line by line and committed chunk by chunk so memory stays flat
+"""
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Iterable, List, Optional, Tuple
+import logging
+import uuid
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.user import Vital, VitalReading, VITAL_METRICS
+from schemas.schemas import VitalCreate
+from services.feature_store import update_feature_state
+from services.risk_cache import invalidate_risk_scores
+from services.vitals_latest import update_latest
+from services.vitals_rollups import update_rollups
+
+logger = logging.getLogger(__name__)
+
+_METRIC_FIELDS = set(VITAL_METRICS)
+
+
+def _error_messages(exc: ValidationError, root: str) -> List[str]:
+    return [
+        f"{'.'.join(str(p) for p in err['loc']) or root}: {err['msg']}"
+        for err in exc.errors(include_url=False)
+    ]
+
+
+def validate_reading(item: Any) -> Tuple[VitalCreate, List[str]]:
+    """Validate one raw item; returns (reading, []) or (None, error messages)."""
+    try:
+        return VitalCreate.model_validate(item), []
+    except ValidationError as exc:
+        return None, _error_messages(exc, "item")
+
+
+async def on_vitals_written(db: AsyncSession, user_id: str, readings: List[VitalReading]):
+    """Update state derived from raw vitals, in the same transaction as the insert."""
+    await update_rollups(db, user_id, readings)
+    await update_latest(db, user_id, readings)
+    await update_feature_state(db, user_id, readings)
+    invalidate_risk_scores(db, user_id)
+
+
+async def insert_vitals(db: AsyncSession, user_id: str, readings: Iterable[VitalCreate]) -> List[str]:
+    """Insert validated readings in executemany chunks; returns the new ids in order."""
+    now = datetime.now(timezone.utc)
+    chunk_size = settings.VITALS_INGEST_CHUNK_SIZE
+    ids, rows, written = [], [], []
+
+    async def flush_chunk():
+        await db.execute(insert(Vital.__table__), rows)
+        await on_vitals_written(db, user_id, written)
+        ids.extend(row["id"] for row in rows)
+        rows.clear()
+        written.clear()
+
+    for reading in readings:
+        written_reading = VitalReading(
+            str(uuid.uuid4()), reading.recorded_at or now, reading.source,
+            reading.model_dump(include=_METRIC_FIELDS),
+        )
+        rows.append(Vital.row_from_metrics(
+            written_reading.metrics, id=written_reading.id, user_id=user_id,
+            recorded_at=written_reading.recorded_at, source=written_reading.source,
+        ))
+        written.append(written_reading)
+        if len(rows) >= chunk_size:
+            await flush_chunk()
+    if rows:
+        await flush_chunk()
+    return ids
+
+
+# ── Streaming (NDJSON) ────────────────────────────────────────────────────────
+
+MAX_LINE_BYTES = 64 * 1024
+MAX_REPORTED_ERRORS = 100
+
+
+async def iter_lines(byte_chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Split an async byte stream into (line number, line); keeps at most one partial line."""
+    buffer = b""
+    line_no = 0
+    skipping = False                      # inside an oversized line, until its newline
+    async for data in byte_chunks:
+        if skipping:
+            if b"\n" not in data:
+                continue
+            data = data.split(b"\n", 1)[1]
+            skipping = False
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line
+        if len(buffer) > MAX_LINE_BYTES:
+            line_no += 1
+            yield line_no, None           # oversized line: reported, then skipped
+            buffer = b""
+            skipping = True
+    if buffer.strip():
+        yield line_no + 1, buffer
+
+
+async def ingest_ndjson(db: AsyncSession, user_id: str, byte_chunks: AsyncIterator[bytes]) -> dict:
+    """
+    Validate and store NDJSON readings as they arrive, committing every
+    VITALS_INGEST_CHUNK_SIZE valid rows. Chunks committed before a failure
+    or disconnect stay stored; the summary says how far ingestion got.
+    """
+    chunk_size = settings.VITALS_INGEST_CHUNK_SIZE
+    report = {"lines": 0, "created": 0, "rejected": 0, "chunks_committed": 0,
+              "errors": [], "errors_truncated": False}
+    pending: List[VitalCreate] = []
+
+    async def commit_pending():
+        await insert_vitals(db, user_id, pending)
+        await db.commit()
+        report["created"] += len(pending)
+        report["chunks_committed"] += 1
+        pending.clear()
+
+    async for line_no, line in iter_lines(byte_chunks):
+        if line is not None and not line.strip():
+            continue
+        report["lines"] += 1
+        if line is None:
+            errors = [f"line exceeds {MAX_LINE_BYTES} bytes"]
+        else:
+            try:
+                pending.append(VitalCreate.model_validate_json(line))
+                errors = None
+            except ValidationError as exc:
+                errors = _error_messages(exc, "line")
+        if errors:
+            report["rejected"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append({"line": line_no, "errors": errors})
+            else:
+                report["errors_truncated"] = True
+        if len(pending) >= chunk_size:
+            await commit_pending()
+            logger.info("NDJSON ingest user=%s lines=%d created=%d",
+                        user_id, report["lines"], report["created"])
+
+    if pending:
+        await commit_pending()
+    return report
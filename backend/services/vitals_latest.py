@@ -0,0 +1,67 @@
+"""
+Latest Vitals — per-user "current state" maintained on every vital write.
+
+`user_latest_vitals` keeps the last known value of each metric, so
+GET /vitals/latest and SOS health snapshots are a primary-key lookup plus one
+decrypt instead of sorting and decrypting recent readings.
+
+Users whose history predates this table get their row built from raw vitals
+the first time it is read or written (newest first, stopping as soon as every
+metric has been seen).
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import insert_ignore
+from core.pagination import keyset_page, split_page
+from models.user import Vital, VitalReading, UserLatestVital, VITAL_METRICS
+
+_BACKFILL_CHUNK = 200
+
+
+async def _backfill(db: AsyncSession, state: UserLatestVital):
+    """Fold raw history into an empty state row (newest first, stop when complete)."""
+    cursor = None
+    while True:
+        result = await db.execute(keyset_page(
+            select(Vital).where(Vital.user_id == state.user_id),
+            Vital.recorded_at, Vital.id, cursor, _BACKFILL_CHUNK,
+        ))
+        rows, cursor = split_page(result.scalars().all(), _BACKFILL_CHUNK, "recorded_at")
+        state.fold(vital.as_reading() for vital in rows)
+        if cursor is None or len(state.metric_readings()) == len(VITAL_METRICS):
+            return
+
+
+async def _locked_state(db: AsyncSession, user_id: str) -> UserLatestVital:
+    await insert_ignore(db, UserLatestVital.__table__, [{"user_id": user_id}])
+    result = await db.execute(
+        select(UserLatestVital)
+        .where(UserLatestVital.user_id == user_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    state = result.scalar_one()
+    if state.vital_id is None:
+        await _backfill(db, state)
+    return state
+
+
+async def update_latest(db: AsyncSession, user_id: str, readings: Iterable[VitalReading]):
+    """Upsert the user's latest values inside the caller's transaction (after the vitals insert)."""
+    state = await _locked_state(db, user_id)
+    state.fold(readings)
+    await db.flush()
+
+
+async def get_latest_vitals(db: AsyncSession, user_id: str) -> Optional[UserLatestVital]:
+    """Last known value per metric, or None if the user has no vitals."""
+    state = await db.get(UserLatestVital, user_id)
+    if state is None or state.vital_id is None:
+        if not (await db.execute(select(Vital.id).where(Vital.user_id == user_id).limit(1))).first():
+            return None
+        state = await _locked_state(db, user_id)
+        await db.flush()
+    return state
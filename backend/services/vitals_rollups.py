@@ -0,0 +1,169 @@
+"""
+Vitals Rollups — hourly and daily aggregates for caregiver dashboards.
+
+Every vital write folds its readings into one `vital_rollups` row per
+(user, granularity, bucket): count, sum, min, max and last value of each
+metric, packed and encrypted. A 90-day daily chart then reads ~90 rows
+instead of decrypting every raw reading.
+
+Rows for databases that predate rollups (or after a bug fix) are rebuilt
+from raw vitals with (pause ingestion while it runs):
+    python -m services.vitals_rollups --rebuild [--user-id ID]
+"""
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import AsyncSessionLocal, init_db, insert_ignore
+from models.user import Vital, VitalReading, VitalRollup
+
+GRANULARITIES = ("hour", "day")
+
+
+def as_utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+
+def bucket_start(ts: datetime, granularity: str) -> datetime:
+    ts = as_utc(ts)
+    if granularity == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def fold_reading(stats: dict, metrics: dict, at: float):
+    """Add one reading (taken at epoch `at`) to a {metric: stats} dict in place."""
+    for name, value in metrics.items():
+        if value is None:
+            continue
+        s = stats.get(name)
+        if s is None:
+            stats[name] = {"count": 1, "sum": value, "min": value, "max": value, "last": value, "last_at": at}
+            continue
+        s["count"] += 1
+        s["sum"] += value
+        s["min"] = min(s["min"], value)
+        s["max"] = max(s["max"], value)
+        if at >= s["last_at"]:
+            s["last"], s["last_at"] = value, at
+
+
+def merge_stats(into: dict, other: dict):
+    """Combine two {metric: stats} dicts (order-independent) into `into`."""
+    for name, o in other.items():
+        s = into.get(name)
+        if s is None:
+            into[name] = dict(o)
+            continue
+        s["count"] += o["count"]
+        s["sum"] += o["sum"]
+        s["min"] = min(s["min"], o["min"])
+        s["max"] = max(s["max"], o["max"])
+        if o["last_at"] >= s["last_at"]:
+            s["last"], s["last_at"] = o["last"], o["last_at"]
+
+
+async def update_rollups(db: AsyncSession, user_id: str, readings: Iterable[VitalReading]):
+    """
+    Fold readings into their hour and day buckets inside the caller's
+    transaction. Missing bucket rows are created first, then all touched rows
+    are locked in key order (FOR UPDATE on PostgreSQL), so concurrent writers
+    for the same user serialize instead of losing updates.
+    """
+    deltas: Dict[Tuple[str, datetime], dict] = {}
+    for reading in readings:
+        at = as_utc(reading.recorded_at).timestamp()
+        for granularity in GRANULARITIES:
+            key = (granularity, bucket_start(reading.recorded_at, granularity))
+            fold_reading(deltas.setdefault(key, {}), reading.metrics, at)
+    deltas = {key: stats for key, stats in deltas.items() if stats}
+    if not deltas:
+        return
+
+    await insert_ignore(db, VitalRollup.__table__, [
+        {"user_id": user_id, "granularity": g, "bucket_start": b} for g, b in deltas
+    ])
+    wanted = [
+        and_(VitalRollup.granularity == granularity,
+             VitalRollup.bucket_start.in_(sorted(b for g, b in deltas if g == granularity)))
+        for granularity in GRANULARITIES
+    ]
+    result = await db.execute(
+        select(VitalRollup)
+        .where(VitalRollup.user_id == user_id, or_(*wanted))
+        .order_by(VitalRollup.granularity, VitalRollup.bucket_start)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    for rollup in result.scalars():
+        stats = rollup.metric_stats()
+        merge_stats(stats, deltas[(rollup.granularity, bucket_start(rollup.bucket_start, rollup.granularity))])
+        rollup.store_metric_stats(stats)
+    await db.flush()
+
+
+def summarize(stats: dict) -> dict:
+    """Client-facing view of one bucket: count/min/max/mean/last per metric."""
+    return {
+        name: {
+            "count": int(s["count"]),
+            "min": s["min"],
+            "max": s["max"],
+            "mean": round(s["sum"] / s["count"], 2),
+            "last": s["last"],
+        }
+        for name, s in stats.items()
+    }
+
+
+async def rebuild_rollups(user_id: Optional[str] = None, chunk_size: int = 2000) -> int:
+    """Recompute rollups from raw vitals (all users, or one). Returns readings folded."""
+    async with AsyncSessionLocal() as db:
+        q = delete(VitalRollup)
+        if user_id:
+            q = q.where(VitalRollup.user_id == user_id)
+        await db.execute(q)
+        await db.commit()
+
+    folded = 0
+    last_key = None
+    while True:
+        async with AsyncSessionLocal() as db:
+            q = select(Vital).order_by(Vital.user_id, Vital.id).limit(chunk_size)
+            if user_id:
+                q = q.where(Vital.user_id == user_id)
+            if last_key:
+                q = q.where(or_(Vital.user_id > last_key[0], and_(Vital.user_id == last_key[0], Vital.id > last_key[1])))
+            rows = (await db.execute(q)).scalars().all()
+            if not rows:
+                return folded
+            by_user: Dict[str, list] = {}
+            for vital in rows:
+                by_user.setdefault(vital.user_id, []).append(vital.as_reading())
+            for uid, readings in by_user.items():
+                await update_rollups(db, uid, readings)
+            await db.commit()
+        folded += len(rows)
+        last_key = (rows[-1].user_id, rows[-1].id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild hourly/daily vitals rollups from raw readings")
+    parser.add_argument("--rebuild", action="store_true", required=True)
+    parser.add_argument("--user-id", default=None)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    async def _run():
+        await init_db()
+        print(f"[vitals_rollups] folded {await rebuild_rollups(args.user_id, args.chunk_size)} readings")
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
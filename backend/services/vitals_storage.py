@@ -0,0 +1,58 @@
+"""
+Vitals Storage — migration from per-column encryption to packed records.
+
+Rows written before packed storage keep nine separate Fernet tokens. They stay
+readable (Vital falls back to the legacy columns), and this job rewrites them
+into the single-ciphertext layout in bounded chunks. It is safe to stop and
+rerun at any time: only rows with `packed IS NULL` are picked up.
+
+Usage (from backend/):
+    python -m services.vitals_storage --chunk-size 500
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from core.database import AsyncSessionLocal, init_db
+from models.user import Vital
+
+
+async def migrate_legacy_vitals(chunk_size: int = 500) -> int:
+    """Pack every legacy vitals row. Returns the number of rows migrated."""
+    migrated = 0
+    last_id = ""
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Vital)
+                .where(Vital.packed.is_(None), Vital.id > last_id)
+                .order_by(Vital.id)
+                .limit(chunk_size)
+            )
+            rows = result.scalars().all()
+            if not rows:
+                return migrated
+            for vital in rows:
+                vital.store_metrics(vital.metric_values())
+            await db.commit()
+        migrated += len(rows)
+        last_id = rows[-1].id
+        print(f"[vitals_storage] migrated {migrated} rows (last id {last_id})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate legacy vitals rows to packed storage")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    async def _run():
+        await init_db()
+        total = await migrate_legacy_vitals(args.chunk_size)
+        print(f"[vitals_storage] done — {total} rows migrated")
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()